@@ -0,0 +1,77 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+"""Benchmark the time it takes to ``import navis``.
+
+Each measurement runs in a fresh interpreter. Run from the repository root::
+
+    python benchmarks/import_time.py --runs 10 --top 15
+
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+def time_import(runs=5):
+    """Return wall times (in seconds) for ``import navis``."""
+    code = ('import time; s = time.perf_counter(); import navis; '
+            'print(time.perf_counter() - s)')
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', code],
+                             capture_output=True, text=True, check=True,
+                             env=_env())
+        times.append(float(out.stdout.strip().split('\n')[-1]))
+    return times
+
+
+def slowest_imports(top=15):
+    """Return the slowest modules (cumulative) according to ``-X importtime``."""
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import navis'],
+                         capture_output=True, text=True, check=True,
+                         env=_env())
+    rows = []
+    for line in out.stderr.split('\n'):
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # Format is "import time: self [us] | cumulative | imported package"
+        self_us, cum_us, name = [s.strip() for s in line.split(':', 1)[1].split('|')]
+        rows.append((int(cum_us), int(self_us), name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def _env():
+    """Make sure we import navis from this repository."""
+    env = os.environ.copy()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join([root, env.get('PYTHONPATH', '')])
+    return env
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    times = time_import(args.runs)
+    print(f'import navis: median {statistics.median(times):.3f}s, '
+          f'min {min(times):.3f}s ({args.runs} runs)')
+
+    print(f'\n{"cumulative [ms]":>16} {"self [ms]":>10}  module')
+    for cum, self_, name in slowest_imports(args.top):
+        print(f'{cum / 1000:>16.1f} {self_ / 1000:>10.1f}  {name}')
@@ -21,6 +21,24 @@ from .graph import *
 from .intersection import *
 from .io import *
 from .morpho import *
-from .plotting import *
+from .nbl import *
+from . import plotting
 from .sampling import *
+from .transforms import *
 from .utils import *
+
+# Without an explicit __all__, ``from navis import *`` would skip the lazily
+# imported plotting functions
+__all__ = sorted({k for k in globals() if not k.startswith('_')}
+                 | set(plotting.__all__))
+
+
+def __getattr__(name):
+    # Plotting functions are imported lazily - see navis/plotting/__init__.py
+    if name in plotting.__all__:
+        return getattr(plotting, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(plotting.__all__))
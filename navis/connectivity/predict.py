@@ -15,15 +15,19 @@
 """ This module contains functions to analyse connectivity.
 """
 
+import os
+
 import pandas as pd
 import numpy as np
-import scipy.spatial
+import scipy.sparse
 
-from typing import Union, Dict
+from typing import Union, List, Tuple
 from typing_extensions import Literal
 
 from ..core.neurons import TreeNeuron
 from ..core.neuronlist import NeuronList
+from ..core.dotprops import Dotprops
+from ..utils.parallel import map_with_payload, get_payload
 from .. import config
 
 # Set up logging
@@ -35,13 +39,19 @@ NeuronObject = Union[TreeNeuron, NeuronList]
 def cable_overlap(a: NeuronObject,
                   b: NeuronObject,
                   dist: float = 2,
-                  method: Union[Literal['min'], Literal['max'], Literal['avg']] = 'min'
+                  method: Union[Literal['min'], Literal['max'], Literal['avg']] = 'min',
+                  sparse: bool = False,
+                  n_cores: int = os.cpu_count() - 2
                   ) -> pd.DataFrame:
     """Calculate the amount of cable of neuron A within distance of neuron B.
 
     Uses dotproduct representation of a neuron! It is recommended to
     resample neurons first.
 
+    Pairs of neurons whose bounding boxes (padded by ``dist``) do not
+    intersect are skipped. For the remaining pairs, each neuron's points are
+    queried in bulk against the (cached) KD-tree of the other neuron.
+
     Parameters
     ----------
     a,b :       TreeNeuron | NeuronList
@@ -59,6 +69,12 @@ def cable_overlap(a: NeuronObject,
                     2. 'max' returns 300
                     3. 'avg' returns 225
 
+    sparse :    bool, optional
+                If True, will return a DataFrame with sparse columns. Use
+                this for large sets of neurons with little overlap.
+    n_cores :   int, optional
+                Number of cores to use. Default is ``os.cpu_count() - 2``.
+
     Returns
     -------
     pandas.DataFrame
@@ -101,58 +117,140 @@ def cable_overlap(a: NeuronObject,
         raise ValueError(f'Unknown method "{method}". Allowed methods: '
                          f'"{",".join(allowed_methods)}"')
 
-    matrix = pd.DataFrame(np.zeros((a.shape[0], b.shape[0])),
-                          index=a.name, columns=b.name)
-
-    with config.tqdm(total=len(a), desc='Calc. overlap',
-                     disable=config.pbar_hide,
-                     leave=config.pbar_leave) as pbar:
-        # Keep track of KDtrees
-        trees: Dict[str, scipy.spatial.cKDTree] = {}
-        for nA in a:
-            # Get cKDTree for nA
-            tA = trees.get(nA.name, None)
-            if not tA:
-                trees[nA.name] = tA = scipy.spatial.cKDTree(
-                    np.vstack(nA.dps.point), leafsize=10)
-
-            for nB in b:
-                # Get cKDTree for nB
-                tB = trees.get(nB.name, None)
-                if not tB:
-                    trees[nB.name] = tB = scipy.spatial.cKDTree(
-                        np.vstack(nB.dps.point), leafsize=10)
-
-                # Query nB -> nA
-                distA, ixA = tA.query(np.vstack(nB.dps.point),
-                                      k=1,
-                                      distance_upper_bound=dist,
-                                      n_jobs=-1
-                                      )
-                # Query nA -> nB
-                distB, ixB = tB.query(np.vstack(nA.dps.point),
-                                      k=1,
-                                      distance_upper_bound=dist,
-                                      n_jobs=-1
-                                      )
-
-                nA_in_dist = nA.dps.loc[ixA[distA != float('inf')]]
-                nB_in_dist = nB.dps.loc[ixB[distB != float('inf')]]
-
-                if nA_in_dist.empty:
-                    overlap = 0
-                elif method == 'avg':
-                    overlap = (nA_in_dist.vec_length.sum() +
-                               nB_in_dist.vec_length.sum()) / 2
-                elif method == 'max':
-                    overlap = max(nA_in_dist.vec_length.sum(),
-                                  nB_in_dist.vec_length.sum())
-                elif method == 'min':
-                    overlap = min(nA_in_dist.vec_length.sum(),
-                                  nB_in_dist.vec_length.sum())
-
-                matrix.at[nA.name, nB.name] = overlap
-
-            pbar.update(1)
-
-    return matrix
+    # Dotprops are cached on the neurons and carry their own KD-trees. Note
+    # that we collect them by position - names (and even IDs) need not be
+    # unique.
+    dps = [n.dps for n in a] + [n.dps for n in b]
+    ix_a = np.arange(len(a))
+    ix_b = np.arange(len(a), len(a) + len(b))
+
+    # Find pairs with intersecting bounding boxes
+    pairs = _bbox_pairs(dps, ix_a, ix_b, dist)
+
+    # Collect jobs: each neuron's tree is queried against the points of all
+    # its partners in one go. We need both directions: A's tree vs B's points
+    # and B's tree vs A's points.
+    srtA, jobsA = _group_pairs(pairs, dist)
+    srtB, jobsB = _group_pairs(pairs[:, ::-1], dist)
+    jobs = jobsA + jobsB
+
+    # Dotprops are sent to each worker only once. KD-trees are not pickled but
+    # (re-)generated and cached by each worker on first use.
+    res = map_with_payload(_overlap_worker, jobs, dps,
+                           n_cores=n_cores, desc='Calc. overlap')
+
+    # Map results back onto pairs
+    # lenA: cable of A near points of B; lenB: cable of B near points of A
+    lenA = np.zeros(pairs.shape[0])
+    lenB = np.zeros(pairs.shape[0])
+    if pairs.shape[0]:
+        lenA[srtA] = np.concatenate(res[:len(jobsA)])
+        lenB[srtB] = np.concatenate(res[len(jobsA):])
+
+    if method == 'avg':
+        overlap = (lenA + lenB) / 2
+    elif method == 'max':
+        overlap = np.maximum(lenA, lenB)
+    elif method == 'min':
+        overlap = np.minimum(lenA, lenB)
+    overlap[lenA == 0] = 0
+
+    keep = overlap > 0
+    rows, cols = pairs[keep, 0], pairs[keep, 1] - len(a)
+    overlap = overlap[keep]
+
+    if sparse:
+        mat = scipy.sparse.coo_matrix((overlap, (rows, cols)),
+                                      shape=(len(a), len(b)))
+        return pd.DataFrame.sparse.from_spmatrix(mat,
+                                                 index=a.name,
+                                                 columns=b.name)
+
+    matrix = np.zeros((len(a), len(b)))
+    matrix[rows, cols] = overlap
+
+    return pd.DataFrame(matrix, index=a.name, columns=b.name)
+
+
+def _bbox_pairs(dps: List['Dotprops'],
+                ix_a: np.ndarray,
+                ix_b: np.ndarray,
+                dist: float,
+                chunk_size: int = 1000) -> np.ndarray:
+    """Find pairs of dotprops whose padded bounding boxes intersect.
+
+    Returns
+    -------
+    np.ndarray
+                (N, 2) array of (ix_a, ix_b) pairs.
+
+    """
+    bbox = np.full((len(dps), 2, 3), np.nan)
+    for i, dp in enumerate(dps):
+        if len(dp):
+            bbox[i] = [dp.points.min(axis=0), dp.points.max(axis=0)]
+
+    # Pad bounding boxes of A only - that's equivalent to padding both by
+    # half the distance
+    bbA = bbox[ix_a] + np.array([-dist, dist]).reshape(1, 2, 1)
+    bbB = bbox[ix_b]
+
+    pairs = []
+    # Go over A in chunks to keep memory footprint in check
+    for i in range(0, len(ix_a), chunk_size):
+        this = bbA[i: i + chunk_size]
+        # Comparisons involving NaN (empty dotprops) are always False
+        hit = np.all((this[:, None, 0] <= bbB[None, :, 1])
+                     & (this[:, None, 1] >= bbB[None, :, 0]), axis=2)
+        r, c = np.nonzero(hit)
+        pairs.append(np.vstack((ix_a[r + i], ix_b[c])).T)
+
+    if not pairs:
+        return np.zeros((0, 2), dtype=int)
+
+    return np.vstack(pairs)
+
+
+def _group_pairs(pairs: np.ndarray,
+                 dist: float) -> Tuple[np.ndarray, List[tuple]]:
+    """Group (this, partner) pairs by ``this`` and turn into jobs.
+
+    Returns
+    -------
+    sort :      np.ndarray
+                Order of pairs as they appear across jobs.
+    jobs :      list
+                List of ``(this, partners, dist)`` tuples.
+
+    """
+    srt = np.argsort(pairs[:, 0], kind='stable')
+    if not pairs.shape[0]:
+        return srt, []
+    srt_pairs = pairs[srt]
+    splits = np.flatnonzero(np.diff(srt_pairs[:, 0])) + 1
+    jobs = [(grp[0, 0], grp[:, 1], dist) for grp in np.split(srt_pairs, splits)]
+    return srt, jobs
+
+
+def _overlap_worker(args) -> np.ndarray:
+    """Query partners' points against this neuron's KD-tree.
+
+    Returns for each partner the summed ``vec_length`` of this neuron's
+    points that are the nearest neighbour of any of partner's points within
+    distance.
+
+    """
+    this, partners, dist = args
+    dps = get_payload()
+    dp = dps[this]
+
+    points = [dps[p].points for p in partners]
+    owner = np.repeat(np.arange(len(partners)), [len(p) for p in points])
+    points = np.vstack(points)
+
+    d, ix = dp.kdtree.query(points, k=1, distance_upper_bound=dist)
+    in_dist = d != float('inf')
+
+    return np.bincount(owner[in_dist],
+                       weights=dp.vec_length[ix[in_dist]],
+                       minlength=len(partners))
@@ -11,9 +11,16 @@
 #    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 #    GNU General Public License for more details.
 
-from .. import config
+import copy
+import uuid
 
+import numpy as np
 import pandas as pd
+import scipy.spatial
+
+from typing import Union, Optional
+
+from .. import config
 
 __all__ = ['Dotprops']
 
@@ -21,17 +28,227 @@ __all__ = ['Dotprops']
 logger = config.logger
 
 
-class Dotprops(pd.DataFrame):
-    """Class to hold dotprops. This is essentially a pandas DataFrame - we
-    just use it to tell dotprops from other objects.
+class Dotprops:
+    """Point cloud with tangent vectors.
+
+    Dotprops are a compact representation of a neuron's morphology without
+    connectivity: each point has a (unit) tangent vector and - optionally -
+    an ``alpha`` value describing how linear its neighbourhood is and the
+    length of cable it represents.
+
+    Use :func:`navis.neuron2dps` or :attr:`navis.TreeNeuron.dps` to generate
+    dotprops from a neuron.
+
+    Parameters
+    ----------
+    points :        (N, 3) array
+                    Point coordinates.
+    vect :          (N, 3) array
+                    Tangent vectors. Will be normalized to unit length.
+    alpha :         (N, ) array, optional
+                    Linearity of each point's neighbourhood (0-1).
+    vec_length :    (N, ) array, optional
+                    Length of cable represented by each point.
+    k :             int, optional
+                    Number of nearest neighbours used to generate tangent
+                    vectors. None if vectors were generated from edges.
+    name :          str, optional
+                    Name of these dotprops.
+    id :            int | str, optional
+                    ID of these dotprops. If not provided will generate one.
+
+    Attributes
+    ----------
+    kdtree :        scipy.spatial.cKDTree
+                    KD-tree of ``points``. Generated on first access and
+                    cached.
 
     See Also
     --------
+    :func:`navis.neuron2dps`
+        Generates Dotprops from TreeNeurons.
     :func:`navis.interfaces.r.dotprops2py`
         Converts R dotprops to :class:`~navis.Dotprops`.
 
-    Notes
-    -----
-    This class is still in the making but the idea is to write methods for it
-    like .plot3d(), .to_X().
+    Examples
+    --------
+    >>> import navis
+    >>> n = navis.example_neurons(1)
+    >>> dp = navis.neuron2dps(n, k=5)
+    >>> dist, ix = dp.kdtree.query(n.nodes[['x', 'y', 'z']].values)
+
     """
+
+    def __init__(self,
+                 points: np.ndarray,
+                 vect: np.ndarray,
+                 alpha: Optional[np.ndarray] = None,
+                 vec_length: Optional[np.ndarray] = None,
+                 k: Optional[int] = None,
+                 name: Optional[str] = None,
+                 id: Optional[Union[int, str]] = None):
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+        vect = np.asarray(vect, dtype=np.float32).reshape(-1, 3)
+
+        if points.shape != vect.shape:
+            raise ValueError(f'Got {points.shape[0]} points but '
+                             f'{vect.shape[0]} vectors.')
+
+        # Make sure vectors are unit length
+        norm = np.linalg.norm(vect, axis=1)
+        norm[norm == 0] = 1
+        if not np.allclose(norm, 1):
+            vect = vect / norm.reshape(-1, 1)
+
+        self.points = points
+        self.vect = vect
+        self.alpha = self._parse_1d(alpha, 'alpha')
+        self.vec_length = self._parse_1d(vec_length, 'vec_length')
+        self.k = k
+        self.name = name
+        self.id = id if id is not None else uuid.uuid4()
+
+        self._kdtree = None
+
+    def __len__(self) -> int:
+        return self.points.shape[0]
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __repr__(self) -> str:
+        return (f'<{self.__class__.__name__}(name={self.name}, '
+                f'n_points={len(self)}, k={self.k})>')
+
+    def __getstate__(self) -> dict:
+        """Get state (used e.g. for pickling)."""
+        state = self.__dict__.copy()
+        # The KD-tree is cheap to regenerate and expensive to pickle
+        state['_kdtree'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Set state (used e.g. for unpickling)."""
+        self.__dict__.update(state)
+
+    def _parse_1d(self, x: Optional[np.ndarray], name: str
+                  ) -> Optional[np.ndarray]:
+        """Check that per-point values match number of points."""
+        if x is None:
+            return None
+        x = np.asarray(x, dtype=np.float32).ravel()
+        if x.shape[0] != self.points.shape[0]:
+            raise ValueError(f'Expected {self.points.shape[0]} values for '
+                             f'"{name}", got {x.shape[0]}')
+        return x
+
+    @property
+    def kdtree(self) -> scipy.spatial.cKDTree:
+        """KD-tree of points. Generated on first access."""
+        if self._kdtree is None:
+            self._kdtree = scipy.spatial.cKDTree(self.points)
+        return self._kdtree
+
+    def copy(self) -> 'Dotprops':
+        """Return a copy of the dotprops."""
+        x = copy.copy(self)
+        for at in ['points', 'vect', 'alpha', 'vec_length']:
+            if getattr(x, at) is not None:
+                setattr(x, at, getattr(x, at).copy())
+        return x
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return dotprops as DataFrame.
+
+        Returns
+        -------
+        pandas.DataFrame
+                    DataFrame with ``x``, ``y``, ``z``, ``x_vec``, ``y_vec``,
+                    ``z_vec`` and (if available) ``alpha`` and
+                    ``vec_length`` columns.
+
+        """
+        df = pd.DataFrame(np.hstack((self.points, self.vect)),
+                          columns=['x', 'y', 'z', 'x_vec', 'y_vec', 'z_vec'])
+        for at in ['alpha', 'vec_length']:
+            if getattr(self, at) is not None:
+                df[at] = getattr(self, at)
+        return df
+
+    @classmethod
+    def from_dataframe(cls,
+                       df: pd.DataFrame,
+                       **kwargs) -> 'Dotprops':
+        """Generate dotprops from DataFrame.
+
+        Parameters
+        ----------
+        df :        pandas.DataFrame
+                    Must contain ``x``, ``y``, ``z``, ``x_vec``, ``y_vec`` and
+                    ``z_vec`` columns. ``alpha`` and ``vec_length`` columns
+                    are optional.
+        **kwargs
+                    Additional keyword arguments are passed to
+                    :class:`~navis.Dotprops`.
+
+        """
+        return cls(points=df[['x', 'y', 'z']].values,
+                   vect=df[['x_vec', 'y_vec', 'z_vec']].values,
+                   alpha=df['alpha'].values if 'alpha' in df.columns else None,
+                   vec_length=df['vec_length'].values if 'vec_length' in df.columns else None,
+                   **kwargs)
+
+    def to_npz(self, filepath: str,
+               compressed: bool = True) -> None:
+        """Save dotprops to numpy ``.npz`` file.
+
+        Parameters
+        ----------
+        filepath :      str
+                        File to save to.
+        compressed :    bool, optional
+                        If True, will compress data.
+
+        See Also
+        --------
+        :func:`~navis.Dotprops.from_npz`
+                        Load dotprops from file.
+
+        """
+        data = {at: getattr(self, at) for at in ['points', 'vect',
+                                                 'alpha', 'vec_length']
+                if getattr(self, at) is not None}
+        # Store meta data as strings - pickling objects is not safe
+        data['meta'] = np.array([str(self.name) if self.name is not None else '',
+                                 str(self.id),
+                                 str(self.k) if self.k is not None else ''])
+
+        if compressed:
+            np.savez_compressed(filepath, **data)
+        else:
+            np.savez(filepath, **data)
+
+    @classmethod
+    def from_npz(cls, filepath: str) -> 'Dotprops':
+        """Load dotprops from numpy ``.npz`` file.
+
+        Parameters
+        ----------
+        filepath :      str
+                        File to load from.
+
+        See Also
+        --------
+        :func:`~navis.Dotprops.to_npz`
+                        Save dotprops to file.
+
+        """
+        with np.load(filepath, allow_pickle=False) as data:
+            name, id, k = data['meta']
+            return cls(points=data['points'],
+                       vect=data['vect'],
+                       alpha=data['alpha'] if 'alpha' in data else None,
+                       vec_length=data['vec_length'] if 'vec_length' in data else None,
+                       k=int(k) if k else None,
+                       name=name if name else None,
+                       id=id)
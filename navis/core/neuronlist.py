@@ -27,7 +27,7 @@ import numpy as np
 import pandas as pd
 
 from typing import (ClassVar, Sequence, Union, Iterable, List, Any,
-                    Optional, Callable, Iterator)
+                    Optional, Callable, Iterator, Tuple)
 
 from .. import utils, config, core
 
@@ -154,7 +154,7 @@ class NeuronList:
                     self.neurons[n[2]] = core.Neuron(n[0])
 
         # Add ID-based indexer
-        self.idx = _IdIndexer(self.neurons)
+        self.idx = _IdIndexer(self)
 
     @property
     def neurons(self):
@@ -256,19 +256,7 @@ class NeuronList:
         # Concatenate if dealing with DataFrame
         elif not all(is_method):
             if all(is_frame):
-                df = pd.concat([v for v in values if isinstance(v, pd.DataFrame)],
-                               axis=0,
-                               ignore_index=True,
-                               join='outer',
-                               sort=True)
-                df['neuron'] = None
-                ix = 0
-                for k, v in enumerate(values):
-                    if isinstance(v, pd.DataFrame):
-                        df.iloc[ix:ix:v.shape[0],
-                                df.columns.get_loc('neuron')] = k
-                        ix += v.shape[0]
-                return df
+                return self._get_flat_table(key, values)[0]
             elif all(is_quantity):
                 # See if units are all compatible
                 is_compatible = [values[0].is_compatible_with(v) for v in values]
@@ -296,6 +284,50 @@ class NeuronList:
                                    n_cores=self.n_cores,
                                    desc=key)
 
+    def _get_flat_table(self,
+                        key: str,
+                        values: Optional[list] = None
+                        ) -> Tuple[pd.DataFrame, np.ndarray]:
+        """Get concatenated table (e.g. "nodes") across all neurons.
+
+        Parameters
+        ----------
+        key :       str
+                    Name of the DataFrame attribute (e.g. "nodes").
+        values :    list, optional
+                    The neurons' tables if already collected.
+
+        Returns
+        -------
+        table :     pandas.DataFrame
+                    The "neuron" column contains the index of the neuron in
+                    this NeuronList.
+        offsets :   np.ndarray
+                    (N + 1, ) array: rows ``offsets[i]:offsets[i + 1]`` belong
+                    to the i-th neuron.
+
+        """
+        if values is None:
+            values = [getattr(n, key) for n in self.neurons]
+
+        frames = [v for v in values if isinstance(v, pd.DataFrame)]
+        lengths = np.array([v.shape[0] if isinstance(v, pd.DataFrame) else 0 for v in values],
+                           dtype=int)
+        offsets = np.zeros(len(values) + 1, dtype=int)
+        np.cumsum(lengths, out=offsets[1:])
+
+        if not frames:
+            return pd.DataFrame(), offsets
+
+        table = pd.concat(frames,
+                          axis=0,
+                          ignore_index=True,
+                          join='outer',
+                          sort=True)
+        table['neuron'] = np.repeat(np.arange(len(values)), lengths)
+
+        return table, offsets
+
     def __setattr__(self, key, value):
         # Check if this attribute exists in the neurons
         if any([hasattr(n, key) for n in self.neurons]):
@@ -305,8 +337,22 @@ class NeuronList:
 
         self.__dict__[key] = value
 
+        if key == 'neurons' and 'idx' in self.__dict__:
+            self.idx._invalidate()
+
     def __contains__(self, x):
-        return x in self.neurons
+        return self.idx._find(x) is not None
+
+    def __setitem__(self, key, value):
+        if not isinstance(value, core.BaseNeuron):
+            raise TypeError(f'Expected Neuron, got "{type(value)}"')
+        self.neurons[key] = value
+        self.idx._invalidate()
+
+    def __delitem__(self, key):
+        del self.neurons[key]
+        self.idx._invalidate()
+
 
     def __copy__(self):
         return self.copy(deepcopy=False)
@@ -316,10 +362,16 @@ class NeuronList:
 
     def __getitem__(self, key):
         if utils.is_iterable(key):
-            if all([isinstance(k, (bool, np.bool_)) for k in key]):
-                subset = [n for i, n in enumerate(self.neurons) if key[i]]
+            arr = np.asarray(key)
+            if arr.dtype == bool:
+                if arr.shape[0] != len(self.neurons):
+                    raise IndexError(f'Boolean index of length {arr.shape[0]} '
+                                     f'does not match {len(self.neurons)} neurons')
+                subset = [self.neurons[i] for i in np.flatnonzero(arr)]
+            elif np.issubdtype(arr.dtype, np.integer):
+                subset = [self.neurons[i] for i in arr]
             else:
-                subset = [self[i] for i in key]
+                subset = utils.unpack_neurons([self[i] for i in key])
         elif isinstance(key, str):
             subset = [n for n in self.neurons if re.fullmatch(key, getattr(n, 'name', ''))]
         elif isinstance(key, (int, np.integer, slice)):
@@ -330,10 +382,9 @@ class NeuronList:
         if isinstance(subset, core.BaseNeuron):
             return subset
 
-        # Make sure we unpack neurons
-        subset = utils.unpack_neurons(subset)
         # Make sure each neuron shows up only once but keep original order
-        subset = sorted(set(subset), key=lambda x: subset.index(x))
+        # Note that neurons hash by identity
+        subset = list(dict.fromkeys(subset))
 
         if not subset:
             # This will call __missing__
@@ -378,7 +429,7 @@ class NeuronList:
             return NeuronList([n for n in self.neurons if n != to_sub],
                               make_copy=self.copy_on_subset)
         elif isinstance(to_sub, NeuronList):
-            return NeuronList([n for n in self.neurons if n not in to_sub],
+            return NeuronList([n for n in self.neurons if to_sub.idx._find(n) is None],
                               make_copy=self.copy_on_subset)
         else:
             return NotImplemented
@@ -405,7 +456,8 @@ class NeuronList:
             return NeuronList([n for n in self.neurons if n == other],
                               make_copy=self.copy_on_subset)
         elif isinstance(other, NeuronList):
-            return NeuronList([n for n in self.neurons if n in other],
+            # Use other's index -> no need to compare against every neuron
+            return NeuronList([n for n in self.neurons if other.idx._find(n) is not None],
                               make_copy=self.copy_on_subset)
         else:
             return NotImplemented
@@ -462,9 +514,10 @@ class NeuronList:
 
     def sample(self, N: int = 1) -> 'NeuronList':
         """Returns random subset of neurons."""
-        indices = list(range(len(self.neurons)))
-        random.shuffle(indices)
-        return NeuronList([n for i, n in enumerate(self.neurons) if i in indices[:N]],
+        # Draw indices without replacement but keep original order
+        indices = sorted(random.sample(range(len(self.neurons)),
+                                       min(N, len(self.neurons))))
+        return NeuronList([self.neurons[i] for i in indices],
                           make_copy=self.copy_on_subset)
 
     def plot3d(self, **kwargs):
@@ -527,23 +580,24 @@ class NeuronList:
         """
         if not self.empty:
             # Fetch a union of all summary props (keep order)
-            all_props = [p for l in self.SUMMARY_PROPS for p in l]
-            props = np.unique(all_props)
-            props = sorted(props, key=lambda x: all_props.index(x))
+            props = list(dict.fromkeys([p for n in self.neurons
+                                        for p in n.SUMMARY_PROPS]))
         else:
             props = []
 
         # Add ID to properties - unless all are generic UUIDs
         if any([not isinstance(n.id, uuid.UUID) for n in self.neurons]):
-            props = np.insert(props, 2, 'id')
+            props.insert(2, 'id')
 
         if add_props:
-            props = np.append(props, add_props)
+            props += list(add_props)
 
         if not isinstance(N, slice):
             N = slice(N)
 
-        return pd.DataFrame(data=[[getattr(n, a, 'NA') for a in props]
+        # Neurons cache their (expensive) metrics -> we only collect values
+        # and construct the DataFrame once
+        return pd.DataFrame(data=[n._summary_values(props)
                                   for n in self.neurons[N]],
                             columns=props)
 
@@ -579,7 +633,7 @@ class NeuronList:
         return NeuronList([n.copy(**kwargs) for n in config.tqdm(self.neurons,
                                                                  desc='Copy',
                                                                  leave=False,
-                                                                 disable=config.pbar_hide | len(self) < 20)],
+                                                                 disable=config.pbar_hide or len(self) < 20)],
                           make_copy=False)
 
     def head(self, N: int = 5) -> pd.DataFrame:
@@ -722,23 +776,91 @@ def _worker_wrapper(x: Sequence):
 
 
 class _IdIndexer():
-    """ID-based indexer for NeuronLists to access their neurons by ID."""
+    """ID-based indexer for NeuronLists to access their neurons by ID.
+
+    Keeps hash maps of neuron IDs, object identities and names to positions
+    in the NeuronList. These are built lazily and invalidated by the
+    NeuronList when its neurons are replaced, and by the neurons when their
+    ID or name changes. Adding or removing neurons via ``.neurons`` is
+    caught by checking the list's length.
+
+    """
 
     def __init__(self, obj):
         self.obj = obj
+        self._state = None
+
+    def _invalidate(self):
+        """Force rebuilding the maps on next access."""
+        self._state = None
+
+    def _get_state(self):
+        neurons = self.obj.neurons
+        return (id(neurons), len(neurons), core.BaseNeuron._IDX_EPOCH)
+
+    def _update(self, force=False):
+        """Rebuild maps if neurons have changed."""
+        if not force and self._get_state() == self._state:
+            return
+
+        self._ids = {}
+        self._objects = {}
+        self._names = {}
+        self._unhashable = []
+        for i, n in enumerate(self.obj.neurons):
+            self._ids.setdefault(str(n.id), []).append(i)
+            self._objects[id(n)] = i
+            try:
+                self._names.setdefault(getattr(n, 'name', None), []).append(i)
+            except TypeError:
+                self._unhashable.append(i)
+            # Makes the neuron invalidate indices if its ID or name changes
+            n.__dict__['_indexed'] = True
+
+        self._state = self._get_state()
+
+    def _find(self, x):
+        """Find position of given neuron (by identity or equality).
+
+        Returns ``None`` if not found.
+
+        """
+        self._update()
+        neurons = self.obj.neurons
+
+        # Fast path: the very same object
+        ix = self._objects.get(id(x))
+        if ix is not None and neurons[ix] is x:
+            return ix
+
+        # Neurons compare equal only if their names match -> we only need
+        # to check neurons with the same name
+        try:
+            candidates = self._names.get(getattr(x, 'name', None), [])
+        except TypeError:
+            candidates = range(len(neurons))
+        for ix in list(candidates) + self._unhashable:
+            if neurons[ix] == x:
+                return ix
+
+        return None
 
     def __getitem__(self, ids):
         # Turn into list and force strings
         ids = utils.make_iterable(ids, force_type=str)
 
-        # Get objects that match skid
-        sel = [n for n in self.obj if str(n.id) in ids]
+        self._update()
+        neurons = self.obj.neurons
 
-        # Reorder to keep in the order requested
-        sel = sorted(sel, key=lambda x: np.where(ids == str(x.id))[0][0])
+        sel = []
+        miss = []
+        for i in ids:
+            pos = self._ids.get(i, [])
+            if not pos:
+                miss.append(i)
+            sel += [neurons[p] for p in pos]
 
-        if len(sel) != len(ids):
-            miss = list(set(ids) - set([n.id for n in sel]))
+        if miss:
             raise ValueError(f'No neuron(s) with ID(s): {", ".join(miss)}')
         elif len(sel) == 1:
             return sel[0]
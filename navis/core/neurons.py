@@ -12,6 +12,7 @@
 #    GNU General Public License for more details.
 
 import copy
+import functools
 import numbers
 import os
 import pint
@@ -22,11 +23,13 @@ import warnings
 import networkx as nx
 import numpy as np
 import pandas as pd
+import scipy.spatial
 import trimesh as tm
 
 from io import BufferedIOBase, StringIO
 
-from typing import Union, Callable, List, Sequence, Optional, Dict, overload, Any
+from typing import (Union, Callable, List, Sequence, Optional, Dict, overload,
+                    Any, Tuple)
 from typing_extensions import Literal
 
 from .. import graph, morpho, utils, config, core, sampling, intersection
@@ -40,7 +43,13 @@ logger = config.logger
 # This is to prevent pint to throw a warning about numpy integration
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
-    pint.Quantity([])
+    config.ureg.Quantity([])
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_units(units: Optional[str]) -> pint.Quantity:
+    """Parse units string. Cached because pint's parser is slow."""
+    return config.ureg(units)
 
 
 def Neuron(x: Union[nx.DiGraph, str, pd.DataFrame, 'TreeNeuron', 'MeshNeuron'],
@@ -101,6 +110,10 @@ class BaseNeuron:
     #: Attributes to be used when comparing two neurons.
     EQ_ATTRIBUTES = ['name']
 
+    #: Incremented whenever the ID or name of a neuron that is part of a
+    #: NeuronList's ID index changes. Used to invalidate these indices.
+    _IDX_EPOCH = 0
+
     def __init__(self, **kwargs):
         for k, v in kwargs.items():
             setattr(self, k, v)
@@ -115,7 +128,11 @@ class BaseNeuron:
                     return True
             return False
         elif key.startswith('n_'):
-            return len(getattr(self, key[2:]))
+            data = getattr(self, key[2:])
+            # E.g. ``.n_connectors`` for neurons without connector table
+            if isinstance(data, type(None)):
+                return 0
+            return len(data)
 
         raise AttributeError(f'Attribute "{key}" not found')
 
@@ -136,8 +153,10 @@ class BaseNeuron:
         if isinstance(other, TreeNeuron):
             # We will do this sequentially and stop as soon as we find a
             # discrepancy -> this saves tons of time!
+            m1, m2 = self._get_metrics(), other._get_metrics()
             for at in self.EQ_ATTRIBUTES:
-                comp = getattr(self, at) == getattr(other, at)
+                comp = (m1[at] if at in m1 else getattr(self, at)) == \
+                       (m2[at] if at in m2 else getattr(other, at))
                 if isinstance(comp, np.ndarray) and not all(comp):
                     return False
                 elif comp is False:
@@ -220,6 +239,7 @@ class BaseNeuron:
         except BaseException:
             raise ValueError('id must be hashable')
         self._id = value
+        self._invalidate_indices()
 
     @property
     def name(self) -> str:
@@ -229,6 +249,12 @@ class BaseNeuron:
     @name.setter
     def name(self, v: str):
         self._name = v
+        self._invalidate_indices()
+
+    def _invalidate_indices(self):
+        """Invalidate ID indices of NeuronLists if this neuron is indexed."""
+        if self.__dict__.get('_indexed', False):
+            BaseNeuron._IDX_EPOCH += 1
 
     @property
     def connectors(self) -> pd.DataFrame:
@@ -238,7 +264,7 @@ class BaseNeuron:
     @connectors.setter
     def connectors(self, v):
         if isinstance(v, type(None)):
-            self.__connectors = None
+            self._connectors = None
         else:
             self._connectors = utils.validate_table(v,
                                                     required=['x', 'y', 'z'],
@@ -292,7 +318,7 @@ class BaseNeuron:
         """Units for coordinate space."""
         # Note that we are regenerating the pint.Quantity from the string
         # That is to avoid problems with pickling .e.g when using multiprocessing
-        return config.ureg(getattr(self, '_unit_str', None))
+        return _parse_units(getattr(self, '_unit_str', None))
 
     @units.setter
     def units(self, v: Union[pint.Unit, pint.Quantity, str, None]):
@@ -335,11 +361,24 @@ class BaseNeuron:
                                   return_inverse=True)
             props = props[ix]
 
-        s = pd.Series([getattr(self, at, 'NA') for at in props],
-                      index=props)
+        s = pd.Series(self._summary_values(props), index=props)
 
         return s
 
+    def _get_metrics(self) -> Dict[str, Any]:
+        """Return summary metrics that are expensive to (re-)compute.
+
+        Subclasses cache these as temporary attribute.
+
+        """
+        return {}
+
+    def _summary_values(self, props: Sequence[str]) -> list:
+        """Get values for given summary properties."""
+        metrics = self._get_metrics()
+        return [metrics[at] if at in metrics else getattr(self, at, 'NA')
+                for at in props]
+
     def plot2d(self, **kwargs):
         """Plot neuron using :func:`navis.plot2d`.
 
@@ -403,7 +442,7 @@ class MeshNeuron(BaseNeuron):
     EQ_ATTRIBUTES = ['name', 'n_vertices', 'n_faces']
 
     #: Temporary attributes that need clearing when neuron data changes
-    TEMP_ATTR = ['trimesh']
+    TEMP_ATTR = ['trimesh', 'kdtree', '_lod_cache']
 
     def __init__(self,
                  x: Union[pd.DataFrame,
@@ -467,6 +506,12 @@ class MeshNeuron(BaseNeuron):
             self.trimesh = tm.Trimesh(vertices=self.vertices, faces=self.faces)
             return self.trimesh
 
+        # Trimesh would also have a KD-tree but its vertices may have been
+        # merged and hence indices would not match ours
+        if key == 'kdtree':
+            self.kdtree = scipy.spatial.cKDTree(self.vertices)
+            return self.kdtree
+
         # See if trimesh can help us
         if hasattr(self.trimesh, key):
             return getattr(self.trimesh, key)
@@ -516,12 +561,32 @@ class MeshNeuron(BaseNeuron):
                 logger.debug(f'Neuron {id(self)}: Unable to clear temporary attribute "{a}"')
                 pass
 
+    def _get_metrics(self) -> Dict[str, Any]:
+        """Return summary metrics."""
+        return {'n_vertices': self.vertices.shape[0],
+                'n_faces': self.faces.shape[0]}
+
     @property
     def bbox(self) -> np.ndarray:
         """Bounding box."""
-        mn = np.min(self.vertices, axis=1)
-        mx = np.max(self.vertices, axis=1)
-        return np.append(mn, mx, axis=0).T
+        mn = np.min(self.vertices, axis=0)
+        mx = np.max(self.vertices, axis=0)
+        return np.vstack((mn, mx)).T
+
+    @property
+    def area(self) -> float:
+        """Surface area."""
+        tri = self.vertices[self.faces]
+        cross = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+        return np.linalg.norm(cross, axis=1).sum() / 2
+
+    @property
+    def volume(self) -> float:
+        """Enclosed volume. Only meaningful for watertight meshes."""
+        # Centering improves numerical precision for large coordinates
+        tri = self.vertices[self.faces] - self.vertices.mean(axis=0)
+        det = np.einsum('ij,ij->i', tri[:, 0], np.cross(tri[:, 1], tri[:, 2]))
+        return abs(det.sum()) / 6
 
     @property
     def vertices(self):
@@ -554,6 +619,41 @@ class MeshNeuron(BaseNeuron):
         """Return type."""
         return 'MeshNeuron'
 
+    def snap(self, locs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Snap xyz location(s) to closest vertex.
+
+        Parameters
+        ----------
+        locs :      (N, 3) array | (3, ) array
+                    Either single or multiple x/y/z locations.
+
+        Returns
+        -------
+        ix :        int | (N, ) array
+                    Index of the closest vertex.
+        dist :      float | (N, ) array
+                    Distance to the closest vertex.
+
+        """
+        locs = np.asarray(locs).astype(float)
+        is_single = locs.ndim == 1
+        dist, ix = self.kdtree.query(locs.reshape(-1, 3))
+        if is_single:
+            return ix[0], dist[0]
+        return ix, dist
+
+    def skeletonize(self, **kwargs) -> 'TreeNeuron':
+        """Skeletonize mesh.
+
+        See :func:`navis.mesh2skeleton` for parameters.
+
+        Returns
+        -------
+        TreeNeuron
+
+        """
+        return morpho.mesh2skeleton(self, **kwargs)
+
     def copy(self) -> 'MeshNeuron':
         """Return a copy of the neuron."""
         # Generate new neuron
@@ -603,7 +703,7 @@ class TreeNeuron(BaseNeuron):
     #: Temporary attributes that need to be regenerated when data changes.
     TEMP_ATTR = ['igraph', 'graph', 'segments', 'small_segments',
                  'nodes_geodesic_distance_matrix', 'dps',
-                 'centrality_method', '_simple']
+                 'centrality_method', '_simple', '_path_coords', '_metrics']
 
     #: Attributes used for neuron summary
     SUMMARY_PROPS = ['type', 'name', 'n_nodes', 'n_connectors', 'n_branches',
@@ -732,6 +832,9 @@ class TreeNeuron(BaseNeuron):
                                            rename=True,
                                            optional={'radius': 0},
                                            restrict=False)
+        # Drop cached metrics and coordinates
+        self.__dict__.pop('_metrics', None)
+        self.__dict__.pop('_path_coords', None)
         graph.classify_nodes(self)
 
     @property
@@ -769,7 +872,7 @@ class TreeNeuron(BaseNeuron):
     @connectors.setter
     def connectors(self, v):
         if isinstance(v, type(None)):
-            self.__connectors = None
+            self._connectors = None
         else:
             self._connectors = utils.validate_table(v,
                                                     required=[('connector_id', 'id'),
@@ -779,6 +882,8 @@ class TreeNeuron(BaseNeuron):
                                                                'label')],
                                                     rename=True,
                                                     restrict=False)
+        # Drop cached metrics
+        self.__dict__.pop('_metrics', None)
 
     @property
     def cycles(self) -> Optional[List[int]]:
@@ -811,6 +916,59 @@ class TreeNeuron(BaseNeuron):
                                            inplace=False)
         return self._simple
 
+    @property
+    def path_coords(self) -> Dict[str, np.ndarray]:
+        """Flattened coordinates of segments and edges.
+
+        Dictionary with:
+
+          - ``coords``: (N, 3) concatenated coordinates of ``.segments``
+          - ``node_ix``: (N, ) positional node indices for ``coords``
+          - ``offsets``: (n_segments + 1, ) start of each segment in ``coords``
+          - ``edges``: (M, 2, 3) child -> parent coordinates for all
+            non-root nodes (in order of the node table)
+
+        Computed once and cached as temporary attribute: the cache is
+        cleared when the node table is replaced or temporary attributes are
+        cleared. Like for ``.segments``, you will have to call
+        ``_clear_temp_attr()`` after editing the node table in place.
+        Arrays are read-only - copy them before making changes. Used by the
+        plotting backends.
+
+        """
+        if '_path_coords' not in self.__dict__:
+            self._path_coords = self._get_path_coords()
+        return dict(self._path_coords)
+
+    def _get_path_coords(self) -> Dict[str, np.ndarray]:
+        """Generate flattened segment and edge coordinates."""
+        locs = self.nodes[['x', 'y', 'z']].values.astype(float)
+        parents = self.nodes.parent_id.values
+        id_ix = pd.Index(self.nodes.node_id.values)
+
+        segs = self.segments
+        lengths = np.array([len(s) for s in segs], dtype=int)
+        offsets = np.zeros(len(segs) + 1, dtype=int)
+        np.cumsum(lengths, out=offsets[1:])
+
+        if len(segs):
+            node_ix = id_ix.get_indexer(np.concatenate(segs))
+        else:
+            node_ix = np.zeros(0, dtype=int)
+
+        not_root = parents >= 0
+        parent_ix = id_ix.get_indexer(parents[not_root])
+        edges = np.stack([locs[not_root], locs[parent_ix]], axis=1)
+
+        pc = {'coords': locs[node_ix],
+              'node_ix': node_ix,
+              'offsets': offsets,
+              'edges': edges}
+        # Prevent callers from accidentally corrupting the cache
+        for v in pc.values():
+            v.flags.writeable = False
+        return pc
+
     @property
     def soma(self) -> Optional[Union[str, int]]:
         """Search for soma and return node ID(s).
@@ -845,6 +1003,8 @@ class TreeNeuron(BaseNeuron):
     @soma.setter
     def soma(self, value: Union[Callable, int, None]) -> None:
         """Set soma."""
+        # Drop cached metrics
+        self.__dict__.pop('_metrics', None)
         if hasattr(value, '__call__'):
             self._soma = types.MethodType(value, self)
         elif isinstance(value, type(None)):
@@ -874,22 +1034,17 @@ class TreeNeuron(BaseNeuron):
     @property
     def n_branches(self) -> int:
         """Number of branch points."""
-        return self.nodes[self.nodes.type == 'branch'].shape[0]
+        return self._get_metrics()['n_branches']
 
     @property
     def n_leafs(self) -> int:
         """Number of leafs."""
-        return self.nodes[self.nodes.type == 'end'].shape[0]
+        return self._get_metrics()['n_leafs']
 
     @property
     def cable_length(self) -> Union[int, float]:
         """Cable length."""
-        # Simply sum up edge weight of all graph edges
-        if self.igraph and config.use_igraph:
-            w = self.igraph.es.get_attribute_values('weight')  # type: ignore # doesn't know iGraph
-        else:
-            w = nx.get_edge_attributes(self.graph, 'weight').values()
-        return np.nansum(list(w))
+        return self._get_metrics()['cable_length']
 
     @property
     def volume(self) -> float:
@@ -926,6 +1081,27 @@ class TreeNeuron(BaseNeuron):
         """Return number of seperate skeletons in this neuron."""
         return len(self.root)
 
+    def _get_metrics(self) -> Dict[str, Any]:
+        """Return (cached) summary metrics.
+
+        Calculated once from the node table and cached as ``._metrics``
+        until temporary attributes are cleared or nodes, connectors or soma
+        are reassigned.
+
+        """
+        if '_metrics' not in self.__dict__:
+            types = self.nodes.type.values
+            # Sum of child -> parent distances - this does not require a graph
+            dist = morpho.mmetrics.parent_dist(self, root_dist=0)
+            conn = self.connectors
+            self._metrics = {'n_nodes': self.nodes.shape[0],
+                             'n_connectors': 0 if isinstance(conn, type(None)) else conn.shape[0],
+                             'n_branches': int((types == 'branch').sum()),
+                             'n_leafs': int((types == 'end').sum()),
+                             'cable_length': np.nansum(dist),
+                             'soma': self.soma}
+        return self._metrics
+
     def _clear_temp_attr(self, exclude: list = []) -> None:
         """Clear temporary attributes."""
 
@@ -980,8 +1156,9 @@ class TreeNeuron(BaseNeuron):
         TreeNeuron
 
         """
-        # Generate new neuron
-        x = Neuron(self.nodes)
+        # Generate new neuron without going through __init__: the node table
+        # has already been validated and classified
+        x = self.__class__.__new__(self.__class__)
         # Override with this neuron's data
         x.__dict__.update({k: copy.copy(v) for k, v in self.__dict__.items()})
 
@@ -1026,7 +1203,7 @@ class TreeNeuron(BaseNeuron):
         self.igraph = graph.neuron2igraph(self, raise_not_installed=False)
         return self.igraph
 
-    def get_dps(self) -> pd.DataFrame:
+    def get_dps(self) -> 'core.Dotprops':
         """Calculate and return dotprops representation of the neuron.
 
         Once calculated stored as ``.dps``.
@@ -1182,14 +1359,13 @@ class TreeNeuron(BaseNeuron):
         else:
             x = self.copy(deepcopy=False)
 
-        node = utils.make_iterable(node, force_type=None)
+        node = graph.graph_utils._parse_cut_nodes(x, node)
 
-        for n in node:
-            prox = graph.cut_neuron(x, n, ret='proximal')[0]
-            # Reinitialise with proximal data
-            x.__init__(prox)  # type: ignore  # Cannot access "__init__" directly
-            # Remove potential "left over" attributes (happens if we use a copy)
-            x._clear_temp_attr()
+        # Remove everything distal to the cut nodes but keep the nodes
+        keep = ~graph.graph_utils._distal_mask(x, node)
+        keep[x.nodes.node_id.isin(node).values] = True
+
+        graph.subset_neuron(x, keep, inplace=True)
 
         if not inplace:
             return x
@@ -1219,17 +1395,15 @@ class TreeNeuron(BaseNeuron):
         else:
             x = self.copy(deepcopy=False)
 
-        node = utils.make_iterable(node, force_type=None)
+        node = graph.graph_utils._parse_cut_nodes(x, node)
 
+        # Keep only what is distal to all cut nodes
+        keep = np.ones(x.n_nodes, dtype=bool)
         for n in node:
-            dist = graph.cut_neuron(x, n, ret='distal')[0]
-            # Reinitialise with distal data
-            x.__init__(dist)  # type: ignore  # Cannot access "__init__" directly
-            # Remove potential "left over" attributes (happens if we use a copy)
-            x._clear_temp_attr()
+            keep &= graph.graph_utils._distal_mask(x, [n])
 
-        # Clear temporary attributes is done by cut_neuron
-        # x._clear_temp_attr()
+        # Cut nodes become roots
+        graph.subset_neuron(x, keep, inplace=True)
 
         if not inplace:
             return x
@@ -1311,7 +1485,7 @@ class TreeNeuron(BaseNeuron):
         else:
             x = self.copy()
 
-        morpho.prune_twigs(x, size=size, inplace=True)
+        morpho.prune_twigs(x, size=size, inplace=True, recursive=recursive)
 
         if not inplace:
             return x
@@ -1346,12 +1520,10 @@ class TreeNeuron(BaseNeuron):
         else:
             x = self.copy()
 
+        # Temporary attributes are cleared when the neuron is subset
         graph.longest_neurite(
             x, n, inplace=True, reroot_to_soma=reroot_to_soma)
 
-        # Clear temporary attributes
-        x._clear_temp_attr()
-
         if not inplace:
             return x
         return None
@@ -14,19 +14,20 @@
 import csv
 import functools
 import json
-import math
 import numbers
 import os
 import uuid
 
 import numpy as np
 import scipy.spatial
+
+from scipy.sparse import coo_matrix, csr_matrix, csgraph
 import trimesh
 
-from typing import Union, Optional, Sequence, List, Dict, Any
+from typing import Union, Optional, Sequence, Dict, Any
 from typing_extensions import Literal
 
-from .. import utils, config
+from .. import utils, config, sampling
 
 # Set up logging
 logger = config.logger
@@ -155,7 +156,7 @@ class Volume(trimesh.Trimesh):
         return cls(faces=faces, vertices=vertices, name=name, color=color,
                    volume_id=volume_id)
 
-    def to_csv(self, filename: str, **kwargs) -> None:
+    def to_csv(self, filename: str, lod: int = 0, **kwargs) -> None:
         """Save volume as two separated csv files containing vertices and faces.
 
         Parameters
@@ -163,11 +164,15 @@ class Volume(trimesh.Trimesh):
         filename :      str
                         Filename to use. Will get a ``_vertices.csv`` and
                         ``_faces.csv`` suffix.
+        lod :           int
+                        Level of detail. ``0`` is full resolution. See
+                        :func:`navis.decimate_mesh`.
         **kwargs
                         Keyword arguments passed to ``csv.reader``.
 
         """
-        for data, suffix in zip([self.faces, self.vertices],
+        vertices, faces = sampling.decimation.get_lod(self, lod)
+        for data, suffix in zip([faces, vertices],
                                 ['_faces.csv', '_vertices.csv']):
             with open(filename + suffix, 'w') as csvfile:
                 writer = csv.writer(csvfile)
@@ -283,18 +288,22 @@ class Volume(trimesh.Trimesh):
 
         return cls.from_object(tm, name=name, color=color, **init_kwargs)
 
-    def to_json(self, filename: str) -> None:
+    def to_json(self, filename: str, lod: int = 0) -> None:
         """Save volume as json file.
 
         Parameters
         ----------
         filename :      str
                         Filename to use.
+        lod :           int
+                        Level of detail. ``0`` is full resolution. See
+                        :func:`navis.decimate_mesh`.
 
         """
+        vertices, faces = sampling.decimation.get_lod(self, lod)
         with open(filename, 'w') as f:
-            json.dump({'vertices': self.vertices.tolist(),
-                       'faces': self.faces.tolist()},
+            json.dump({'vertices': np.asarray(vertices).tolist(),
+                       'faces': np.asarray(faces).tolist()},
                       f)
 
     @classmethod
@@ -331,15 +340,16 @@ class Volume(trimesh.Trimesh):
         if False in [isinstance(v, Volume) for v in x]:
             raise TypeError('Input must be list of volumes')
 
-        vertices: np.ndarray = np.empty((0, 3))
-        faces: List[List[int]] = []
+        if not len(x):
+            raise ValueError('Need at least one volume to combine')
+
+        # Offset faces by the number of vertices in the preceding volumes
+        n_verts = np.array([len(vol.vertices) for vol in x])
+        offsets = np.cumsum(n_verts) - n_verts
 
-        # Reindex faces
-        for vol in x:
-            offs = len(vertices)
-            vertices = np.append(vertices, vol.vertices, axis=0)
-            faces += [[f[0] + offs, f[1] + offs, f[2] + offs]
-                      for f in vol.faces]
+        vertices = np.vstack([vol.vertices for vol in x])
+        faces = np.vstack([np.asarray(vol.faces).reshape(-1, 3) + offs
+                           for vol, offs in zip(x, offsets)])
 
         return cls(vertices=vertices, faces=faces, name=name, color=color)
 
@@ -364,7 +374,9 @@ class Volume(trimesh.Trimesh):
 
     def __getstate__(self):
         """Get state (used e.g. for pickling)."""
-        return {k: v for k, v in self.__dict__.items() if not callable(v)}
+        # Cached decimations and outlines are cheap to regenerate
+        return {k: v for k, v in self.__dict__.items()
+                if not callable(v) and k not in ('_lod_cache', '_outlines_cache')}
 
     def __setstate__(self, d):
         """Update state (used e.g. for pickling)."""
@@ -569,7 +581,10 @@ class Volume(trimesh.Trimesh):
               invert_y: bool = False) -> Sequence[Union[float, int]]:
         """Compute the 2d alpha shape (concave hull) this volume.
 
-        Uses Scipy Delaunay and shapely.
+        Triangles of the Delaunay triangulation of the projected vertices
+        with a circumradius above ``1 / alpha`` are removed. If the remaining
+        triangles do not form a single polygon, ``alpha`` is successively
+        lowered by a factor of 10. Results are cached.
 
         Parameters
         ----------
@@ -587,75 +602,133 @@ class Volume(trimesh.Trimesh):
                     e.g. ``[(x1, y1), (x2, y2), (x3, y3), ...]``
 
         """
-        def add_edge(edges, edge_points, coords, i, j):
-            """Add line between the i-th and j-th points."""
-            if (i, j) in edges or (j, i) in edges:
-                # already added
-                return
-            edges.add((i, j))
-            edge_points.append(coords[[i, j]])
-
         accepted_views = ['xy', 'xz', 'yz']
 
-        try:
-            from shapely.ops import cascaded_union, polygonize  # type: ignore
-            import shapely.geometry as geometry  # type: ignore
-        except ImportError:
-            raise ImportError('This function needs the shapely package.')
-
-        coords: np.ndarray
-
-        if view in['xy', 'yx']:
-            coords = self.vertices[:, [0, 1]]  # type: ignore
-            if invert_y:
-                coords[:, 1] = coords[:, 1] * -1  # type: ignore
-
+        if view in ['xy', 'yx']:
+            ix, flip = [0, 1], 1
         elif view in ['xz', 'zx']:
-            coords = self.vertices[:, [0, 2]]  # type: ignore
+            ix, flip = [0, 2], None
         elif view in ['yz', 'zy']:
-            coords = self.vertices[:, [1, 2]]  # type: ignore
-            if invert_y:
-                coords[:, 0] = coords[:, 0] * -1  # type: ignore
+            ix, flip = [1, 2], 0
         else:
             raise ValueError(f'View {view} unknown. Please use either: {accepted_views}')
 
-        tri = scipy.spatial.Delaunay(coords)
-        edges: set = set()
-        edge_points: list = []
-        # loop over triangles:
-        # ia, ib, ic = indices of corner points of the
-        # triangle
-        for ia, ib, ic in tri.vertices:
-            pa: np.ndarray = coords[ia]  # type: ignore
-            pb: np.ndarray = coords[ib]  # type: ignore
-            pc: np.ndarray = coords[ic]  # type: ignore
-            # Lengths of sides of triangle
-            a = math.sqrt((pa[0] - pb[0])**2 + (pa[1] - pb[1])**2)  # type: ignore
-            b = math.sqrt((pb[0] - pc[0])**2 + (pb[1] - pc[1])**2)  # type: ignore
-            c = math.sqrt((pc[0] - pa[0])**2 + (pc[1] - pa[1])**2)  # type: ignore
-            # Semiperimeter of triangle
-            s = (a + b + c) / 2.0
-            # Area of triangle by Heron's formula
-            area = math.sqrt(s * (s - a) * (s - b) * (s - c))
-            circum_r = a * b * c / (4.0 * area)
-            # Here's the radius filter.
-            if circum_r < 1.0 / alpha:
-                add_edge(edges, edge_points, coords, ia, ib)
-                add_edge(edges, edge_points, coords, ib, ic)
-                add_edge(edges, edge_points, coords, ic, ia)
-
-        m = geometry.MultiLineString(edge_points)
-        triangles = list(polygonize(m))
-        concave_hull = cascaded_union(triangles)
-
-        # Try with current settings, if this is not successful, try again
-        # with lower alpha
-        try:
-            return list(concave_hull.exterior.coords)
-        except AttributeError:
-            return self.to_2d(alpha=alpha / 10, view=view, invert_y=invert_y)
-        except BaseException:
-            raise
+        # Outlines are cached until vertices/faces change
+        cache = self.__dict__.get('_outlines_cache')
+        if cache is None or cache.get('token') != self.crc():
+            cache = self._outlines_cache = {'token': self.crc()}
+
+        key = (ix[0], ix[1], alpha, bool(invert_y and flip is not None))
+        if key not in cache:
+            coords = np.array(self.vertices, dtype=float)[:, ix]
+            if key[-1]:
+                coords[:, flip] *= -1
+            cache[key] = _alpha_shape_2d(coords, alpha)
+
+        return [tuple(c) for c in cache[key]]
+
+
+def _alpha_shape_2d(coords: np.ndarray, alpha: float) -> np.ndarray:
+    """Compute exterior of 2d alpha shape.
+
+    Parameters
+    ----------
+    coords :    (N, 2) array
+    alpha :     float
+                Triangles with a circumradius above ``1 / alpha`` are
+                dropped. Lowered until we get a single polygon.
+
+    Returns
+    -------
+    (M, 2) array
+                Closed (first == last) counter-clockwise ring.
+
+    """
+    dl = scipy.spatial.Delaunay(coords)
+    tri = dl.simplices.copy()
+
+    # Make all triangles counter-clockwise
+    pa, pb, pc = coords[tri[:, 0]], coords[tri[:, 1]], coords[tri[:, 2]]
+    area2 = ((pb[:, 0] - pa[:, 0]) * (pc[:, 1] - pa[:, 1])
+             - (pb[:, 1] - pa[:, 1]) * (pc[:, 0] - pa[:, 0]))
+    tri[area2 < 0] = tri[area2 < 0][:, [0, 2, 1]]
+
+    # Circumradius = a * b * c / (4 * area)
+    a = np.linalg.norm(pa - pb, axis=1)
+    b = np.linalg.norm(pb - pc, axis=1)
+    c = np.linalg.norm(pc - pa, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        radius = a * b * c / (2 * np.abs(area2))
+    radius[~np.isfinite(radius)] = np.inf
+    r_max = radius[np.isfinite(radius)].max() if np.isfinite(radius).any() else 0
+
+    # Adjacency of triangles - the extra node represents the area outside
+    # of the convex hull
+    n_tri = len(tri)
+    adj_i = np.repeat(np.arange(n_tri), 3)
+    adj_j = dl.neighbors.ravel()
+    adj_j = np.where(adj_j < 0, n_tri, adj_j)
+
+    while True:
+        # Once the threshold exceeds all radii we get the convex hull
+        if 1 / alpha > r_max:
+            keep = np.ones(n_tri, dtype=bool)
+        else:
+            keep = radius < 1 / alpha
+
+        # Fill holes: dropped triangles that are not connected to the
+        # outside of the convex hull are added back
+        dropped = np.append(~keep, True)
+        is_adj = dropped[adj_i] & dropped[adj_j]
+        G = coo_matrix((np.ones(is_adj.sum()), (adj_i[is_adj], adj_j[is_adj])),
+                       shape=(n_tri + 1, n_tri + 1))
+        _, comp = csgraph.connected_components(G, directed=False)
+        keep = comp[:-1] != comp[-1]
+
+        ring = _outer_ring(coords, tri[keep])
+        if ring is not None:
+            return ring
+
+        alpha /= 10
+
+
+def _outer_ring(coords: np.ndarray, tri: np.ndarray) -> Optional[np.ndarray]:
+    """Boundary of a set of counter-clockwise triangles without holes.
+
+    Returns ``None`` if triangles do not form exactly one polygon.
+
+    """
+    if not len(tri):
+        return None
+
+    n = len(coords)
+
+    # Directed edges: boundary edges are those without a reverse twin
+    tails = tri.ravel()
+    heads = tri[:, [1, 2, 0]].ravel()
+    keys = tails.astype(np.int64) * n + heads
+    is_bound = ~np.isin(heads.astype(np.int64) * n + tails, keys)
+    tails, heads = tails[is_bound], heads[is_bound]
+
+    # Polygons touching in a single point
+    if len(np.unique(tails)) != len(tails):
+        return None
+
+    # Link each edge to its successor and walk the loop
+    order = np.argsort(tails)
+    succ = order[np.searchsorted(tails[order], heads)]
+    n_edges = len(tails)
+    G = csr_matrix((np.ones(n_edges), (np.arange(n_edges), succ)),
+                   shape=(n_edges, n_edges))
+    walk = csgraph.depth_first_order(G, 0, directed=True,
+                                     return_predecessors=False)
+
+    # Multiple polygons
+    if len(walk) != n_edges:
+        return None
+
+    ring = coords[tails[walk]]
+    return np.vstack((ring, ring[:1]))
 
 
 def _force_volume(f):
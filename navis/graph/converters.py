@@ -11,19 +11,15 @@
 #    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 #    GNU General Public License for more details.
 
+import functools
+
 import numpy as np
 import networkx as nx
-import math
 import pandas as pd
 import scipy.spatial
 
 from typing import Union, Optional, List, Iterable
 
-try:
-    import igraph
-except ImportError:
-    igraph = None
-
 from .. import config, core
 
 # Set up logging
@@ -33,6 +29,19 @@ __all__ = sorted(['network2nx', 'network2igraph', 'neuron2igraph', 'nx2neuron',
                   'neuron2nx', 'neuron2KDTree', 'neuron2dps'])
 
 
+@functools.lru_cache(maxsize=None)
+def _get_igraph():
+    """Import igraph on first use (it is slow to import).
+
+    Returns ``None`` if igraph is not installed.
+    """
+    try:
+        import igraph
+    except ImportError:
+        igraph = None
+    return igraph
+
+
 def network2nx(x: Union[pd.DataFrame, Iterable],
                threshold: int = 1,
                group_by: Union[dict, None] = None) -> nx.DiGraph:
@@ -133,6 +142,7 @@ def network2igraph(x: Union[pd.DataFrame, Iterable],
     >>> g.save('graph.graphml')
 
     """
+    igraph = _get_igraph()
     if igraph is None:
         raise ImportError('igraph must be installed to use this function.')
 
@@ -235,6 +245,7 @@ def neuron2igraph(x: 'core.NeuronObject',
 
     """
     # If iGraph is not installed return nothing
+    igraph = _get_igraph()
     if igraph is None:
         if not raise_not_installed:
             return None
@@ -462,41 +473,47 @@ def neuron2KDTree(x: 'core.TreeNeuron',
         return scipy.spatial.KDTree(data=d, **kwargs)
 
 
-def neuron2dps(x: 'core.TreeNeuron') -> pd.DataFrame:
-    """Convert neuron to point clouds with tangent vectors (but no connectivity).
+def neuron2dps(x: 'core.TreeNeuron',
+               k: Optional[int] = None) -> 'core.Dotprops':
+    """Convert neuron to point cloud with tangent vectors (dotprops).
+
+    Dotprops consist of points and tangent vectors but no connectivity.
+    There are two ways to generate them:
 
-    Dotprops consist of a point and a vector. This works by (1) finding the
-    center between child->parent nodes and (2) getting the vector between
-    them. Also returns the length of the vector.
+      1. ``k=None`` (default): points are the centers between child->parent
+         nodes and vectors point from child to parent. ``vec_length`` is the
+         length of cable represented by each point.
+      2. ``k=int``: points are the nodes and vectors are the first principal
+         component of each node's ``k`` nearest neighbours (including itself)
+         as in ``nat.dotprops``. ``alpha`` describes how linear each
+         neighbourhood is: ``(l1 - l2) / (l1 + l2 + l3)``.
 
     Parameters
     ----------
     x :         TreeNeuron
                 Single neuron
+    k :         int, optional
+                Number of nearest neighbours to use for tangent vectors. If
+                None, will use the neuron's edges.
 
     Returns
     -------
-    pandas.DataFrame
-            DataFrame in which each row represents a segments between two
-            nodes::
-
-                point  vector  vec_length
-             1
-             2
-             3
+    navis.Dotprops
 
     Examples
     --------
     >>> import navis
-    >>> x = navis.example_neurons()
+    >>> x = navis.example_neurons(1)
     >>> dps = navis.neuron2dps(x)
     >>> # Get array of all locations
-    >>> locs = numpy.vstack(dps.point.values)
+    >>> locs = dps.points
 
     See Also
     --------
     navis.TreeNeuron.dps
             Shorthand to the dotprops representation of neuron.
+    navis.Dotprops
+            The dotprops class.
 
     """
     if isinstance(x, core.NeuronList):
@@ -508,20 +525,51 @@ def neuron2dps(x: 'core.TreeNeuron') -> pd.DataFrame:
     if not isinstance(x, core.TreeNeuron):
         raise ValueError('Can only process TreeNeurons')
 
-    # First, get a list of child -> parent locs (exclude root node!)
-    tn_locs = x.nodes[x.nodes.parent_id >= 0][['x', 'y', 'z']].values
-    pn_locs = x.nodes.set_index('node_id', inplace=False).loc[x.nodes[x.nodes.parent_id >= 0].parent_id][['x', 'y', 'z']].values
+    if not k:
+        # Get child -> parent locs (exclude root node!)
+        not_root = (x.nodes.parent_id >= 0).values
+        locs = x.nodes[['x', 'y', 'z']].values
+        parent_ix = pd.Index(x.nodes.node_id.values).get_indexer(x.nodes.parent_id.values[not_root])
+        tn_locs = locs[not_root]
+        pn_locs = locs[parent_ix]
 
-    # Get centers between each pair of locs
-    centers = tn_locs + (pn_locs - tn_locs) / 2
+        vec = pn_locs - tn_locs
 
-    # Get vector between points
-    vec = pn_locs - tn_locs
+        return core.Dotprops(points=tn_locs + vec / 2,
+                             vect=vec,
+                             vec_length=np.linalg.norm(vec, axis=1),
+                             name=x.name,
+                             id=x.id)
 
-    dps = pd.DataFrame([[c, v] for c, v in zip(centers, vec)],
-                       columns=['point', 'vector'])
+    points = x.nodes[['x', 'y', 'z']].values.astype(np.float64)
 
-    # Add length of vector (for convenience)
-    dps['vec_length'] = (dps.vector ** 2).apply(sum).apply(math.sqrt)
+    if not points.shape[0]:
+        return core.Dotprops(points=points, vect=points, alpha=[], k=k,
+                             name=x.name, id=x.id)
 
-    return dps
+    # Get k nearest neighbours for each point (including itself)
+    k_eff = min(k, points.shape[0])
+    if k_eff > 1:
+        _, ix = scipy.spatial.cKDTree(points).query(points, k=k_eff)
+    else:
+        ix = np.arange(points.shape[0]).reshape(-1, 1)
+
+    # Covariance matrix of each neighbourhood -> (N, 3, 3)
+    nb = points[ix]
+    nb = nb - nb.mean(axis=1, keepdims=True)
+    cov = np.einsum('nki,nkj->nij', nb, nb) / k_eff
+
+    # eigh returns eigenvalues in ascending order
+    evals, evecs = np.linalg.eigh(cov)
+
+    evals_sum = evals.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        alpha = (evals[:, 2] - evals[:, 1]) / evals_sum
+    alpha[evals_sum == 0] = 0
+
+    return core.Dotprops(points=points,
+                         vect=evecs[:, :, 2],
+                         alpha=alpha,
+                         k=k,
+                         name=x.name,
+                         id=x.id)
@@ -11,8 +11,9 @@
 #    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 #    GNU General Public License for more details.
 
+import multiprocessing as mp
 import numbers
-import warnings
+import os
 
 import pandas as pd
 import numpy as np
@@ -66,65 +67,159 @@ def _generate_segments(x: 'core.NeuronObject',
     # At this point x is TreeNeuron
     x: core.TreeNeuron
 
-    if weight == 'weight':
-        # Get distances from end nodes to root
-        m = geodesic_matrix(x,
-                            directed=True,
-                            weight=weight,
-                            tn_ids=x.nodes[x.nodes.type == 'end'].node_id.values)
-
-        # Sort by distance to root
-        endNodeIDs = m.sort_values(x.root[0],
-                                   inplace=False,
-                                   ascending=False).index.values
-    elif not weight:
-        d = _edge_count_to_root(x)
-        endNodeIDs = x.nodes[x.nodes.type == 'end'].node_id.values
-        endNodeIDs = sorted(endNodeIDs, key=d.get, reverse=True)
-    else:
+    if weight not in ('weight', None):
         raise ValueError(f'Unable to use weight "{weight}"')
 
-    if config.use_igraph and x.igraph:
-        g: igraph.Graph = x.igraph
-        # Convert endNodeIDs to indices
-        id2ix = {n: ix for ix, n in zip(g.vs.indices,
-                                        g.vs.get_attribute_values('node_id'))}
-        endNodeIDs = [id2ix[n] for n in endNodeIDs]
-    else:
-        g: nx.DiGraph = x.graph
+    tops, lengths, tip, parent_ix, order = _longest_paths(x, weight=weight)
+    node_ids = x.nodes.node_id.values
+
+    # Rank of the path each node belongs to
+    rank = np.zeros(len(node_ids), dtype=int)
+    rank[tip[tops]] = np.arange(len(tops))
+    rank = rank[tip]
+
+    # Sort nodes by path and within each path from leaf to root
+    pos = np.empty(len(order), dtype=int)
+    pos[order] = np.arange(len(order))
+    srt = np.lexsort((-pos, rank))
+    splits = np.cumsum(np.bincount(rank, minlength=len(tops)))[:-1]
 
-    seen: set = set()
     sequences = []
-    for nodeID in endNodeIDs:
-        sequence = [nodeID]
-        parents = list(g.successors(nodeID))
-        while True:
-            if not parents:
-                break
-            parentID = parents[0]
-            sequence.append(parentID)
-            if parentID in seen:
-                break
-            seen.add(parentID)
-            parents = list(g.successors(parentID))
+    for seq, attach in zip(np.split(node_ids[srt], splits), parent_ix[tops]):
+        seq = seq.tolist()
+        # Add the node this path attaches to
+        if attach >= 0:
+            seq.append(node_ids[attach])
+        if len(seq) > 1:
+            sequences.append(seq)
 
-        if len(sequence) > 1:
-            sequences.append(sequence)
+    return sequences
 
-    # If igraph, turn indices back to node IDs
-    if config.use_igraph and x.igraph:
-        ix2id = {v: k for k, v in id2ix.items()}
-        sequences = [[ix2id[ix] for ix in s] for s in sequences]
 
-    # Sort sequences by length
+def _parent_index(node_ids: np.ndarray,
+                  parent_ids: np.ndarray) -> np.ndarray:
+    """Map parent IDs to indices into ``node_ids``.
+
+    Roots and parents that are not in ``node_ids`` get -1.
+
+    """
+    srt = np.argsort(node_ids)
+    ix = srt[np.searchsorted(node_ids, parent_ids, sorter=srt).clip(max=len(srt) - 1)]
+    ix[(parent_ids < 0) | (node_ids[ix] != parent_ids)] = -1
+    return ix
+
+
+def _dist_to_root(x: 'core.TreeNeuron',
+                  weight: Optional[str] = 'weight'
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate distance from each node to its root.
+
+    Uses a single pass over the nodes in topological order instead of a
+    distance matrix.
+
+    Parameters
+    ----------
+    x :         TreeNeuron
+    weight :    'weight' | None, optional
+                If ``"weight"`` use physical length. If ``None`` use number
+                of edges.
+
+    Returns
+    -------
+    dist :      (N, ) array
+                Distance to root for each node in the node table.
+    parent_ix : (N, ) array
+                Index of each node's parent (-1 for roots).
+    order :     (N, ) array
+                Node indices sorted from root(s) to leafs.
+
+    """
+    nodes = x.nodes
+    parent_ix = _parent_index(nodes.node_id.values, nodes.parent_id.values)
+    n = len(parent_ix)
+    not_root = parent_ix >= 0
+
+    # Breadth-first order from a virtual super-root connected to all roots
+    G = csr_matrix((np.ones(n, dtype=bool),
+                    (np.where(not_root, parent_ix, n), np.arange(n))),
+                   shape=(n + 1, n + 1))
+    order = csgraph.breadth_first_order(G, n, directed=True,
+                                        return_predecessors=False)[1:]
+
+    dist = np.zeros(n)
     if weight == 'weight':
-        sequences = sorted(
-            sequences, key=lambda x: m.loc[x[0], x[-1]], reverse=True)
+        locs = nodes[['x', 'y', 'z']].values.astype(float)
+        dist[not_root] = np.linalg.norm(locs[not_root] - locs[parent_ix[not_root]],
+                                        axis=1)
     else:
-        sequences = sorted(
-            sequences, key=lambda x: d[x[0]] - d[x[-1]], reverse=True)
+        dist[not_root] = 1
 
-    return sequences
+    # Parents are always visited before their childs
+    dist = dist.tolist()
+    parents = parent_ix.tolist()
+    for i in order.tolist():
+        if parents[i] >= 0:
+            dist[i] += dist[parents[i]]
+
+    return np.array(dist), parent_ix, order
+
+
+def _longest_paths(x: 'core.TreeNeuron',
+                   weight: Optional[str] = 'weight'
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                              np.ndarray, np.ndarray]:
+    """Decompose neuron into longest leaf-to-branch point paths.
+
+    Each node is assigned to the path of the most distal leaf downstream of
+    it. Ties are broken in favour of the leaf that comes first in the node
+    table. Runs in O(N) - no distance matrix required.
+
+    Returns
+    -------
+    tops :      (M, ) array
+                Index of the most proximal node of each path. Sorted by path
+                length (longest first).
+    lengths :   (M, ) array
+                Length of each path including the edge to the node it
+                attaches to (i.e. the parent of its top node).
+    tip :       (N, ) array
+                For each node the index of the leaf that its path ends in.
+    parent_ix : (N, ) array
+                Index of each node's parent (-1 for roots).
+    order :     (N, ) array
+                Node indices sorted from root(s) to leafs.
+
+    """
+    dist, parent_ix, order = _dist_to_root(x, weight=weight)
+
+    # Propagate most distal leaf from leafs to root
+    tip = [-1] * len(parent_ix)
+    dist_l = dist.tolist()
+    parents = parent_ix.tolist()
+    for i in order[::-1].tolist():
+        # All childs have been visited -> no tip means this is a leaf
+        if tip[i] < 0:
+            tip[i] = i
+        p = parents[i]
+        if p >= 0 and (tip[p] < 0
+                       or dist_l[tip[i]] > dist_l[tip[p]]
+                       or (dist_l[tip[i]] == dist_l[tip[p]] and tip[i] < tip[p])):
+            tip[p] = tip[i]
+    tip = np.array(tip, dtype=int)
+
+    # Paths start where a node's parent belongs to a different path
+    not_root = parent_ix >= 0
+    is_top = ~not_root
+    is_top[not_root] = tip[parent_ix[not_root]] != tip[not_root]
+    tops = np.where(is_top)[0]
+    # Order paths by distance of their leaf to the root first
+    tops = tops[np.lexsort((tip[tops], -dist[tip[tops]]))]
+
+    lengths = dist[tip[tops]] - np.where(not_root[tops],
+                                         dist[parent_ix[tops]], 0)
+    srt = np.argsort(-lengths, kind='stable')
+
+    return tops[srt], lengths[srt], tip, parent_ix, order
 
 
 def _connected_components(x: 'core.TreeNeuron') -> List[Set[int]]:
@@ -225,41 +320,6 @@ def _break_segments(x: 'core.NeuronObject') -> list:
     return seg_list
 
 
-def _edge_count_to_root(x: 'core.TreeNeuron') -> dict:
-    """Return a map of nodeID vs number of edges.
-
-    Starts from the first node that lacks successors (aka the root).
-
-    """
-    current_level: List[int]
-    g: Union['igraph.Graph', 'nx.DiGraph']
-    if x.igraph and config.use_igraph:
-        g = x.igraph
-        current_level = g.vs(_outdegree=0).indices
-    else:
-        g = x.graph
-        current_level = list(x.root)
-
-    dist = {}
-    count = 1
-    next_level: List[Union[str, int]] = []
-    while current_level:
-        # Consume all elements in current_level
-        while current_level:
-            node = current_level.pop()
-            dist[node] = count
-            next_level.extend(g.predecessors(node))
-        # Rotate lists (current_level is now empty)
-        current_level, next_level = next_level, current_level  # type: ignore
-        count += 1
-
-    # Map vertex index to node ID
-    if x.igraph and config.use_igraph:
-        dist = {x.igraph.vs[k]['node_id']: v for k, v in dist.items()}
-
-    return dist
-
-
 def classify_nodes(x: 'core.NeuronObject',
                    inplace: bool = True
                    ) -> Optional['core.NeuronObject']:
@@ -296,31 +356,18 @@ def classify_nodes(x: 'core.NeuronObject',
 
     # Make sure there are nodes to classify
     if x.nodes.shape[0] != 0:
-        if config.use_igraph and x.igraph:
-            # Get graph representation of neuron
-            vs = x.igraph.vs
-            # Get branch/end nodes based on their degree of connectivity
-            ends = vs.select(_indegree=0).get_attribute_values('node_id')
-            branches = vs.select(
-                _indegree_gt=1).get_attribute_values('node_id')
-        else:
-            # Get graph representation of neuron
-            g = x.graph
-            # Get branch/end nodes based on their degree of connectivity
-            deg = pd.DataFrame.from_dict(dict(g.degree()), orient='index')
-            # [ n for n in g.nodes if g.degree(n) == 1 ]
-            ends = deg[deg.iloc[:, 0] == 1].index.values
-            # [ n for n in g.nodes if g.degree(n) > 2 ]
-            branches = deg[deg.iloc[:, 0] > 2].index.values
-
-        if 'type' not in x.nodes:
-            x.nodes['type'] = 'slab'
-        else:
-            x.nodes.loc[:, 'type'] = 'slab'
-
-        x.nodes.loc[x.nodes.node_id.isin(ends), 'type'] = 'end'
-        x.nodes.loc[x.nodes.node_id.isin(branches), 'type'] = 'branch'
-        x.nodes.loc[x.nodes.parent_id < 0, 'type'] = 'root'
+        # Branch/end nodes are determined by their number of childs - no
+        # need to generate a graph for that
+        parent_ix = _parent_index(x.nodes.node_id.values,
+                                  x.nodes.parent_id.values)
+        is_root = parent_ix < 0
+        n_childs = np.bincount(parent_ix[~is_root], minlength=len(parent_ix))
+
+        types = np.full(len(parent_ix), 'slab', dtype=object)
+        types[n_childs == 0] = 'end'
+        types[n_childs > 1] = 'branch'
+        types[x.nodes.parent_id.values < 0] = 'root'
+        x.nodes['type'] = types
     else:
         x.nodes['type'] = None
 
@@ -710,9 +757,6 @@ def find_main_branchpoint(x: 'core.NeuronObject',
     2  TreeNeuron     3656             0          63       66  648285.745750    None
 
     """
-    # Make a copy
-    x = x.copy()
-
     if isinstance(x, core.NeuronList) and len(x) > 1:
         return np.array([find_main_branchpoint(n, reroot_to_soma=reroot_to_soma) for n in x])
     elif isinstance(x, core.NeuronList) and len(x) == 1:
@@ -723,21 +767,19 @@ def find_main_branchpoint(x: 'core.NeuronObject',
     # At this point x is TreeNeuron
     x: core.TreeNeuron
 
-    g = graph.neuron2nx(x)
-
-    # First, find longest path
-    longest = nx.dag_longest_path(g, weight='weight')
-
-    # Remove longest path
-    g.remove_nodes_from(longest)
+    if reroot_to_soma and x.soma:
+        x = x.reroot(x.soma, inplace=False)
 
-    # Find second longst path
-    sc_longest = nx.dag_longest_path(g, weight='weight')
+    # Paths are sorted by length: the first one is the longest neurite and
+    # the second longest one attaching to it is the second largest branch
+    tops, _, _, parent_ix, _ = _longest_paths(x, weight='weight')
+    attach = parent_ix[tops]
+    attach = attach[attach >= 0]
 
-    # Parent of the last node in sc_longest is the common branch point
-    bp = list(x.graph.successors(sc_longest[-1]))[0]
+    if not len(attach):
+        raise ValueError(f'Neuron {x.id} has no branch points')
 
-    return bp
+    return x.nodes.node_id.values[attach[0]]
 
 
 def split_into_fragments(x: 'core.NeuronObject',
@@ -947,16 +989,21 @@ def longest_neurite(x: 'core.NeuronObject',
     if reroot_to_soma and x.soma:
         x.reroot(x.soma, inplace=True)
 
-    segments = _generate_segments(x, weight='weight')
+    tops, _, tip, parent_ix, _ = _longest_paths(x, weight='weight')
 
     if isinstance(n, (int, np.int_)):
-        tn_to_preserve: List[int] = [tn for s in segments[:n] for tn in s]
+        tops = tops[:n]
     elif isinstance(n, slice):
-        tn_to_preserve = [tn for s in segments[n] for tn in s]
+        tops = tops[n]
     else:
         raise TypeError(f'Unable to use N of type "{type(n)}"')
 
-    subset_neuron(x, tn_to_preserve, inplace=True)
+    # Keep nodes on these paths plus the nodes they attach to
+    keep = np.isin(tip, tip[tops])
+    attach = parent_ix[tops]
+    keep[attach[attach >= 0]] = True
+
+    subset_neuron(x, keep, inplace=True)
 
     if not inplace:
         return x
@@ -966,35 +1013,51 @@ def longest_neurite(x: 'core.NeuronObject',
 @overload
 def reroot_neuron(x: 'core.NeuronObject',
                   new_root: Union[int, str],
-                  inplace: Literal[False] = False) -> 'core.TreeNeuron':
+                  inplace: Literal[False] = False,
+                  parallel: bool = False,
+                  n_cores: int = os.cpu_count() - 2) -> 'core.NeuronObject':
     pass
 
 
 @overload
 def reroot_neuron(x: 'core.NeuronObject',
                   new_root: Union[int, str],
-                  inplace: Literal[True] = True) -> None:
+                  inplace: Literal[True] = True,
+                  parallel: bool = False,
+                  n_cores: int = os.cpu_count() - 2) -> None:
     pass
 
 
 def reroot_neuron(x: 'core.NeuronObject',
                   new_root: Union[int, str],
-                  inplace: bool = False) -> Optional['core.TreeNeuron']:
+                  inplace: bool = False,
+                  parallel: bool = False,
+                  n_cores: int = os.cpu_count() - 2
+                  ) -> Optional['core.NeuronObject']:
     """Reroot neuron to new root.
 
     Parameters
     ----------
     x :        TreeNeuron | NeuronList
-               List must contain only a SINGLE neuron.
-    new_root : int | str
-               Node ID or tag of the node to reroot to.
+               Neuron(s) to reroot.
+    new_root : int | str | iterable
+               Node ID or tag of the node to reroot to. For a single
+               neuron, multiple new roots (e.g. one for each disconnected
+               fragment) can be given as list. For a NeuronList, provide one
+               new root per neuron (e.g. ``nl.soma``) - neurons with
+               ``None`` as new root are left untouched.
     inplace :  bool, optional
                If True the input neuron will be rerooted.
+    parallel : bool, optional
+               If True and ``x`` is a NeuronList, will find the new parents
+               using multiple processes.
+    n_cores :  int, optional
+               Number of cores to use if ``parallel=True``.
 
     Returns
     -------
-    TreeNeuron
-               Rerooted neuron. Only if ``inplace=False``.
+    TreeNeuron | NeuronList
+               Rerooted neuron(s). Only if ``inplace=False``.
 
     See Also
     --------
@@ -1005,165 +1068,212 @@ def reroot_neuron(x: 'core.NeuronObject',
     Examples
     --------
     >>> import navis
-    >>> n = navis.example_neurons()
+    >>> n = navis.example_neurons(1)
     >>> # Reroot neuron to its soma
     >>> n2 = navis.reroot_neuron(n, n.soma)
+    >>> # Reroot a list of neurons to their somas
+    >>> nl = navis.example_neurons()
+    >>> nl2 = navis.reroot_neuron(nl, nl.soma)
 
     """
-    # if root is a list of new roots (e.g. if neuron consists of disconnected
-    # skeletons)
-    if utils.is_iterable(new_root):
+    if isinstance(x, core.NeuronList) and len(x) == 1:
+        x = x[0]
+    elif isinstance(x, core.NeuronList):
+        if not utils.is_iterable(new_root) or len(new_root) != len(x):
+            raise ValueError(f'Expected one new root for each of the {len(x)} '
+                             'neurons')
         if not inplace:
             x = x.copy()
-        for r in new_root:  # type: ignore
-            reroot_neuron(x, new_root=r, inplace=True)
 
-        if not inplace:
-            return x
+        # Parse tags and drop neurons that do not need rerooting
+        jobs, neurons = [], []
+        for n, r in zip(x, new_root):
+            if r is None:
+                continue
+            r = _parse_new_root(n, r)
+            if _is_root(n, r).all():
+                continue
+            jobs.append((n.nodes.node_id.values, n.nodes.parent_id.values, r))
+            neurons.append(n)
+
+        if parallel and len(jobs) > 1 and n_cores > 1:
+            with mp.Pool(min(n_cores, len(jobs))) as pool:
+                res = list(config.tqdm(pool.imap(_reroot_worker,
+                                                 jobs,
+                                                 chunksize=max(1, len(jobs) // (n_cores * 4))),
+                                       total=len(jobs),
+                                       desc='Rerooting',
+                                       disable=config.pbar_hide,
+                                       leave=config.pbar_leave))
         else:
-            return
-
-    if new_root is None:
-        raise ValueError('New root can not be <None>')
+            res = [_reroot_worker(j) for j in config.tqdm(jobs,
+                                                           desc='Rerooting',
+                                                           disable=config.pbar_hide,
+                                                           leave=config.pbar_leave)]
 
-    if isinstance(x, core.NeuronList):
-        if x.shape[0] == 1:
-            x = x.loc[0]
-        else:
-            raise ValueError(f'Please provide only a single neuron, not {x.shape[0]}')
-    elif not isinstance(x, core.TreeNeuron):
-        raise ValueError(f'Unable to process data of type "{type(x)}"')
+        for n, (parents, paths) in zip(neurons, res):
+            _apply_reroot(n, parents, paths)
 
-    # If new root is a tag, rather than a ID, try finding that node
-    if isinstance(new_root, str):
-        if new_root not in x.tags:
-            raise ValueError(f'#{x.id}: Found no nodes with tag {new_root}'
-                             ' - please double check!')
+        if not inplace:
+            return x
+        return None
 
-        elif len(x.tags[new_root]) > 1:
-            raise ValueError(f'#{x.id}: Found multiple node with tag '
-                             f'{new_root} - please double check!')
-        else:
-            new_root = x.tags[new_root][0]
+    if not isinstance(x, core.TreeNeuron):
+        raise ValueError(f'Unable to process data of type "{type(x)}"')
 
-    # At this point x is TreeNeuron
-    x: core.TreeNeuron
-    # At this point new_root is int
-    new_root: int
+    if new_root is None:
+        raise ValueError('New root can not be <None>')
 
     if not inplace:
         x = x.copy()
 
+    new_root = _parse_new_root(x, new_root)
+
     # Skip if new root is old root
-    if any(x.root == new_root):
-        if not inplace:
-            return x
-        return None
+    if not _is_root(x, new_root).all():
+        parents, paths = _reroot_worker((x.nodes.node_id.values,
+                                         x.nodes.parent_id.values,
+                                         new_root))
+        _apply_reroot(x, parents, paths)
 
-    if x.igraph and config.use_igraph:
-        # Prevent warnings in the following code - querying paths between
-        # unreachable nodes will otherwise generate a runtime warning
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
+    if not inplace:
+        return x
+    return None
 
-            # Find paths to all roots
-            path = x.igraph.get_shortest_paths(x.igraph.vs.find(node_id=new_root),
-                                               [x.igraph.vs.find(node_id=r) for r in x.root])
-            epath = x.igraph.get_shortest_paths(x.igraph.vs.find(node_id=new_root),
-                                                [x.igraph.vs.find(node_id=r) for r in x.root],
-                                                output='epath')
 
-        # Extract paths that actually worked (i.e. within a continuous fragment)
-        path = [p for p in path if p][0]
-        epath = [p for p in epath if p][0]
+def _parse_new_root(x: 'core.TreeNeuron',
+                    new_root: Union[int, str, Sequence[Union[int, str]]]
+                    ) -> np.ndarray:
+    """Turn new root(s) into array of node IDs. Tags are resolved."""
+    new_root = np.asarray(new_root).ravel()
 
-        edges = [(s, t) for s, t in zip(path[:-1], path[1:])]
+    roots = []
+    for r in new_root:
+        # If new root is a tag, rather than a ID, try finding that node
+        if isinstance(r, str):
+            if r not in getattr(x, 'tags', {}):
+                raise ValueError(f'#{x.id}: Found no nodes with tag {r}'
+                                 ' - please double check!')
+            elif len(x.tags[r]) > 1:
+                raise ValueError(f'#{x.id}: Found multiple node with tag '
+                                 f'{r} - please double check!')
+            r = x.tags[r][0]
+        roots.append(r)
 
-        weights = [x.igraph.es[e]['weight'] for e in epath]
+    return np.array(roots, dtype=x.nodes.node_id.dtype)
 
-        # Get all weights and append inversed new weights
-        all_weights = x.igraph.es['weight'] + weights
 
-        # Add inverse edges: old_root->new_root
-        x.igraph.add_edges([(e[1], e[0]) for e in edges])
+def _is_root(x: 'core.TreeNeuron', nodes: np.ndarray) -> np.ndarray:
+    """Check if given node IDs are roots."""
+    roots = x.nodes.node_id.values[x.nodes.parent_id.values < 0]
+    return np.isin(nodes, roots)
 
-        # Re-set weights
-        x.igraph.es['weight'] = all_weights
 
-        # Remove new_root->old_root
-        x.igraph.delete_edges(edges)
+def _reroot_worker(job: tuple) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Reroot by reversing parent pointers along the path(s) to the root.
 
-        # Get degree of old root for later categorisation
-        old_root_deg = len(x.igraph.es.select(_target=path[-1]))
+    Parameters
+    ----------
+    job :       (node_ids, parent_ids, new_roots)
 
-        # Translate path indices to node IDs
-        ix2id = {ix: n for ix, n in zip(x.igraph.vs.indices,
-                                        x.igraph.vs.get_attribute_values('node_id'))}
-        path = [ix2id[i] for i in path]
-    else:
-        # If this NetworkX graph is just an (immutable) view, turn it into a
-        # full, independent graph
-        if float(nx.__version__) < 2.2:
-            if isinstance(x.graph, nx.classes.graphviews.ReadOnlyGraph):
-                x.graph = nx.DiGraph(x.graph)
-        elif hasattr(x.graph, '_NODE_OK'):
-            x.graph = nx.DiGraph(x.graph)
-        elif nx.is_frozen(x.graph):
-            x.graph = nx.DiGraph(x.graph)
+    Returns
+    -------
+    parent_ids :    (N, ) array
+                    New parent IDs.
+    paths :         list of arrays
+                    For each new root, the indices of the nodes between
+                    new and old root (inclusive).
 
+    """
+    node_ids, parents, new_roots = job
+    parents = parents.copy()
+
+    # Index of each node and its parent (-1 for roots)
+    root_ix = _parent_index(node_ids, new_roots)
+    if (node_ids[root_ix] != new_roots).any():
+        miss = new_roots[node_ids[root_ix] != new_roots]
+        raise ValueError(f'New root(s) not found in neuron: {miss}')
+    parent_ix = _parent_index(node_ids, parents)
+
+    # Walking is faster on a list than on an array
+    parent_ix = parent_ix.tolist()
+
+    paths = []
+    for ix in root_ix:
+        # Walk from new root to old root
+        path = [ix]
+        while parent_ix[path[-1]] >= 0:
+            path.append(parent_ix[path[-1]])
+
+        # Reverse pointers along the path
+        for c, p in zip(path[:-1], path[1:]):
+            parent_ix[p] = c
+        parent_ix[path[0]] = -1
+
+        path = np.array(path)
+        parents[path[1:]] = node_ids[path[:-1]]
+        parents[path[0]] = -1
+
+        paths.append(path)
+
+    return parents, paths
+
+
+def _apply_reroot(x: 'core.TreeNeuron',
+                  parents: np.ndarray,
+                  paths: List[np.ndarray]) -> None:
+    """Write new parents to neuron and update cached graphs in place."""
+    nodes = x.nodes
+    node_ids = nodes.node_id.values
+
+    nodes['parent_id'] = parents
+
+    # Only the new and old roots change their type
+    if 'type' in nodes.columns:
+        types = nodes['type'].values.copy()
+        for path in paths:
+            if len(path) < 2:
+                continue
+            old_root_deg = (parents == node_ids[path[-1]]).sum()
+            if old_root_deg == 0:
+                types[path[-1]] = 'end'
+            elif old_root_deg == 1:
+                types[path[-1]] = 'slab'
+            else:
+                types[path[-1]] = 'branch'
+            types[path[0]] = 'root'
+        nodes['type'] = types
+
+    # Update graph representations only if they already exist
+    keep = ['classify_nodes', 'nodes_geodesic_distance_matrix']
+    if 'graph' in x.__dict__:
         g = x.graph
+        # If this NetworkX graph is just an (immutable) view, turn it into a
+        # full, independent graph
+        if hasattr(g, '_NODE_OK') or nx.is_frozen(g):
+            g = x.graph = nx.DiGraph(g)
+        for path in paths:
+            ids = node_ids[path]
+            weights = [g[c][p]['weight'] for c, p in zip(ids[:-1], ids[1:])]
+            g.remove_edges_from(zip(ids[:-1], ids[1:]))
+            g.add_edges_from([(p, c, {'weight': w})
+                              for c, p, w in zip(ids[:-1], ids[1:], weights)])
+        keep.append('graph')
+
+    if 'igraph' in x.__dict__ and x.igraph and config.use_igraph:
+        g = x.igraph
+        # Vertices are generated in the order of the node table
+        if np.array_equal(g.vs.get_attribute_values('node_id'), node_ids):
+            for path in paths:
+                edges = list(zip(path[:-1].tolist(), path[1:].tolist()))
+                eids = g.get_eids(pairs=edges)
+                all_weights = g.es['weight'] + g.es.select(eids)['weight']
+                g.add_edges([(p, c) for c, p in edges])
+                g.es['weight'] = all_weights
+                g.delete_edges(eids)
+            keep.append('igraph')
 
-        # Walk from new root to old root and remove edges along the way
-        parent = next(g.successors(new_root), None)
-        if not parent:
-            # new_root is already the root
-            if not inplace:
-                return x
-            return None
-        path = [new_root]
-        weights = []
-        while parent is not None:
-            weights.append(g[path[-1]][parent]['weight'])
-            g.remove_edge(path[-1], parent)
-            path.append(parent)
-            parent = next(g.successors(parent), None)
-
-        # Invert path and add weights
-        new_edges = [(path[i + 1], path[i],
-                      {'weight': weights[i]}) for i in range(len(path) - 1)]
-
-        # Add inverted path between old and new root
-        g.add_edges_from(new_edges)
-
-        # Get degree of old root for later categorisation
-        old_root_deg = g.in_degree(path[-1])
-
-    # Propagate changes in graph back to node table
-    x.nodes.set_index('node_id', inplace=True)
-    # Assign new node type to old root
-    x.nodes.loc[path[1:], 'parent_id'] = path[:-1]
-    if old_root_deg == 1:
-        x.nodes.loc[path[-1], 'type'] = 'slab'
-    elif old_root_deg > 1:
-        x.nodes.loc[path[-1], 'type'] = 'branch'
-    else:
-        x.nodes.loc[path[-1], 'type'] = 'end'
-    # Make new root node type "root"
-    x.nodes.loc[path[0], 'type'] = 'root'
-    x.nodes.reset_index(drop=False, inplace=True)
-
-    # Set new root's parent to None
-    x.nodes.loc[x.nodes.node_id == new_root, 'parent_id'] = -1
-
-    # Only reset non-graph related attributes
-    if x.igraph and config.use_igraph:
-        x._clear_temp_attr(exclude=['igraph', 'classify_nodes'])
-    else:
-        x._clear_temp_attr(exclude=['graph', 'classify_nodes'])
-
-    if not inplace:
-        return x
-    return None
+    x._clear_temp_attr(exclude=keep)
 
 
 def cut_neuron(x: 'core.NeuronObject',
@@ -1248,29 +1358,7 @@ def cut_neuron(x: 'core.NeuronObject',
     # At this point x is TreeNeuron
     x: core.TreeNeuron
 
-    # Turn cut node into iterable
-    if not utils.is_iterable(cut_node):
-        cut_node = [cut_node]
-
-    # Process cut nodes (i.e. if tag)
-    cn_ids: List[int] = []
-    for cn in cut_node:
-        # If cut_node is a tag (rather than an ID), try finding that node
-        if isinstance(cn, str):
-            if cn not in x.tags:
-                raise ValueError(f'#{x.id}: Found no node with tag {cn}'
-                                 ' - please double check!')
-            cn_ids += x.tags[cn]
-        elif cn not in x.nodes.node_id.values:
-            raise ValueError(f'No node with ID "{cn}" found.')
-        elif cn in x.root:
-            raise ValueError(f'Unable to cut at treenode "{cn}" - node is root')
-        else:
-            cn_ids.append(cn)
-
-    # Remove duplicates while retaining order - set() would mess that up
-    seen: Set[int] = set()
-    cn_ids = [cn for cn in cn_ids if not (cn in seen or seen.add(cn))]
+    cn_ids = _parse_cut_nodes(x, cut_node)
 
     # Warn if not all returned
     if len(cn_ids) > 1 and ret != 'both':
@@ -1303,6 +1391,58 @@ def cut_neuron(x: 'core.NeuronObject',
     return core.NeuronList(res)
 
 
+def _parse_cut_nodes(x: 'core.TreeNeuron',
+                     cut_node: Union[int, str, List[Union[int, str]]]
+                     ) -> List[int]:
+    """Turn cut node(s) into list of unique node IDs. Tags are resolved."""
+    # Turn cut node into iterable
+    if not utils.is_iterable(cut_node):
+        cut_node = [cut_node]
+
+    # Process cut nodes (i.e. if tag)
+    cn_ids: List[int] = []
+    for cn in cut_node:
+        # If cut_node is a tag (rather than an ID), try finding that node
+        if isinstance(cn, str):
+            if cn not in getattr(x, 'tags', {}):
+                raise ValueError(f'#{x.id}: Found no node with tag {cn}'
+                                 ' - please double check!')
+            cn_ids += x.tags[cn]
+        elif cn not in x.nodes.node_id.values:
+            raise ValueError(f'No node with ID "{cn}" found.')
+        elif cn in x.root:
+            raise ValueError(f'Unable to cut at treenode "{cn}" - node is root')
+        else:
+            cn_ids.append(cn)
+
+    # Remove duplicates while retaining order - set() would mess that up
+    seen: Set[int] = set()
+    return [cn for cn in cn_ids if not (cn in seen or seen.add(cn))]
+
+
+def _distal_mask(x: 'core.TreeNeuron',
+                 nodes: Sequence[int]) -> np.ndarray:
+    """Boolean mask of nodes distal to (and including) given node IDs."""
+    node_ids = x.nodes.node_id.values
+    parent_ix = _parent_index(node_ids, x.nodes.parent_id.values)
+    start_ix = pd.Index(node_ids).get_indexer(nodes)
+    n = len(node_ids)
+
+    # Edges point from parent to child. A virtual node connects to all
+    # start nodes so that we only have to traverse the tree once.
+    not_root = parent_ix >= 0
+    G = csr_matrix((np.ones(not_root.sum() + len(start_ix), dtype=bool),
+                    (np.append(parent_ix[not_root], np.full(len(start_ix), n)),
+                     np.append(np.where(not_root)[0], start_ix))),
+                   shape=(n + 1, n + 1))
+    distal = csgraph.breadth_first_order(G, n, directed=True,
+                                         return_predecessors=False)[1:]
+
+    mask = np.zeros(n, dtype=bool)
+    mask[distal] = True
+    return mask
+
+
 def _cut_igraph(x: 'core.TreeNeuron',
                 cut_node: int,
                 ret: str) -> Union['core.TreeNeuron',
@@ -1434,7 +1574,7 @@ def _cut_networkx(x: 'core.TreeNeuron',
 
 
 @overload
-def subset_neuron(x: 'core.TreeNeuron',
+def subset_neuron(x: Union['core.TreeNeuron', 'core.MeshNeuron'],
                   subset: Union[Sequence[Union[int, str]],
                                 nx.DiGraph,
                                 pd.DataFrame],
@@ -1442,12 +1582,12 @@ def subset_neuron(x: 'core.TreeNeuron',
                   clear_temp: bool = True,
                   keep_disc_cn: bool = False,
                   prevent_fragments: bool = False
-                  ) -> 'core.TreeNeuron':
+                  ) -> Union['core.TreeNeuron', 'core.MeshNeuron']:
     pass
 
 
 @overload
-def subset_neuron(x: 'core.TreeNeuron',
+def subset_neuron(x: Union['core.TreeNeuron', 'core.MeshNeuron'],
                   subset: Union[Sequence[Union[int, str]],
                                 nx.DiGraph,
                                 pd.DataFrame],
@@ -1459,7 +1599,7 @@ def subset_neuron(x: 'core.TreeNeuron',
     pass
 
 
-def subset_neuron(x: 'core.TreeNeuron',
+def subset_neuron(x: Union['core.TreeNeuron', 'core.MeshNeuron'],
                   subset: Union[Sequence[Union[int, str]],
                                 nx.DiGraph,
                                 pd.DataFrame],
@@ -1467,31 +1607,35 @@ def subset_neuron(x: 'core.TreeNeuron',
                   clear_temp: bool = True,
                   keep_disc_cn: bool = False,
                   prevent_fragments: bool = False
-                  ) -> Optional['core.TreeNeuron']:
-    """Subset a neuron to a given set of nodes.
+                  ) -> Optional[Union['core.TreeNeuron', 'core.MeshNeuron']]:
+    """Subset a neuron to a given set of nodes/vertices.
 
     Parameters
     ----------
-    x :                   TreeNeuron
+    x :                   TreeNeuron | MeshNeuron
     subset :              np.ndarray | NetworkX.Graph | pandas.DataFrame
-                          Node IDs to subset the neuron to. If DataFrame
-                          must have `node_id` column.
+                          For TreeNeurons: node IDs or boolean mask (same
+                          order as node table) to subset the neuron to.
+                          If DataFrame must have `node_id` column.
+                          For MeshNeurons: vertex indices or boolean mask.
+                          Only faces with all three vertices in ``subset``
+                          are kept.
     clear_temp :          bool, optional
                           If True, will reset temporary attributes (graph,
                           node classification, etc. ). In general, you should
                           leave this at ``True``.
     keep_disc_cn :        bool, optional
                           If False, will remove disconnected connectors that
-                          have "lost" their parent node.
+                          have "lost" their parent node/vertex.
     prevent_fragments :   bool, optional
                           If True, will add nodes to ``subset`` required to
-                          keep neuron from fragmenting.
+                          keep neuron from fragmenting. TreeNeurons only.
     inplace :             bool, optional
                           If False, a copy of the neuron is returned.
 
     Returns
     -------
-    TreeNeuron
+    TreeNeuron | MeshNeuron
 
     Examples
     --------
@@ -1518,23 +1662,32 @@ def subset_neuron(x: 'core.TreeNeuron',
     if isinstance(x, core.NeuronList) and len(x) == 1:
         x = x[0]
 
-    if not isinstance(x, core.TreeNeuron):
-        raise TypeError(f'Expected "TreeNeuron", got "{type(x)}"')
+    if isinstance(x, core.MeshNeuron):
+        return _subset_mesh(x, subset, inplace=inplace,
+                            keep_disc_cn=keep_disc_cn)
 
-    if isinstance(subset, np.ndarray):
-        pass
-    elif isinstance(subset, (list, set)):
-        subset = np.array(subset)
-    elif isinstance(subset, (nx.DiGraph, nx.Graph)):
-        subset = subset.nodes
+    if not isinstance(x, core.TreeNeuron):
+        raise TypeError(f'Expected "TreeNeuron" or "MeshNeuron", got "{type(x)}"')
+
+    node_ids = x.nodes.node_id.values
+    if isinstance(subset, np.ndarray) and subset.dtype == bool:
+        if subset.shape != node_ids.shape:
+            raise ValueError(f'Mask of length {len(subset)} does not match '
+                             f'{len(node_ids)} nodes')
+        mask = subset
+    elif isinstance(subset, (np.ndarray, list)):
+        mask = np.isin(node_ids, subset)
+    elif isinstance(subset, (set, nx.DiGraph, nx.Graph)):
+        mask = np.isin(node_ids, list(subset))
     elif isinstance(subset, pd.DataFrame):
-        subset = subset.node_id.values
+        mask = np.isin(node_ids, subset.node_id.values)
     else:
         raise TypeError('Can only subset to list, set, numpy.ndarray or'
                         f'networkx.Graph, not "{type(subset)}"')
 
     if prevent_fragments:
-        subset, new_root = connected_subgraph(x, subset)
+        subset, new_root = connected_subgraph(x, node_ids[mask])
+        mask = np.isin(node_ids, subset)
     else:
         new_root = None  # type: ignore # new_root has already type from before
 
@@ -1542,49 +1695,113 @@ def subset_neuron(x: 'core.TreeNeuron',
     if not inplace:
         x = x.copy(deepcopy=False)
 
-    # Filter nodes
-    x.nodes = x.nodes[x.nodes.node_id.isin(subset)]
+    _subset_by_mask(x, mask, keep_disc_cn=keep_disc_cn)
+
+    if new_root:
+        x.reroot(new_root, inplace=True)
 
-    # Make sure that there are root nodes
-    # This is the fastest "pandorable" way: instead of overwriting the column,
-    # concatenate a new column to this DataFrame
-    x.nodes = pd.concat([x.nodes.drop('parent_id', inplace=False, axis=1),  # type: ignore  # no stubs for concat
-                         x.nodes[['parent_id']].where(x.nodes.parent_id.isin(x.nodes.node_id.values),
-                                                      -1, inplace=False)],
-                        axis=1)
+    # Clear temporary attributes (nodes have already been classified)
+    if clear_temp:
+        x._clear_temp_attr(exclude=['igraph', 'classify_nodes'])
+
+    if not inplace:
+        return x
+    return None
+
+
+def _subset_by_mask(x: 'core.TreeNeuron',
+                    mask: np.ndarray,
+                    keep_disc_cn: bool = False) -> None:
+    """Subset neuron in place to the nodes in boolean ``mask``.
+
+    Nodes whose parent is removed become roots. Connectors, tags and a
+    cached iGraph are subset along with the nodes. Does not clear any other
+    temporary attributes.
+
+    """
+    nodes = x.nodes
+    parent_ix = _parent_index(nodes.node_id.values, nodes.parent_id.values)
+    parents = nodes.parent_id.values.copy()
+    parents[(parent_ix >= 0) & ~mask[parent_ix]] = -1
+
+    nodes = nodes.loc[mask].reset_index(drop=True)
+    nodes['parent_id'] = parents[mask]
+    # This also classifies the nodes
+    x.nodes = nodes
+
+    keep_ids = nodes.node_id.values
 
     # Filter connectors
     if not keep_disc_cn and x.has_connectors:
-        x.connectors = x.connectors[x.connectors.node_id.isin(subset)]
-        x.connectors.reset_index(inplace=True, drop=True)
+        x.connectors = x.connectors[x.connectors.node_id.isin(keep_ids)].reset_index(drop=True)
 
     if hasattr(x, 'tags'):
-        # Filter tags
-        x.tags = {t: [tn for tn in x.tags[t] if tn in subset] for t in x.tags}  # type: ignore  # TreeNeuron has no tags
+        # Filter tags and remove empty ones
+        keep_set = set(keep_ids)
+        x.tags = {t: [tn for tn in x.tags[t] if tn in keep_set] for t in x.tags}  # type: ignore  # TreeNeuron has no tags
+        x.tags = {t: v for t, v in x.tags.items() if v}  # type: ignore  # TreeNeuron has no tags
+
+    # Vertices of the iGraph are in the same order as the nodes -> no need
+    # to map node IDs
+    g = x.__dict__.pop('igraph', None)
+    if g and config.use_igraph and g.vcount() == len(mask):
+        x.igraph = g.induced_subgraph(np.where(mask)[0].tolist())
+        if not np.array_equal(x.igraph.vs.get_attribute_values('node_id'), keep_ids):
+            del x.igraph
+
+    # The NetworkX graph is cheaper to regenerate than to subset
+    x.__dict__.pop('graph', None)
+
+
+def _subset_mesh(x: 'core.MeshNeuron',
+                 subset: Union[Sequence[int], np.ndarray],
+                 inplace: bool = False,
+                 keep_disc_cn: bool = False
+                 ) -> Optional['core.MeshNeuron']:
+    """Subset MeshNeuron to given vertices. See :func:`navis.subset_neuron`.
+
+    Connectors are mapped to their closest vertex (``vertex_id`` column).
+    Connectors that lost their vertex get a ``vertex_id`` of -1 if
+    ``keep_disc_cn=True``.
 
-        # Remove empty tags
-        x.tags = {t: x.tags[t] for t in x.tags if x.tags[t]}  # type: ignore  # TreeNeuron has no tags
+    """
+    subset = np.asarray(subset)
+    n_verts = x.vertices.shape[0]
+
+    if subset.dtype == bool:
+        if subset.shape != (n_verts, ):
+            raise ValueError(f'Boolean mask must be of shape ({n_verts}, ), '
+                             f'got {subset.shape}')
+        keep = subset
+    else:
+        keep = np.zeros(n_verts, dtype=bool)
+        keep[subset.astype(int)] = True
 
-    # Fix graph representations
-    if 'graph' in x.__dict__:
-        x.graph = x.graph.subgraph(x.nodes.node_id.values)
-    if 'igraph' in x.__dict__:
-        if x.igraph and config.use_igraph:
-            id2ix = {n: ix for ix, n in zip(x.igraph.vs.indices,
-                                            x.igraph.vs.get_attribute_values('node_id'))}
-            indices = [id2ix[n] for n in x.nodes.node_id.values]
-            vs = x.igraph.vs[indices]
-            x.igraph = x.igraph.subgraph(vs)
+    # Keep only faces with all vertices in the subset
+    faces = x.faces[keep[x.faces].all(axis=1)]
 
-    # Reset indices of data tables
-    x.nodes.reset_index(inplace=True, drop=True)
+    # Drop vertices that are not part of any of the remaining faces
+    used = np.zeros(n_verts, dtype=bool)
+    used[faces.ravel()] = True
+    remap = np.full(n_verts, -1, dtype=int)
+    remap[used] = np.arange(used.sum())
 
-    if new_root:
-        x.reroot(new_root, inplace=True)
+    if not inplace:
+        x = x.copy()
 
-    # Clear temporary attributes
-    if clear_temp:
-        x._clear_temp_attr(exclude=['graph', 'igraph'])
+    if x.has_connectors:
+        cn = x.connectors
+        if 'vertex_id' in cn.columns:
+            vid = cn.vertex_id.values.astype(int)
+        else:
+            vid = x.snap(cn[['x', 'y', 'z']].values)[0]
+        vid = np.where(vid >= 0, remap[vid], -1)
+        if not keep_disc_cn:
+            cn, vid = cn[vid >= 0], vid[vid >= 0]
+        x.connectors = cn.assign(vertex_id=vid).reset_index(drop=True)
+
+    # Setting vertices and faces clears temporary attributes
+    x.vertices, x.faces = x.vertices[used], remap[faces]
 
     if not inplace:
         return x
@@ -1683,9 +1900,12 @@ def _igraph_to_sparse(graph, weight_attr=None):
 
 
 def connected_subgraph(x: 'core.TreeNeuron',
-                       ss: Sequence[Union[str, int]]) -> Tuple[np.ndarray, Union[int, str]]:
+                       ss: Sequence[Union[str, int]]) -> Tuple[np.ndarray, List[Union[int, str]]]:
     """Return set of nodes necessary to connect all nodes in subset ``ss``.
 
+    For each connected component of the neuron, this is the union of the
+    paths from the nodes in ``ss`` to their lowest common ancestor (LCA).
+
     Parameters
     ----------
     x :         navis.TreeNeuron
@@ -1697,9 +1917,10 @@ def connected_subgraph(x: 'core.TreeNeuron',
     -------
     np.ndarray
                 Node IDs of connected subgraph.
-    root ID
-                ID of the node most proximal to the old root in the
-                connected subgraph.
+    list
+                IDs of the nodes most proximal to the old root(s) in the
+                connected subgraph (i.e. the LCAs) - one for each connected
+                component that contains nodes in ``ss``.
 
     Examples
     --------
@@ -1719,67 +1940,41 @@ def connected_subgraph(x: 'core.TreeNeuron',
     if not isinstance(x, core.TreeNeuron):
         raise TypeError(f'Input must be a single TreeNeuron, got "{type(x)}".')
 
-    missing = set(ss) - set(x.nodes.node_id.values)
-    missing = np.array(list(missing)).astype(str)  # do NOT remove list() here!
-    if missing:
+    node_ids = x.nodes.node_id.values
+    ss = np.asarray(ss)
+    missing = ss[~np.isin(ss, node_ids)].astype(str)
+    if len(missing):
         raise ValueError(f'Nodes not found: {",".join(missing)}')
 
-    # Find leaf nodes in subset (real leafs and simply disconnected slabs)
-    ss_nodes = x.nodes[x.nodes.node_id.isin(ss)]
-    leafs = ss_nodes[(ss_nodes.type == 'end')].node_id.values
-    disconnected = x.nodes[(~x.nodes.node_id.isin(ss)) & (x.nodes.parent_id.isin(ss))]
-    leafs = np.append(leafs, disconnected.parent_id.values)
-
-    # Run this for each connected component of the neuron
-    include = set()
-    new_roots = []
-    for cc in nx.connected_components(x.graph.to_undirected()):
-        # Walk from each node to root and keep track of path
-        g = x.graph
-        paths = []
-        for n in leafs[np.isin(leafs, list(cc))]:
-            this_path = []
-            while n:
-                this_path.append(n)
-                n = next(g.successors(n), None)
-            paths.append(this_path)
-
-        # If none of these cc in subset there won't be paths
-        if not paths:
-            continue
-
-        # Find the nodes that all paths have in common
-        common = set.intersection(*[set(p) for p in paths])
-
-        # Now find the first (most distal from root) common node
-        longest_path = sorted(paths, key=lambda x: len(x))[-1]
-        first_common = sorted(common, key=lambda x: longest_path.index(x))[0]
-
-        # Now go back to paths and collect all nodes until this first common node
-        include = set()
-        for p in paths:
-            it = iter(p)
-            n = next(it, None)
-            while n:
-                if n in include:
-                    break
-                if n == first_common:
-                    include.add(n)
-                    break
-                include.add(n)
-                n = next(it, None)
-
-        # In cases where there are even more distal common ancestors
-        # (first common will typically be a branch point)
-        this_ss = ss[np.isin(ss, list(cc))]
-        if set(this_ss) - set(include):
-            # Make sure the new root is set correctly
-            nr = sorted(set(this_ss) - set(include),
-                        key=lambda x: longest_path.index(x))[-1]
-            new_roots.append(nr)
-            # Add those nodes to be included
-            include = set.union(include, this_ss)
-        else:
-            new_roots.append(first_common)
-
-    return np.array(list(include)), new_roots
+    in_ss = np.isin(node_ids, ss)
+    depth, parent_ix, order = _dist_to_root(x, weight=None)
+
+    # Propagate the number of nodes in subset from leafs to root
+    counts = in_ss.astype(int).tolist()
+    parents = parent_ix.tolist()
+    for i in order[::-1].tolist():
+        if parents[i] >= 0:
+            counts[parents[i]] += counts[i]
+    counts = np.array(counts)
+
+    # Total number of nodes in subset per connected component
+    n = len(node_ids)
+    not_root = parent_ix >= 0
+    G = csr_matrix((np.ones(not_root.sum(), dtype=bool),
+                    (parent_ix[not_root], np.where(not_root)[0])),
+                   shape=(n, n))
+    _, cc = csgraph.connected_components(G, directed=False)
+    total = np.bincount(cc, weights=in_ss)[cc]
+
+    # Common ancestors of all nodes in subset are on the path from the LCA
+    # to the root -> the LCA is the most distal of them
+    common = np.where((counts == total) & (total > 0))[0]
+    common = common[np.argsort(depth[common], kind='stable')[::-1]]
+    _, first = np.unique(cc[common], return_index=True)
+    lca = common[first]
+
+    # Keep nodes that are upstream of some but not all nodes in subset
+    include = (counts > 0) & (counts < total)
+    include[lca] = True
+
+    return node_ids[include], node_ids[lca].tolist()
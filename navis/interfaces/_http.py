@@ -0,0 +1,51 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+"""Helpers shared by the web database interfaces."""
+
+import os
+import uuid
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Max number of parallel requests
+max_threads = 8
+
+
+def make_session(pool_size: int = max_threads) -> requests.Session:
+    """Generate session with connection pool and automatic retries."""
+    session = requests.Session()
+    retries = Retry(total=5, backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(max_retries=retries,
+                          pool_connections=pool_size,
+                          pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def write_atomic(fp: str, data: str) -> None:
+    """Write data to file.
+
+    We write to a temporary file first and then rename it. This makes sure
+    that interrupted downloads never leave partial files in the cache.
+    """
+    os.makedirs(os.path.dirname(fp) or '.', exist_ok=True)
+    tmp = f'{fp}.{uuid.uuid4().hex}.tmp'
+    with open(tmp, 'w') as f:
+        f.write(data)
+    os.replace(tmp, fp)
@@ -496,8 +496,8 @@ class Handler:
         mat = bpy.data.materials.get(mat_name,
                                      bpy.data.materials.new(mat_name))
 
-        cu = bpy.data.curves.new(f"{getattr(x, 'dotprop', '')} mesh", 'CURVE')
-        ob = bpy.data.objects.new(f"#{object_id} - {getattr(x, 'neuron_name', '')}",
+        cu = bpy.data.curves.new(f"{getattr(x, 'name', '')} mesh", 'CURVE')
+        ob = bpy.data.objects.new(f"#{object_id} - {getattr(x, 'name', '')}",
                                   cu)
         ob.location = (0, 0, 0)
         ob.show_name = True
@@ -510,9 +510,9 @@ class Handler:
         cu.bevel_depth = 0.007
 
         # Prepare lines - this is based on nat:::plot3d.dotprops
-        halfvect = (np.vstack(x.vector) / 2 * scale_vect)
-        starts = (np.vstack(x.point) - halfvect)
-        ends = (np.vstack(x.point) + halfvect)
+        halfvect = x.vect / 2 * scale_vect
+        starts = x.points - halfvect
+        ends = x.points + halfvect
 
         halfvect *= self.scaling
         starts *= self.scaling
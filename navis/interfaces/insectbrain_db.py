@@ -12,30 +12,37 @@ insect brains and neurons.
 """
 
 import os
-import requests
-import tempfile
 
+import numpy as np
 import pandas as pd
 
-from tqdm import tqdm
-
-from typing import Union, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Optional, List, Tuple
 
 from ..core import Volume
 from ..utils import make_url
-from ..config import logger
+from .. import config
 from ..plotting.colors import hex_to_rgb
+from ._http import make_session, write_atomic, max_threads
+
+logger = config.logger
 
 
 baseurl = 'http://www.insectbraindb.org'
 
+# All requests share this session (and hence its connection pool)
+session = make_session()
+
 
 def get_brain_meshes(species: Union[str, int],
                      save_to: Optional[str] = None,
-                     combine_vols: bool = False
+                     combine_vols: bool = False,
+                     cache_dir: Optional[str] = None
                      ) -> Optional[List[Volume]]:
     """Fetch brain meshes for given species.
 
+    Meshes are downloaded in parallel.
+
     Parameters
     ----------
     species:        str | int
@@ -47,6 +54,9 @@ def get_brain_meshes(species: Union[str, int],
     combine_vols :  bool, optional
                     If True, will combine subvolumes (i.e. neuropils) into
                     a single navis.Volume - else will return list with volumes.
+    cache_dir :     str, optional
+                    If provided, downloaded .obj files are stored in this
+                    folder and re-used on subsequent calls.
 
     Returns
     -------
@@ -78,39 +88,43 @@ def get_brain_meshes(species: Union[str, int],
     logger.info(f'{n_reconstr} reconstruction(s) from {n_brains} brain(s) found')
 
     volumes: List[Volume] = []
-    for brain in tqdm(sp_info.reconstructions, desc='Brains'):  # type: ignore
-        this_v = []
+    for brain in config.tqdm(sp_info.reconstructions, desc='Brains',  # type: ignore
+                             disable=config.pbar_hide, leave=config.pbar_leave):
         # If no reconstructions, continue
         if not brain.get('viewer_files'):  # type: ignore
             continue
-        for file in tqdm(brain['viewer_files'], desc='Meshes'):
-            filename = file['p_file']['file_name']
-            path = file['p_file']['path']
-            url = make_url(obj_url, path)
 
-            if file.get('neuropil'):
-                color = hex_to_rgb(file['neuropil'][0]['color'])
-            else:
-                color = (1, 1, 1, .1)
+        files = brain['viewer_files']
+        urls = [make_url(obj_url, f['p_file']['path']) for f in files]
+
+        # Download in background threads - we parse in the main thread as
+        # results come in
+        with ThreadPoolExecutor(max_workers=max_threads) as executor:
+            results = executor.map(lambda u: _fetch_obj(u, cache_dir=cache_dir),
+                                   urls)
 
-            resp = requests.get(url)
-            resp.raise_for_status()
+            this_v = []
+            for file, obj in config.tqdm(zip(files, results),
+                                         total=len(files),
+                                         desc='Meshes',
+                                         disable=config.pbar_hide,
+                                         leave=config.pbar_leave):
+                filename = file['p_file']['file_name']
 
-            if save_to:
-                fp = os.path.join(save_to, filename)
-            else:
-                # Save temporary file
-                fp = os.path.join(tempfile.gettempdir(), 'temp.obj')
+                if save_to:
+                    write_atomic(os.path.join(save_to, filename), obj)
+                    continue
 
-            with open(fp, 'w') as f:
-                f.write(resp.content.decode())
+                if file.get('neuropil'):
+                    color = hex_to_rgb(file['neuropil'][0]['color'])
+                else:
+                    color = (1, 1, 1, .1)
 
-            if not save_to:
-                v = Volume.from_file(fp, name=filename, color=color)
-                this_v.append(v)
+                verts, faces = _parse_obj(obj)
+                this_v.append(Volume(verts, faces, name=filename, color=color))
 
         # Combine all volumes in this brain
-        if combine_vols:
+        if combine_vols and this_v:
             this_v = [Volume.combine(this_v)]
 
         volumes += this_v
@@ -121,6 +135,64 @@ def get_brain_meshes(species: Union[str, int],
         return None
 
 
+def _fetch_obj(url: str, cache_dir: Optional[str] = None) -> str:
+    """Fetch OBJ file - either from cache or from server."""
+    if cache_dir:
+        # The S3 path is unique for each file
+        fp = os.path.join(cache_dir, url.split('ibdb-file-storage/')[-1])
+        if os.path.isfile(fp):
+            with open(fp, 'r') as f:
+                return f.read()
+
+    resp = session.get(url)
+    resp.raise_for_status()
+    obj = resp.content.decode()
+
+    if cache_dir:
+        write_atomic(fp, obj)
+
+    return obj
+
+
+def _parse_obj(obj: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse vertices and faces from Wavefront OBJ string.
+
+    Only ``v`` and ``f`` records are parsed. Polygons with more than three
+    vertices are triangulated as fans.
+
+    Returns
+    -------
+    vertices :  (N, 3) numpy array
+    faces :     (M, 3) numpy array
+
+    """
+    verts, faces = [], []
+    # Negative indices are relative to the vertices defined so far, so we need
+    # to track the number of vertices seen before each face
+    n_verts = []
+    for l in obj.splitlines():
+        if l.startswith('v '):
+            verts.append(l.split()[1:4])
+        elif l.startswith('f '):
+            # Face records can be "f 1 2 3", "f 1/1 2/2 3/3" or "f 1//1 2//2 3//3"
+            f = [int(v.split('/')[0]) for v in l.split()[1:]]
+            for i in range(1, len(f) - 1):
+                faces.append((f[0], f[i], f[i + 1]))
+                n_verts.append(len(verts))
+
+    verts = np.array(verts, dtype=float).reshape(-1, 3)
+    faces = np.array(faces, dtype=int).reshape(-1, 3)
+
+    if np.any(faces == 0):
+        raise ValueError('Invalid OBJ: face indices must not be 0')
+
+    # OBJ indices are 1-based
+    faces = np.where(faces > 0, faces - 1,
+                     faces + np.array(n_verts, dtype=int).reshape(-1, 1))
+
+    return verts, faces
+
+
 def get_species_info(species: Union[str, int]) -> pd.Series:
     """Get all info for given species.
 
@@ -157,7 +229,7 @@ def get_species_info(species: Union[str, int]) -> pd.Series:
     url = make_url(baseurl, '/archive/species/most_current_permitted/',
                    species_id=sid)
 
-    resp = requests.get(url)
+    resp = session.get(url)
 
     resp.raise_for_status()
 
@@ -180,7 +252,7 @@ def get_available_species() -> pd.DataFrame:
     """
     url = make_url(baseurl, 'api', 'species', 'min')
 
-    resp = requests.get(url)
+    resp = session.get(url)
 
     resp.raise_for_status()
 
@@ -36,9 +36,15 @@ except ImportError:
 except BaseException:
     raise
 
+import hashlib
 import io
+import os
+import time
+import uuid
 
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
+from requests.exceptions import ConnectionError as RequestsConnectionError
 
 import numpy as np
 import pandas as pd
@@ -267,13 +273,17 @@ def __fetch_mesh(r, *, vol, lod, client, with_synapses=True, missing_mesh='raise
 
 
 @inject_client
-def fetch_skeletons(x, *, with_synapses=True, heal=False, max_distance = 1000, missing_swc='raise',
-                    parallel=True, max_threads=5, client=None):
+def fetch_skeletons(x, *, with_synapses=True, heal=False, max_distance=1000,
+                    missing_swc='raise', parallel=True, max_threads=5,
+                    cache_dir=None, chunk_size=500, max_retries=3,
+                    client=None):
     """Construct navis.TreeNeuron/List from neuprint neurons.
 
     Notes
     -----
-    Synapses will be attached to the closest node in the skeleton.
+    Synapses will be attached to the closest node in the skeleton. They are
+    fetched in bulk (``chunk_size`` bodies per query) instead of one query
+    per neuron.
 
     Parameters
     ----------
@@ -298,7 +308,22 @@ def fetch_skeletons(x, *, with_synapses=True, heal=False, max_distance = 1000, m
     parallel :      bool
                     If True, will use parallel threads to fetch data.
     max_threads :   int
-                    Max number of parallel threads to use.
+                    Max number of parallel threads to use. All threads share
+                    the client's connection pool which will be resized to
+                    ``max_threads`` connections.
+    cache_dir :     str, optional
+                    If provided, raw skeletons and synapse tables are cached
+                    in this directory. Cache entries are keyed by server,
+                    dataset, dataset version and body ID, i.e. they are
+                    invalidated automatically when the dataset changes. If
+                    the dataset version can not be determined, caching is
+                    disabled.
+    chunk_size :    int
+                    Number of bodies per bulk synapse query.
+    max_retries :   int
+                    How often to retry a request that failed because of a
+                    connection error, a rate limit (HTTP 429) or a server
+                    error (HTTP 5xx). Uses exponential backoff.
     client :        neuprint.Client, optional
                     If ``None`` will try using global client.
 
@@ -331,17 +356,35 @@ def fetch_skeletons(x, *, with_synapses=True, heal=False, max_distance = 1000, m
         meta['somaLocation'] = None
         meta['somaRadius'] = None
 
+    n_threads = 1 if not parallel else max_threads
+    _resize_connection_pool(client, n_threads)
+
+    cache = _get_cache(cache_dir, client) if cache_dir else None
+
+    # Fetch synapses in bulk
+    if with_synapses:
+        synapses = _fetch_synapses_bulk(meta.bodyId.values,
+                                        client=client,
+                                        cache=cache,
+                                        chunk_size=chunk_size,
+                                        max_threads=n_threads,
+                                        max_retries=max_retries)
+    else:
+        synapses = {}
+
     nl = []
-    with ThreadPoolExecutor(max_workers=1 if not parallel else max_threads) as executor:
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
         futures = {}
         for r in meta.itertuples():
             f = executor.submit(__fetch_skeleton,
                                 r,
                                 client=client,
-                                with_synapses=with_synapses,
+                                synapses=synapses.get(r.bodyId, None),
                                 missing_swc=missing_swc,
                                 heal=heal,
-                                max_distance = max_distance)
+                                max_distance=max_distance,
+                                cache=cache,
+                                max_retries=max_retries)
             futures[f] = r.bodyId
 
         with config.tqdm(desc='Fetching',
@@ -352,37 +395,45 @@ def fetch_skeletons(x, *, with_synapses=True, heal=False, max_distance = 1000, m
                 bodyId = futures[f]
                 pbar.update(1)
                 try:
-                    nl.append(f.result())
+                    n = f.result()
+                    if n is not None:
+                        nl.append(n)
                 except Exception as exc:
                     print(f'{bodyId} generated an exception:', exc)
 
     nl = NeuronList(nl)
 
-    """
-    if heal:
-        # max_dist of 1000 corresponds to 8um
-        heal_fragmented_neuron(nl, max_dist=1000, inplace=True)
-    """
     return nl
 
 
-def __fetch_skeleton(r, client, with_synapses=True, missing_swc='raise', heal=False, max_distance = 1000):
-    """Fetch a single skeleton + synapses and construct navis TreeNeuron."""
+def __fetch_skeleton(r, client, synapses=None, missing_swc='raise', heal=False,
+                     max_distance=1000, cache=None, max_retries=3):
+    """Fetch a single skeleton and construct navis TreeNeuron.
+
+    Synapses (if any) must have been fetched already.
+    """
     # Fetch skeleton SWC
-    try:
-        data = client.fetch_skeleton(r.bodyId, format='pandas', heal=False)
-        if heal != False:
-        	data = heal_skeleton(data, max_distance = max_distance)
-    except HTTPError as err:
-        if err.response.status_code == 400:
-            if missing_swc in ['warn', 'skip']:
-                if missing_swc == 'warn':
-                    logger.warning(f'No SWC found for {r.bodyId}')
-            else:
-                raise
-        else:
+    swc = cache.get(r.bodyId, 'swc') if cache else None
+    if swc is None:
+        try:
+            swc = _with_retries(client.fetch_skeleton, r.bodyId,
+                                format='swc', heal=False,
+                                max_retries=max_retries)
+        except HTTPError as err:
+            if err.response.status_code == 400:
+                if missing_swc in ['warn', 'skip']:
+                    if missing_swc == 'warn':
+                        logger.warning(f'No SWC found for {r.bodyId}')
+                    return None
             raise
 
+        if cache:
+            cache.set(r.bodyId, 'swc', swc)
+
+    data = skeleton_swc_to_df(swc)
+    if heal:
+        data = heal_skeleton(data, max_distance=max_distance)
+
     # Convert from raw to nanometers
     # TODO!!!
 
@@ -398,39 +449,183 @@ def __fetch_skeleton(r, client, with_synapses=True, missing_swc='raise', heal=Fa
     n.n_voxels = r.size
     n.status = r.status
 
-    # Make KDE tree for NN
-    if r.somaLocation or with_synapses:
+    # Collect locations to snap to nodes: soma first, then synapses
+    locs = []
+    if r.somaLocation:
+        locs.append(np.asarray(r.somaLocation).reshape(1, 3))
+    if synapses is not None and not synapses.empty:
+        locs.append(synapses[['x', 'y', 'z']].values)
+
+    # Map everything to nodes with a single query
+    if locs:
         tree = neuron2KDTree(n, data='nodes')
+        d, i = tree.query(np.vstack(locs))
+        node_ids = n.nodes.node_id.values[i]
 
     # Set soma
     if r.somaLocation:
-        d, i = tree.query([r.somaLocation])
-        n.soma = int(n.nodes.iloc[i[0]].node_id)
+        n.soma = int(node_ids[0])
         n.soma_radius = r.somaRadius
+        node_ids = node_ids[1:]
     else:
         n.soma = None
 
-    if with_synapses:
-        # Fetch synapses
-        syn = fetch_synapses(r.bodyId,
+    if synapses is not None and not synapses.empty:
+        syn = synapses.copy()
+        syn['connector_id'] = np.arange(syn.shape[0])
+        syn['node_id'] = node_ids
+
+        # Keep only relevant columns
+        syn = syn[['connector_id', 'node_id', 'type',
+                   'x', 'y', 'z', 'roi', 'confidence']]
+
+        n.connectors = syn
+
+    return n
+
+
+def _fetch_synapses_bulk(body_ids, client, cache=None, chunk_size=500,
+                         max_threads=5, max_retries=3):
+    """Fetch synapses for many bodies using chunked queries.
+
+    Returns
+    -------
+    dict
+                    Maps body ID to a DataFrame of its synapses.
+
+    """
+    syn = {}
+    if cache:
+        for b in body_ids:
+            df = cache.get(b, 'synapses')
+            if df is not None:
+                syn[b] = df
+
+    to_fetch = [b for b in body_ids if b not in syn]
+    if not to_fetch:
+        return syn
+
+    chunks = [to_fetch[i: i + chunk_size]
+              for i in range(0, len(to_fetch), chunk_size)]
+
+    def _fetch_chunk(chunk):
+        return _with_retries(fetch_synapses,
+                             NeuronCriteria(bodyId=chunk),
                              synapse_criteria=SynapseCriteria(primary_only=True),
-                             client=client)
+                             client=client,
+                             max_retries=max_retries)
 
-        if not syn.empty:
-            # Process synapses
-            syn['connector_id'] = syn.index.values
-            locs = syn[['x', 'y', 'z']].values
-            d, i = tree.query(locs)
+    with ThreadPoolExecutor(max_workers=max_threads) as executor:
+        futures = {executor.submit(_fetch_chunk, c): c for c in chunks}
+        with config.tqdm(desc='Fetching synapses',
+                         total=len(to_fetch),
+                         leave=config.pbar_leave,
+                         disable=len(chunks) == 1 or config.pbar_hide) as pbar:
+            for f in as_completed(futures):
+                chunk = futures[f]
+                df = f.result()
+                cols = [c for c in df.columns if c != 'bodyId']
+                grouped = dict(tuple(df.groupby('bodyId'))) if not df.empty else {}
+                for b in chunk:
+                    this = grouped.get(b, None)
+                    if this is None:
+                        this = pd.DataFrame(columns=cols)
+                    else:
+                        this = this[cols].reset_index(drop=True)
+                    syn[b] = this
+                    if cache:
+                        cache.set(b, 'synapses', this)
+                pbar.update(len(chunk))
+
+    return syn
+
+
+def _with_retries(func, *args, max_retries=3, backoff=0.5, **kwargs):
+    """Call ``func`` and retry on connection errors, rate limits (429) and
+    server errors (5xx) with exponential backoff."""
+    for i in range(max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except HTTPError as err:
+            status = getattr(err.response, 'status_code', None)
+            if i == max_retries or not (status == 429 or (status or 0) >= 500):
+                raise
+        except RequestsConnectionError:
+            if i == max_retries:
+                raise
+        time.sleep(backoff * 2 ** i)
 
-            syn['node_id'] = n.nodes.iloc[i].node_id.values
-            syn['x'] = locs[:, 0]
-            syn['y'] = locs[:, 1]
-            syn['z'] = locs[:, 2]
 
-            # Keep only relevant columns
-            syn = syn[['connector_id', 'node_id', 'type',
-                       'x', 'y', 'z', 'roi', 'confidence']]
+def _resize_connection_pool(client, n_connections):
+    """Make sure the client's session can keep ``n_connections`` open.
 
-            n.connectors = syn
+    ``requests`` keeps at most 10 connections per host by default. If more
+    threads than that share the session, connections are thrown away and
+    re-established all the time. Here, we re-mount the adapters with a
+    large enough pool while keeping their retry settings.
+    """
+    for prefix in ('https://', 'http://'):
+        adapter = client.session.get_adapter(prefix)
+        if getattr(adapter, '_pool_maxsize', n_connections) >= n_connections:
+            continue
+        client.session.mount(prefix,
+                             HTTPAdapter(max_retries=adapter.max_retries,
+                                         pool_connections=n_connections,
+                                         pool_maxsize=n_connections))
 
-    return n
+
+def _get_cache(cache_dir, client):
+    """Get on-disk cache for the client's dataset.
+
+    Returns ``None`` (i.e. no caching) if the dataset's version is unknown:
+    we would not be able to tell if cached entries are stale.
+    """
+    # Use the last edit of the database as version - fall back to UUID
+    meta = getattr(client, 'meta', None) or {}
+    version = meta.get('lastDatabaseEdit') or meta.get('uuid')
+    if not version:
+        logger.warning('Unable to determine version of dataset '
+                       f'"{client.dataset}" - caching disabled.')
+        return None
+    return _ResponseCache(cache_dir, client, version)
+
+
+class _ResponseCache:
+    """Simple on-disk cache for neuprint responses.
+
+    Entries are content-addressed: file names are hashes of the server,
+    dataset, dataset version, body ID and type of data. If the dataset
+    changes on the server, old entries are simply not found anymore.
+    """
+
+    def __init__(self, cache_dir, client, version):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.prefix = f'{client.server}|{client.dataset}|{version}'
+
+    def _path(self, body_id, kind):
+        key = f'{self.prefix}|{int(body_id)}|{kind}'.encode('utf-8')
+        ext = '.swc' if kind == 'swc' else '.csv'
+        return os.path.join(self.cache_dir,
+                            hashlib.sha1(key).hexdigest() + ext)
+
+    def get(self, body_id, kind):
+        """Load entry from cache. Returns None if not cached."""
+        fp = self._path(body_id, kind)
+        if not os.path.isfile(fp):
+            return None
+        if kind == 'swc':
+            with open(fp, 'r') as f:
+                return f.read()
+        return pd.read_csv(fp, keep_default_na=False, na_values=[''])
+
+    def set(self, body_id, kind, data):
+        """Write entry to cache. Writes are atomic."""
+        fp = self._path(body_id, kind)
+        tmp = f'{fp}.{uuid.uuid4().hex}.tmp'
+        if kind == 'swc':
+            with open(tmp, 'w') as f:
+                f.write(data)
+        else:
+            data.to_csv(tmp, index=False)
+        os.replace(tmp, fp)
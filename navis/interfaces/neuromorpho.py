@@ -16,19 +16,29 @@
 See http://neuromorpho.org/apiReference.html for documentation.
 """
 
+import json
+import os
+
 import requests
 
 import pandas as pd
 
-from typing import List, Dict, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Union, Optional
 
 from ..core import TreeNeuron, NeuronList
 from ..io.swc_io import from_swc
 from .. import utils, config
+from ._http import make_session, write_atomic, max_threads
+
 
+logger = config.logger
 
 baseurl = 'http://neuromorpho.org'
 
+# All requests share this session (and hence its connection pool)
+session = make_session()
+
 
 def find_neurons(page_limit=None, **filters) -> pd.DataFrame:
     """Find neurons matching by given criteria.
@@ -70,31 +80,30 @@ def find_neurons(page_limit=None, **filters) -> pd.DataFrame:
     if isinstance(page_limit, type(None)):
         page_limit = float('inf')
 
-    data: List[str] = []
-    page = 0
-    with config.tqdm(total=1,
-                     disable=config.pbar_hide,
-                     leave=config.pbar_leave,
-                     desc='Fetching') as pbar:
-        while page < page_limit:
-            resp = requests.post(f'{url}?page={page}', json=filters)
-
-            resp.raise_for_status()
+    def _fetch_page(page):
+        resp = session.post(f'{url}?page={page}', json=filters)
+        resp.raise_for_status()
+        return resp.json()
 
-            content = resp.json()
+    # The first page tells us how many pages there are
+    content = _fetch_page(0)
+    n_pages = min(content['page']['totalPages'], page_limit)
+    pages = {0: content['_embedded']['neuronResources']}
 
-            data += content['_embedded']['neuronResources']
-
-            if page == (content['page']['totalPages'] - 1):
-                break
-
-            if page_limit == float('inf'):
-                pbar.total = content['page']['totalPages']
-            else:
-                pbar.total = page_limit
+    with config.tqdm(total=n_pages,
+                     disable=config.pbar_hide or n_pages == 1,
+                     leave=config.pbar_leave,
+                     desc='Fetching') as pbar:
+        pbar.update(1)
+        with ThreadPoolExecutor(max_workers=max_threads) as executor:
+            futures = {executor.submit(_fetch_page, p): p
+                       for p in range(1, int(n_pages))}
+            for f in as_completed(futures):
+                pages[futures[f]] = f.result()['_embedded']['neuronResources']
+                pbar.update(1)
 
-            pbar.update(1)
-            page += 1
+    # Keep pages in order
+    data: List[str] = [r for p in sorted(pages) for r in pages[p]]
 
     return pd.DataFrame.from_records(data)
 
@@ -129,28 +138,40 @@ def get_neuron_info(x: Union[str, int]) -> pd.Series:
     else:
         raise TypeError(f'Expected string or int, got {type(x)}')
 
-    resp = requests.get(url)
+    resp = session.get(url)
 
     resp.raise_for_status()
 
     return pd.Series(resp.json())
 
 
-def get_neuron(x: Union[str, int, Dict[str, str]], **kwargs) -> TreeNeuron:
+def get_neuron(x: Union[str, int, Dict[str, str]],
+               cache_dir: Optional[str] = None,
+               **kwargs) -> TreeNeuron:
     """Fetch neuron by ID or by name.
 
     Parameters
     ----------
-    x :         int | str | dict | pandas.DataFrame
+    x :         int | str | dict | pandas.DataFrame | list-like
                 Integer is intepreted as ID, string as neuron name. Dictionary
                 and DataFrame must contain 'archive' (e.g. "Wearne_Hof") and
-                'neuron_name' (e.g. "cnic_001").
+                'neuron_name' (e.g. "cnic_001"). Multiple neurons (DataFrame
+                or list-like) are downloaded in parallel.
+    cache_dir : str, optional
+                If provided, SWC files and neuron info are cached in this
+                directory. Neurons that are already in the cache won't be
+                downloaded again: if a bulk download is interrupted (e.g.
+                by a network error), simply run it again to resume.
     **kwargs
                 Keyword arguments passed on to :func:`navis.from_swc`.
 
     Returns
     -------
     TreeNeuron
+                If single neuron.
+    NeuronList
+                If multiple neurons. Neurons that failed to download are
+                skipped with a warning.
 
     Examples
     --------
@@ -169,25 +190,106 @@ def get_neuron(x: Union[str, int, Dict[str, str]], **kwargs) -> TreeNeuron:
 
     """
     if isinstance(x, pd.DataFrame):
-        return NeuronList([get_neuron(r) for r in config.tqdm(x.to_dict(orient='records'),
-                                                              desc='Fetching',
-                                                              disable=config.pbar_hide,
-                                                              leave=config.pbar_leave)])
+        x = x.to_dict(orient='records')
 
-    if not isinstance(x, (pd.Series, dict)):
-        info = get_neuron_info(x)
-    else:
-        info = x  # type: ignore
+    if utils.is_iterable(x) and not isinstance(x, (pd.Series, dict)):
+        return _get_neurons_bulk(x, cache_dir=cache_dir, **kwargs)
+
+    info = _get_info(x, cache_dir=cache_dir)
+    swc = _get_swc(info, cache_dir=cache_dir)
+
+    return _parse_swc(swc, info, **kwargs)
+
+
+def _get_neurons_bulk(x: List[Union[str, int, Dict[str, str]]],
+                      cache_dir: Optional[str] = None,
+                      **kwargs) -> NeuronList:
+    """Download multiple neurons in parallel.
+
+    SWCs are parsed in the main thread while the remaining downloads
+    continue in the background.
+    """
+    def _download(y):
+        info = _get_info(y, cache_dir=cache_dir)
+        return info, _get_swc(info, cache_dir=cache_dir)
+
+    nl = []
+    with ThreadPoolExecutor(max_workers=max_threads) as executor:
+        futures = {executor.submit(_download, y): i for i, y in enumerate(x)}
+        with config.tqdm(total=len(futures),
+                         desc='Fetching',
+                         disable=config.pbar_hide,
+                         leave=config.pbar_leave) as pbar:
+            for f in as_completed(futures):
+                pbar.update(1)
+                try:
+                    info, swc = f.result()
+                except requests.exceptions.RequestException as e:
+                    logger.warning(f'Failed to fetch neuron {x[futures[f]]}: {e}')
+                    continue
+                nl.append((futures[f], _parse_swc(swc, info, **kwargs)))
+
+    # Restore original order
+    return NeuronList([n for _, n in sorted(nl, key=lambda n: n[0])])
+
+
+def _get_info(x: Union[str, int, Dict[str, str]],
+              cache_dir: Optional[str] = None) -> Union[pd.Series, dict]:
+    """Get neuron info - either from cache or from server."""
+    if isinstance(x, (pd.Series, dict)):
+        return x
+
+    if cache_dir:
+        fp = os.path.join(cache_dir, 'info', f'{x}.json')
+        if os.path.isfile(fp):
+            with open(fp, 'r') as f:
+                return pd.Series(json.load(f))
+
+    info = get_neuron_info(x)
+
+    if cache_dir:
+        write_atomic(fp, json.dumps(info.to_dict()))
+
+    return info
+
+
+def _get_swc(info: Union[pd.Series, dict],
+             cache_dir: Optional[str] = None) -> str:
+    """Get SWC for given neuron - either from cache or from server.
+
+    Returns
+    -------
+    str
+                Either the SWC itself or (if cached) the filepath.
 
+    """
     archive: str = info['archive']
     name: str = info['neuron_name']
 
+    if cache_dir:
+        fp = os.path.join(cache_dir, archive.lower(), name + '.CNG.swc')
+        if os.path.isfile(fp):
+            return fp
+
     url = utils.make_url(baseurl, 'dableFiles', archive.lower(), 'CNG version', name + '.CNG.swc')
 
-    n = from_swc(url, **kwargs)
+    resp = session.get(url)
+    resp.raise_for_status()
+    swc = resp.content.decode()
+
+    if cache_dir:
+        write_atomic(fp, swc)
+        return fp
+
+    return swc
+
+
+def _parse_swc(swc: str, info: Union[pd.Series, dict], **kwargs) -> TreeNeuron:
+    """Turn SWC into neuron and add meta data."""
+    n = from_swc(swc, **kwargs)
 
-    n.id = x.get('neuron_id', n.id)
-    n.name = x.get('name', getattr(n, 'name'))
+    n.id = info.get('neuron_id', n.id)
+    n.name = info.get('neuron_name', getattr(n, 'name'))
 
     return n
 
@@ -208,7 +310,7 @@ def get_neuron_fields() -> Dict[str, List[str]]:
 
     """
     url = utils.make_url(baseurl, 'api', 'neuron', 'fields')
-    resp = requests.get(url)
+    resp = session.get(url)
 
     resp.raise_for_status()
 
@@ -247,7 +349,7 @@ def get_available_field_values(field: str) -> List[str]:
         while True:
             url = utils.make_url(baseurl, 'api', 'neuron', 'fields', field, page=page)
 
-            resp = requests.get(url)
+            resp = session.get(url)
 
             resp.raise_for_status()
 
@@ -484,9 +484,10 @@ def neuron2r(x: 'core.NeuronObject',
 
 
 def dotprops2py(dp,
-                subset: Optional[Union[List[str], List[int]]] = None
-                ) -> 'core.Dotprops':
-    """Convert dotprops into pandas DataFrame.
+                subset: Optional[Union[List[str], List[int]]] = None,
+                k: Optional[int] = None
+                ) -> List['core.Dotprops']:
+    """Convert R dotprops into navis Dotprops.
 
     Parameters
     ----------
@@ -494,11 +495,14 @@ def dotprops2py(dp,
                 Dotprops object to convert.
     subset :    list of str | list of indices, optional
                 Neuron names or indices.
+    k :         int, optional
+                Number of nearest neighbours the tangent vectors were
+                calculated from. If not provided, will use the ``k``
+                attribute of the R dotprops (if any).
 
     Returns
     -------
-    core.Dotprops
-        Subclass of pandas DataFrame. Contains dotprops.
+    list of core.Dotprops
         Can be passed to `plotting.plot3d(dotprops)`
 
     """
@@ -514,21 +518,35 @@ def dotprops2py(dp,
     if 'neuronlist' in cl(dp):
         df = data2py(dp.slots['df'])
         df.reset_index(inplace=True, drop=True)
+        names = list(dp.names)
     else:
         # If single DataFrame, we don't collect any meta information
         df = pd.DataFrame([])
         dp = [dp]
+        names = [None]
 
-    points = []
+    dotprops = []
     for i in range(len(dp)):
-        this_points = pd.concat([data2py(dp[i][0]), data2py(dp[i][2])], axis=1)
-        this_points['alpha'] = dp[i][1]
-        this_points.columns = ['x', 'y', 'z', 'x_vec', 'y_vec', 'z_vec', 'alpha']
-        points.append(this_points)
+        this_k = k
+        if this_k is None:
+            try:
+                this_k = int(dp[i].slots['k'][0])
+            except (LookupError, TypeError, ValueError):
+                this_k = None
 
-    df['points'] = points
+        this_dp = core.Dotprops(points=np.array(data2py(dp[i][0])),
+                                vect=np.array(data2py(dp[i][2])),
+                                alpha=np.array(dp[i][1]),
+                                k=this_k,
+                                name=names[i])
+        # Keep meta data (e.g. gene names)
+        if not df.empty:
+            for k, v in df.iloc[i].items():
+                if not hasattr(this_dp, k):
+                    setattr(this_dp, k, v)
+        dotprops.append(this_dp)
 
-    return core.Dotprops(df)
+    return dotprops
 
 
 def nblast_allbyall(x: 'core.NeuronList',  # type: ignore  # doesn't like n_cores defau
@@ -1012,6 +1030,7 @@ def xform_brain(x: Union['core.NeuronObject', 'pd.DataFrame', 'np.ndarray'],
     """Transform 3D data between template brains.
 
     This is a simple wrapper for ``nat.templatebrains:xform_brain``.
+    See :func:`navis.xform_brain` for a native implementation.
 
     Parameters
     ----------
@@ -1142,6 +1161,7 @@ def mirror_brain(x: Union['core.NeuronObject', 'pd.DataFrame', 'np.ndarray'],
     """Mirror 3D object along given axixs.
 
     This is a simple wrapper for ``nat.templatebrains:mirror_brain``.
+    See :func:`navis.mirror_brain` for a native implementation.
 
     Parameters
     ----------
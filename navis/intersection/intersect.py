@@ -21,7 +21,7 @@ import numpy as np
 from typing import Union, List, Dict, Sequence, Optional, overload, Any
 from typing_extensions import Literal
 
-from .. import config, graph, core, utils
+from .. import config, graph, core, utils, sampling
 
 from .ray import *
 from .convex import *
@@ -62,7 +62,8 @@ def in_volume(x: 'core.NeuronObject',
               mode: Modes = 'IN',
               backend: Backends = ('ncollpyde', 'pyoctree'),
               n_rays: Optional[int] = None,
-              prevent_fragments: bool = False) -> None: ...
+              prevent_fragments: bool = False,
+              lod: int = 0) -> None: ...
 
 
 @overload
@@ -72,7 +73,8 @@ def in_volume(x: 'core.TreeNeuron',
               mode: Modes = 'IN',
               backend: Backends = ('ncollpyde', 'pyoctree'),
               n_rays: Optional[int] = None,
-              prevent_fragments: bool = False) -> 'core.TreeNeuron': ...
+              prevent_fragments: bool = False,
+              lod: int = 0) -> 'core.TreeNeuron': ...
 
 
 @overload
@@ -82,7 +84,8 @@ def in_volume(x: 'core.NeuronList',
               mode: Modes = 'IN',
               backend: Backends = ('ncollpyde', 'pyoctree'),
               n_rays: Optional[int] = None,
-              prevent_fragments: bool = False) -> 'core.NeuronList': ...
+              prevent_fragments: bool = False,
+              lod: int = 0) -> 'core.NeuronList': ...
 
 
 @overload
@@ -92,7 +95,8 @@ def in_volume(x: Union[Sequence, pd.DataFrame],
               mode: Modes = 'IN',
               backend: Backends = ('ncollpyde', 'pyoctree'),
               n_rays: Optional[int] = None,
-              prevent_fragments: bool = False) -> Sequence[bool]: ...
+              prevent_fragments: bool = False,
+              lod: int = 0) -> Sequence[bool]: ...
 
 
 @overload
@@ -103,9 +107,10 @@ def in_volume(x: Union['core.NeuronObject', Sequence, pd.DataFrame],
               mode: Modes = 'IN',
               backend: Backends = ('ncollpyde', 'pyoctree'),
               n_rays: Optional[int] = None,
-              prevent_fragments: bool = False) -> Dict[str,
-                                                       Union[Sequence[bool],
-                                                             'core.NeuronObject']]: ...
+              prevent_fragments: bool = False,
+              lod: int = 0) -> Dict[str,
+                                    Union[Sequence[bool],
+                                          'core.NeuronObject']]: ...
 
 
 # We do need the full signature b/c we're recursively calling in_volume
@@ -119,11 +124,12 @@ def in_volume(x: Union['core.NeuronObject', Sequence, pd.DataFrame],
               mode: Modes = 'IN',
               backend: Backends = ('ncollpyde', 'pyoctree'),
               n_rays: Optional[int] = None,
-              prevent_fragments: bool = False) -> Optional[Union['core.NeuronObject',
-                                                                 Sequence[bool],
-                                                                 Dict[str, Union[Sequence[bool],
-                                                                                 'core.NeuronObject']]
-                                                                 ]]: ...
+              prevent_fragments: bool = False,
+              lod: int = 0) -> Optional[Union['core.NeuronObject',
+                                              Sequence[bool],
+                                              Dict[str, Union[Sequence[bool],
+                                                              'core.NeuronObject']]
+                                              ]]: ...
 
 
 def in_volume(x: Union['core.NeuronObject', Sequence, pd.DataFrame],
@@ -134,11 +140,12 @@ def in_volume(x: Union['core.NeuronObject', Sequence, pd.DataFrame],
               backend: Backends = ('ncollpyde', 'pyoctree'),
               n_rays: Optional[int] = None,
               prevent_fragments: bool = False,
-              inplace: bool = False,) -> Optional[Union['core.NeuronObject',
-                                                        Sequence[bool],
-                                                        Dict[str, Union[Sequence[bool],
-                                                                        'core.NeuronObject']]
-                                                        ]]:
+              inplace: bool = False,
+              lod: int = 0) -> Optional[Union['core.NeuronObject',
+                                              Sequence[bool],
+                                              Dict[str, Union[Sequence[bool],
+                                                              'core.NeuronObject']]
+                                              ]]:
     """Test if points/neurons are within a given volume.
 
     Notes
@@ -152,7 +159,7 @@ def in_volume(x: Union['core.NeuronObject', Sequence, pd.DataFrame],
 
     Parameters
     ----------
-    x :                 list of tuples | numpy.array | pandas.DataFrame | TreeNeuron | NeuronList
+    x :                 list of tuples | numpy.array | pandas.DataFrame | TreeNeuron | MeshNeuron | NeuronList
 
                         - list/numpy.array is treated as list of x/y/z
                           coordinates. Needs to be shape (N,3): e.g.
@@ -184,14 +191,22 @@ def in_volume(x: Union['core.NeuronObject', Sequence, pd.DataFrame],
                         Only relevant if input is Neuron/List. If False, a copy
                         of the original DataFrames/Neuron is returned. Does
                         apply if multiple volumes are provided.
+    lod :               int, optional
+                        Level of detail of the volume used for the intersection
+                        tests. ``0`` is full resolution. Higher levels use
+                        (cached) decimated meshes which is faster but less
+                        precise close to the volume's surface. Falls back
+                        to full resolution if the decimated mesh is not
+                        watertight. See :func:`navis.decimate_mesh`.
 
 
     Returns
     -------
-    TreeNeuron
-                      If input is TreeNeuron or NeuronList, will
-                      return subset of the neuron(s) (nodes and connectors)
-                      that are within given volume.
+    TreeNeuron | MeshNeuron | NeuronList
+                      If input is a neuron or NeuronList, will return subset
+                      of the neuron(s) (nodes/vertices and connectors) that
+                      are within given volume. For MeshNeurons, only faces
+                      with all three vertices within the volume are kept.
     list of bools
                       If input is a set of coordinates, returns boolean:
                       ``True`` if in volume, ``False`` if not in order.
@@ -254,45 +269,74 @@ def in_volume(x: Union['core.NeuronObject', Sequence, pd.DataFrame],
                                 inplace=False,
                                 n_rays=n_rays,
                                 mode=mode,
-                                backend=backend)
+                                backend=backend,
+                                lod=lod)
         return data
 
     # From here on out volume is a single core.Volume
     vol: 'core.Volume' = volume  # type: ignore
 
+    # Decimate once up-front - recursive calls below use the decimated volume
+    if lod:
+        dec = sampling.decimate_mesh(vol, lod=lod)
+        # Vertex clustering does not preserve topology but ray casting
+        # requires a watertight mesh
+        if dec.is_watertight:
+            vol = dec
+        else:
+            logger.warning(f'Volume "{vol.name}" at lod={lod} is not '
+                           'watertight. Using full resolution instead.')
+
     # Make copy if necessary
-    if isinstance(x, (core.NeuronList, core.TreeNeuron)):
+    if isinstance(x, (core.NeuronList, core.TreeNeuron, core.MeshNeuron)):
         if inplace is False:
             x = x.copy()
 
-    if isinstance(x, core.TreeNeuron):
-        in_v = in_volume(x.nodes[['x', 'y', 'z']],
-                         vol,
-                         mode='IN',
-                         n_rays=n_rays,
-                         backend=backend)
+    if isinstance(x, (core.TreeNeuron, core.MeshNeuron)):
+        x = core.NeuronList(x)
+        is_single = True
+    else:
+        is_single = False
+
+    if isinstance(x, core.NeuronList):
+        if not all(isinstance(n, (core.TreeNeuron, core.MeshNeuron)) for n in x):
+            raise TypeError('NeuronList must only contain TreeNeurons or '
+                            'MeshNeurons')
+
+        # Test the nodes/vertices of all neurons in one go - this means we
+        # have to set up the ray casting only once
+        coords = [n.vertices if isinstance(n, core.MeshNeuron)
+                  else n.nodes[['x', 'y', 'z']].values for n in x]
+        if len(coords):
+            in_v = np.asarray(in_volume(np.vstack(coords),
+                                        vol,
+                                        mode='IN',
+                                        n_rays=n_rays,
+                                        backend=backend), dtype=bool)
+        else:
+            in_v = np.zeros(0, dtype=bool)
 
         # If mode is OUT, invert selection
         if mode == 'OUT':
-            in_v = ~np.array(in_v)
-
-        x2 = graph.subset_neuron(x,
-                                 subset=x.nodes[in_v].node_id.values,
-                                 inplace=inplace,
-                                 prevent_fragments=prevent_fragments)
-
-        if inplace is False:
-            return x2
-        return None
-    elif isinstance(x, core.NeuronList):
-        for n in config.tqdm(x, desc='Subsetting',
-                             leave=config.pbar_leave,
-                             disable=config.pbar_hide):
-            in_volume(n, vol, inplace=True, mode=mode, backend=backend,
-                      n_rays=n_rays, prevent_fragments=prevent_fragments)
+            in_v = ~in_v
+
+        in_v = np.split(in_v, np.cumsum([len(c) for c in coords])[:-1])
+
+        for n, this_in in config.tqdm(zip(x, in_v),
+                                      total=len(x),
+                                      desc='Subsetting',
+                                      leave=config.pbar_leave,
+                                      disable=config.pbar_hide or is_single):
+            if isinstance(n, core.MeshNeuron):
+                graph.subset_neuron(n, subset=this_in, inplace=True)
+            else:
+                graph.subset_neuron(n,
+                                    subset=this_in,
+                                    inplace=True,
+                                    prevent_fragments=prevent_fragments)
 
         if inplace is False:
-            return x
+            return x[0] if is_single else x
         return None
     elif isinstance(x, pd.DataFrame):
         points = x[['x', 'y', 'z']].values
@@ -327,12 +371,13 @@ def intersection_matrix(x: 'core.NeuronObject',
 
     Parameters
     ----------
-    x :               NeuronList | TreeNeuron
+    x :               NeuronList | TreeNeuron | MeshNeuron
                       Neurons to intersect.
     volume :          list or dict of navis.Volume
     attr :            str | None, optional
                       Attribute to return for intersected neurons (e.g.
-                      'cable_length'). If None, will return TreeNeuron.
+                      'cable_length' for TreeNeurons or 'area' for
+                      MeshNeurons). If None, will return the neuron.
     **kwargs
                       Keyword arguments passed to :func:`navis.in_volume`.
 
@@ -344,7 +389,7 @@ def intersection_matrix(x: 'core.NeuronObject',
     # Volumes should be a dict at some point
     volumes_dict: Dict[str, core.Volume]
 
-    if isinstance(x, core.TreeNeuron):
+    if isinstance(x, (core.TreeNeuron, core.MeshNeuron)):
         x = core.NeuronList(x)
 
     if not isinstance(x, core.NeuronList):
@@ -368,10 +413,10 @@ def intersection_matrix(x: 'core.NeuronObject',
     if not attr:
         df = pd.DataFrame([[n for n in data[v]] for v in data],
                           index=list(data.keys()),
-                          columns=x.skeleton_id)
+                          columns=x.id)
     else:
         df = pd.DataFrame([[getattr(n, attr) for n in data[v]] for v in data],
                           index=list(data.keys()),
-                          columns=x.skeleton_id)
+                          columns=x.id)
 
     return df
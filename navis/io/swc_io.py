@@ -15,7 +15,6 @@ import csv
 import datetime
 import os
 import io
-import requests
 
 import pandas as pd
 import numpy as np
@@ -147,7 +146,8 @@ def from_swc(f: Union[str, pd.DataFrame, Iterable],
                 attributes['origin'] = f
             # Check if is url
             elif utils.is_url(f):
-                # Fetch data
+                # Fetch data - requests is slow to import, so we do it here
+                import requests
                 r = requests.get(f)
                 r.raise_for_status()
                 # Decode and turn into a streamable object
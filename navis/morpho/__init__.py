@@ -19,3 +19,4 @@ from .manipulation import (prune_by_strahler, stitch_neurons,
                            heal_fragmented_neuron, break_fragments,
                            prune_twigs)
 from .analyze import find_soma
+from .skeletonize import mesh2skeleton
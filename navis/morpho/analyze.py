@@ -23,7 +23,7 @@ logger = config.logger
 
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
-    pint.Quantity([])
+    config.ureg.Quantity([])
 
 
 def find_soma(x: 'core.TreeNeuron') -> Sequence[int]:
@@ -63,11 +63,13 @@ def find_soma(x: 'core.TreeNeuron') -> Sequence[int]:
         if isinstance(soma_radius, pint.Quantity):
             if isinstance(x.units, (pint.Quantity, pint.Unit)) and \
                not x.units.dimensionless:
-                # Do NOT remove the .values here -> otherwise conversion to units won't work
-                is_large = soma_nodes.radius.values * x.units >= soma_radius
+                # Convert the threshold into the neuron's units instead of
+                # turning all radii into a (slow) pint array
+                thresh = (soma_radius / x.units).to('dimensionless').magnitude
             else:
                 # If neurons has no units, assume they are the same as the soma radius
-                is_large = soma_nodes.radius.values * soma_radius.units >= soma_radius
+                thresh = soma_radius.magnitude
+            is_large = soma_nodes.radius.values >= thresh
         else:
             is_large = soma_nodes.radius >= soma_radius
 
@@ -16,6 +16,11 @@
 """
 
 import itertools
+import os
+
+import multiprocessing as mp
+
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import numpy as np
@@ -163,38 +168,26 @@ def prune_by_strahler(x: NeuronObject,
         SI_range = range(1, int(neuron.nodes.strahler_index.max() + 1))
         to_prune = list(SI_range)[to_prune]
 
-    # Prepare parent dict if needed later
-    if relocate_connectors:
-        parent_dict = {
-            tn.node_id: tn.parent_id for tn in neuron.nodes.itertuples()}
-
-    neuron.nodes = neuron.nodes[~neuron.nodes.strahler_index.isin(to_prune)].reset_index(drop=True, inplace=False)
-
-    if neuron.has_connectors:
-        if not relocate_connectors:
-            neuron.connectors = neuron.connectors[neuron.connectors.node_id.isin(neuron.nodes.node_id.values)].reset_index(drop=True, inplace=False)
-        else:
-            remaining_tns = set(neuron.nodes.node_id.values)
-            for cn in neuron.connectors[~neuron.connectors.node_id.isin(neuron.nodes.node_id.values)].itertuples():
-                this_tn = parent_dict[cn.node_id]
-                while True:
-                    if this_tn in remaining_tns:
-                        break
-                    this_tn = parent_dict[this_tn]
-                neuron.connectors.loc[cn.Index, 'node_id'] = this_tn
-
-    # Reset indices of node and connector tables (important for igraph!)
-    neuron.nodes.reset_index(inplace=True, drop=True)
-
-    if neuron.has_connectors:
-        neuron.connectors.reset_index(inplace=True, drop=True)
+    keep = ~neuron.nodes.strahler_index.isin(to_prune).values
+
+    if relocate_connectors and neuron.has_connectors:
+        # Walk connectors on removed nodes up to the next remaining node
+        node_ids = neuron.nodes.node_id.values
+        parent_ix = graph.graph_utils._parent_index(node_ids,
+                                                    neuron.nodes.parent_id.values)
+        cn_ix = pd.Index(node_ids).get_indexer(neuron.connectors.node_id.values)
+        walk = (cn_ix >= 0) & ~keep[cn_ix]
+        while walk.any():
+            cn_ix[walk] = parent_ix[cn_ix[walk]]
+            walk = (cn_ix >= 0) & ~keep[cn_ix]
+        neuron.connectors['node_id'] = np.where(cn_ix >= 0,
+                                                node_ids[cn_ix],
+                                                neuron.connectors.node_id.values)
 
     # Theoretically we can end up with disconnected pieces, i.e. with more
-    # than 1 root node -> we have to fix the nodes that lost their parents
-    neuron.nodes.loc[~neuron.nodes.parent_id.isin(neuron.nodes.node_id.values), 'parent_id'] = -1
-
-    # Remove temporary attributes
-    neuron._clear_temp_attr()
+    # than 1 root node -> subsetting takes care of nodes that lost their
+    # parents and removes temporary attributes
+    graph.subset_neuron(neuron, keep, inplace=True)
 
     if not inplace:
         return neuron
@@ -206,7 +199,9 @@ def prune_by_strahler(x: NeuronObject,
 def prune_twigs(x: NeuronObject,
                 size: float,
                 inplace: Literal[True],
-                recursive: Union[int, bool, float] = False
+                recursive: Union[int, bool, float] = False,
+                parallel: bool = False,
+                n_cores: int = os.cpu_count() - 2
                 ) -> None: ...
 
 
@@ -214,7 +209,9 @@ def prune_twigs(x: NeuronObject,
 def prune_twigs(x: NeuronObject,
                 size: float,
                 inplace: Literal[False],
-                recursive: Union[int, bool, float] = False
+                recursive: Union[int, bool, float] = False,
+                parallel: bool = False,
+                n_cores: int = os.cpu_count() - 2
                 ) -> NeuronObject: ...
 
 
@@ -222,14 +219,18 @@ def prune_twigs(x: NeuronObject,
 def prune_twigs(x: NeuronObject,
                 size: float,
                 inplace: bool = False,
-                recursive: Union[int, bool, float] = False
+                recursive: Union[int, bool, float] = False,
+                parallel: bool = False,
+                n_cores: int = os.cpu_count() - 2
                 ) -> Optional[NeuronObject]: ...
 
 
 def prune_twigs(x: NeuronObject,
                 size: float,
                 inplace: bool = False,
-                recursive: Union[int, bool, float] = False
+                recursive: Union[int, bool, float] = False,
+                parallel: bool = False,
+                n_cores: int = os.cpu_count() - 2
                 ) -> Optional[NeuronObject]:
     """Prune terminal twigs under a given size.
 
@@ -245,6 +246,11 @@ def prune_twigs(x: NeuronObject,
                     If `int` will undergo that many rounds of recursive
                     pruning. If True will prune iteratively until no more
                     terminal twigs under the given size are left.
+    parallel :      bool, optional
+                    If True and ``x`` is a NeuronList, will prune neurons
+                    in parallel using multiple processes.
+    n_cores :       int, optional
+                    Number of cores to use if ``parallel=True``.
 
     Returns
     -------
@@ -264,67 +270,115 @@ def prune_twigs(x: NeuronObject,
     True
 
     """
-    if isinstance(x, core.NeuronList):
-        if not inplace:
-            x = x.copy()
-
-        [prune_twigs(n,
-                     size=size,
-                     inplace=True,
-                     recursive=recursive) for n in config.tqdm(x,
-                                                               desc='Pruning',
-                                                               disable=config.pbar_hide,
-                                                               leave=config.pbar_leave)]
-
-        if not inplace:
-            return x
-        else:
-            return None
-    elif isinstance(x, core.TreeNeuron):
-        neuron = x
-    else:
+    if not isinstance(x, (core.TreeNeuron, core.NeuronList)):
         raise TypeError(f'Expected Neuron/List, got {type(x)}')
 
     # If people set recursive=True, assume that they mean float("inf")
-    if isinstance(recursive, bool) and recursive:
-        recursive = float('inf')
+    if isinstance(recursive, bool):
+        recursive = float('inf') if recursive else 0
 
     # Make a copy if necessary before making any changes
     if not inplace:
-        neuron = neuron.copy()
+        x = x.copy()
+
+    neurons = x if isinstance(x, core.NeuronList) else [x]
+
+    # Only parents and edge lengths are passed to the workers
+    jobs = []
+    for n in neurons:
+        parent_ix = graph.graph_utils._parent_index(n.nodes.node_id.values,
+                                                    n.nodes.parent_id.values)
+        locs = n.nodes[['x', 'y', 'z']].values.astype(float)
+        not_root = parent_ix >= 0
+        lengths = np.zeros(len(parent_ix))
+        lengths[not_root] = np.linalg.norm(locs[not_root] - locs[parent_ix[not_root]],
+                                           axis=1)
+        jobs.append((parent_ix, lengths, size, recursive))
+
+    if parallel and len(jobs) > 1 and n_cores > 1:
+        with mp.Pool(min(n_cores, len(jobs))) as pool:
+            res = list(config.tqdm(pool.imap(_prune_twigs_worker,
+                                             jobs,
+                                             chunksize=max(1, len(jobs) // (n_cores * 4))),
+                                   total=len(jobs),
+                                   desc='Pruning',
+                                   disable=config.pbar_hide,
+                                   leave=config.pbar_leave))
+    else:
+        res = [_prune_twigs_worker(j) for j in config.tqdm(jobs,
+                                                           desc='Pruning',
+                                                           disable=config.pbar_hide or len(jobs) == 1,
+                                                           leave=config.pbar_leave)]
 
-    # Find terminal nodes
-    leafs = neuron.nodes[neuron.nodes.type == 'end'].node_id.values
+    for n, keep in zip(neurons, res):
+        if not keep.all():
+            graph.subset_neuron(n, keep, inplace=True)
 
-    # Find terminal segments
-    segs = graph._break_segments(neuron)
-    segs = np.array([s for s in segs if s[0] in leafs])
+    if not inplace:
+        return x
+    return None
 
-    # Get segment lengths
-    seg_lengths = np.array([graph.segment_length(neuron, s) for s in segs])
 
-    # Find out which to delete
-    segs_to_delete = segs[seg_lengths <= size]
+def _prune_twigs_worker(job: tuple) -> np.ndarray:
+    """Find nodes to keep after pruning terminal twigs.
 
-    if segs_to_delete.any():
-        # Unravel the into list of node IDs -> skip the last parent
-        nodes_to_delete = [n for s in segs_to_delete for n in s[:-1]]
+    A twig runs from a leaf up to (but not including) the next branch point
+    or root. Child counts are updated after each round, so that only the
+    newly created leafs have to be walked in the next round.
 
-        # Subset neuron
-        nodes_to_keep = neuron.nodes[~neuron.nodes.node_id.isin(nodes_to_delete)].node_id.values
-        graph.subset_neuron(neuron,
-                            nodes_to_keep,
-                            inplace=True)
+    Parameters
+    ----------
+    job :       (parent_ix, edge_lengths, size, recursive)
+                ``parent_ix`` is the index of each node's parent (-1 for
+                roots), ``edge_lengths`` the length of the edge to it.
 
-        # Go recursive
-        if recursive:
-            recursive -= 1
-            prune_twigs(neuron, size=size, inplace=True, recursive=recursive)
+    Returns
+    -------
+    keep :      (N, ) boolean array
 
-    if not inplace:
-        return neuron
-    else:
-        return None
+    """
+    parent_ix, lengths, size, recursive = job
+
+    is_root = parent_ix < 0
+    n_childs = np.bincount(parent_ix[~is_root], minlength=len(parent_ix))
+    keep = np.ones(len(parent_ix), dtype=bool)
+
+    leafs = np.where((n_childs == 0) & ~is_root)[0]
+    i = 0
+    while len(leafs) and i <= recursive:
+        # Walk all twigs in lockstep from their leafs towards the root
+        twig_len = np.zeros(len(leafs))
+        twig_end = np.full(len(leafs), -1)
+        nodes, twigs = [], []
+        this, twig = leafs, np.arange(len(leafs))
+        while len(this):
+            nodes.append(this)
+            twigs.append(twig)
+            twig_len[twig] += lengths[this]
+            parent = parent_ix[this]
+            stop = is_root[parent] | (n_childs[parent] > 1)
+            twig_end[twig[stop]] = parent[stop]
+            # Stop walking twigs that are already too long
+            walk = ~stop & (twig_len[twig] <= size)
+            this, twig = parent[walk], twig[walk]
+
+        # Twigs that were not walked to the end are too long
+        prune = (twig_end >= 0) & (twig_len <= size)
+        if not prune.any():
+            break
+
+        nodes, twigs = np.concatenate(nodes), np.concatenate(twigs)
+        keep[nodes[prune[twigs]]] = False
+
+        # Branch points that lost all their childs become new leafs
+        ends = twig_end[prune]
+        np.subtract.at(n_childs, ends, 1)
+        ends = np.unique(ends)
+        leafs = ends[(n_childs[ends] == 0) & ~is_root[ends]]
+
+        i += 1
+
+    return keep
 
 
 def split_axon_dendrite(x: NeuronObject,
@@ -697,12 +751,13 @@ def stitch_neurons(*x: Union[Sequence[NeuronObject], 'core.NeuronList'],
 
     # Generate a list of potential new edges
     # Collect relevant nodes
+    nodes = nl.nodes
     if not isinstance(tn_to_stitch, type(None)):
-        tn = nl.nodes.loc[nl.nodes.node_id.isin(tn_to_stitch)]
+        tn = nodes.loc[nodes.node_id.isin(tn_to_stitch)]
     elif method == 'LEAFS':
-        tn = nl.nodes.loc[nl.nodes['type'].isin(['end', 'root'])]
+        tn = nodes.loc[nodes['type'].isin(['end', 'root'])]
     else:
-        tn = nl.nodes
+        tn = nodes
 
     # Get pairwise distance between nodes
     # cdist
@@ -871,13 +926,20 @@ def _mst_nx(nl: 'core.NeuronList',
 
 def average_neurons(x: 'core.NeuronList',
                     limit: int = 10,
-                    base_neuron: Optional[Union[int, 'core.TreeNeuron']] = None
+                    base_neuron: Optional[Union[int, 'core.TreeNeuron']] = None,
+                    max_iter: int = 1,
+                    tol: float = 1e-3,
+                    n_cores: int = os.cpu_count() - 2
                     ) -> 'core.TreeNeuron':
     """Compute an average from a list of neurons.
 
     This is a very simple implementation which may give odd results if used
     on complex neurons. Works fine on e.g. backbones or tracts.
 
+    For each node in the base neuron, we find the nearest node (within
+    ``limit``) in each of the neurons and move the node to the mean position.
+    Nodes without any nearest neighbour within ``limit`` stay where they are.
+
     Parameters
     ----------
     x :             NeuronList
@@ -887,6 +949,13 @@ def average_neurons(x: 'core.NeuronList',
     base_neuron :   neuron id | TreeNeuron, optional
                     Neuron to use as template for averaging. If not provided,
                     the first neuron in the list is used as template!
+    max_iter :      int, optional
+                    Max number of iterations. In each iteration, the current
+                    average is used to query the neurons again.
+    tol :           float, optional
+                    Stop iterating if no node moved by more than this.
+    n_cores :       int, optional
+                    Number of threads to use for nearest neighbour queries.
 
     Returns
     -------
@@ -912,14 +981,14 @@ def average_neurons(x: 'core.NeuronList',
     if len(x) < 2:
         raise ValueError('Need at least 2 neurons to average!')
 
-    # Generate KDTrees for each neuron
-    for n in x:
-        n.tree = graph.neuron2KDTree(n, tree_type='c', data='nodes')  # type: ignore  # TreeNeuron has no tree
-
     # Set base for average: we will use this neurons nodes to query
-    # the KDTrees
+    # the other neurons
+    members = list(x)
     if isinstance(base_neuron, core.TreeNeuron):
         bn = base_neuron.copy()
+        # The base neuron always contributes to the average
+        if not any(n is base_neuron for n in members):
+            members.append(base_neuron)
     elif isinstance(base_neuron, int):
         bn = x[base_neuron].copy()
     elif isinstance(base_neuron, type(None)):
@@ -927,50 +996,45 @@ def average_neurons(x: 'core.NeuronList',
     else:
         raise ValueError(f'Unable to interpret base_neuron of type "{type(base_neuron)}"')
 
-    base_nodes = bn.nodes[['x', 'y', 'z']].values
-    other_neurons = x[1:]
-
-    # Make sure these stay 2-dimensional arrays -> will add a colum for each
-    # "other" neuron
-    base_x = base_nodes[:, 0:1]
-    base_y = base_nodes[:, 1:2]
-    base_z = base_nodes[:, 2:3]
-
-    # For each "other" neuron, collect nearest neighbour coordinates
-    for n in other_neurons:
-        nn_dist, nn_ix = n.tree.query(base_nodes,
-                                      k=1,
-                                      distance_upper_bound=limit)
-
-        # Translate indices into coordinates
-        # First, make empty array
-        this_coords = np.zeros((len(nn_dist), 3))
-        # Set coords without a nearest neighbour within distances to "None"
-        this_coords[nn_dist == float('inf')] = None
-        # Fill in coords of nearest neighbours
-        this_coords[nn_dist != float(
-            'inf')] = n.tree.data[nn_ix[nn_dist != float('inf')]]
-        # Add coords to base coords
-        base_x = np.append(base_x, this_coords[:, 0:1], axis=1)
-        base_y = np.append(base_y, this_coords[:, 1:2], axis=1)
-        base_z = np.append(base_z, this_coords[:, 2:3], axis=1)
-
-    # Calculate means
-    mean_x = np.mean(base_x, axis=1)
-    mean_y = np.mean(base_y, axis=1)
-    mean_z = np.mean(base_z, axis=1)
-
-    # If any of the base coords has NO nearest neighbour within limit
-    # whatsoever, the average of that row will be "NaN" -> in this case we
-    # will fall back to the base coordinate
-    mean_x[np.isnan(mean_x)] = base_nodes[np.isnan(mean_x), 0]
-    mean_y[np.isnan(mean_y)] = base_nodes[np.isnan(mean_y), 1]
-    mean_z[np.isnan(mean_z)] = base_nodes[np.isnan(mean_z), 2]
-
-    # Change coordinates accordingly
-    bn.nodes.loc[:, 'x'] = mean_x
-    bn.nodes.loc[:, 'y'] = mean_y
-    bn.nodes.loc[:, 'z'] = mean_z
+    coords = bn.nodes[['x', 'y', 'z']].values.astype(float)
+
+    # Build KD-trees once - these are not attached to the neurons
+    trees = [scipy.spatial.cKDTree(n.nodes[['x', 'y', 'z']].values)
+             for n in members]
+
+    def _query(tree, pts):
+        nn_dist, nn_ix = tree.query(pts, k=1, distance_upper_bound=limit)
+        has_nn = nn_dist != np.inf
+        return has_nn, nn_ix[has_nn]
+
+    with ThreadPoolExecutor(max_workers=max(1, n_cores)) as executor:
+        for i in range(max_iter):
+            # Stream a running sum and count instead of collecting all
+            # nearest neighbours
+            total = np.zeros_like(coords)
+            count = np.zeros(len(coords), dtype=int)
+            for tree, (has_nn, nn_ix) in zip(trees,
+                                             executor.map(lambda t: _query(t, coords),
+                                                          trees)):
+                total[has_nn] += tree.data[nn_ix]
+                count[has_nn] += 1
+
+            # If a base coordinate has NO nearest neighbour within limit
+            # whatsoever, we will fall back to the base coordinate
+            new_coords = coords.copy()
+            new_coords[count > 0] = total[count > 0] / count[count > 0].reshape(-1, 1)
+
+            moved = np.linalg.norm(new_coords - coords, axis=1).max() if len(coords) else 0
+            coords = new_coords
+
+            if moved <= tol:
+                break
+
+    # Change coordinates accordingly: keep float precision but upcast
+    # integer coordinates
+    dtype = np.result_type(bn.nodes.x.dtype, np.float32)
+    bn.nodes[['x', 'y', 'z']] = coords.astype(dtype, copy=False)
+    bn._clear_temp_attr(exclude=['classify_nodes'])
 
     return bn
 
@@ -979,7 +1043,10 @@ def despike_neuron(x: NeuronObject,
                    sigma: int = 5,
                    max_spike_length: int = 1,
                    inplace: bool = False,
-                   reverse: bool = False) -> Optional[NeuronObject]:
+                   reverse: bool = False,
+                   parallel: bool = False,
+                   n_cores: int = os.cpu_count() - 2
+                   ) -> Optional[NeuronObject]:
     """Remove spikes in skeleton (e.g. from jumps in image data).
 
     For each node A, the euclidean distance to its next successor (parent)
@@ -1002,6 +1069,11 @@ def despike_neuron(x: NeuronObject,
                         If True, will **also** walk the segments from proximal
                         to distal. Use this to catch spikes on e.g. terminal
                         nodes.
+    parallel :          bool, optional
+                        If True and ``x`` is a NeuronList, will process
+                        neurons in parallel using multiple processes.
+    n_cores :           int, optional
+                        Number of cores to use if ``parallel=True``.
 
     Returns
     -------
@@ -1015,76 +1087,93 @@ def despike_neuron(x: NeuronObject,
     >>> despiked = navis.despike_neuron(n)
 
     """
-    # TODO:
-    # - flattening all segments first before Spike detection should speed up
-    #   quite a lot
-    # -> as intermediate step: assign all new positions at once
+    if not isinstance(x, (core.TreeNeuron, core.NeuronList)):
+        raise TypeError(f'Can only process TreeNeuron or NeuronList, not {type(x)}')
 
-    if isinstance(x, core.NeuronList):
-        if not inplace:
-            x = x.copy()
+    return _update_coords(x, _despike_coords,
+                          dict(sigma=sigma,
+                               max_spike_length=max_spike_length,
+                               reverse=reverse),
+                          inplace=inplace, parallel=parallel, n_cores=n_cores,
+                          desc='Despiking')
 
-        for n in config.tqdm(x, desc='Despiking', disable=config.pbar_hide,
-                             leave=config.pbar_leave):
-            despike_neuron(n, sigma=sigma, inplace=True)
 
-        if not inplace:
-            return x
-        return None
-    elif not isinstance(x, core.TreeNeuron):
-        raise TypeError(f'Can only process TreeNeuron or NeuronList, not {type(x)}')
+def _despike_coords(co: np.ndarray,
+                    ix: np.ndarray,
+                    seg_end: np.ndarray,
+                    sigma: float = 5,
+                    max_spike_length: int = 1,
+                    reverse: bool = False) -> np.ndarray:
+    """Despike on flat segments. See :func:`navis.despike_neuron`.
 
-    if not inplace:
-        x = x.copy()
+    Parameters
+    ----------
+    co :        (N, 3) array
+                Node coordinates.
+    ix, seg_end
+                Flattened segments. See :func:`_flat_segments`.
 
-    # Index nodes table by node ID
-    this_nodes = x.nodes.set_index('node_id', inplace=False)
+    Returns
+    -------
+    (N, 3) array
+                New node coordinates.
 
-    segs_to_walk = x.segments
+    """
+    co = co.astype(float, copy=True)
 
+    passes = [(ix, seg_end)]
     if reverse:
-        segs_to_walk += x.segments[::-1]
+        # Walk segments from proximal to distal: reverse the flat array
+        # and the segments' order
+        passes.append((ix[::-1], len(ix) - 1 - _seg_start(seg_end)[::-1]))
 
-    # For each spike length do -> do this in reverse to correct the long
+    # Go over all spike lengths -> do this in reverse to correct the long
     # spikes first
-    for l in list(range(1, max_spike_length + 1))[::-1]:
-        # Go over all segments
-        for seg in x.segments:
-            # Get nodes A, B and C of this segment
-            this_A = this_nodes.loc[seg[:-l - 1]]
-            this_B = this_nodes.loc[seg[l:-1]]
-            this_C = this_nodes.loc[seg[l + 1:]]
-
-            # Get coordinates
-            A = this_A[['x', 'y', 'z']].values
-            B = this_B[['x', 'y', 'z']].values
-            C = this_C[['x', 'y', 'z']].values
-
-            # Calculate euclidian distances A->B and A->C
-            dist_AB = np.linalg.norm(A - B, axis=1)
-            dist_AC = np.linalg.norm(A - C, axis=1)
-
-            # Get the spikes
-            spikes_ix = np.where((dist_AB / dist_AC) > sigma)[0]
-            spikes = this_B.iloc[spikes_ix]
-
-            if not spikes.empty:
+    for l in range(max_spike_length, 0, -1):
+        for this_ix, this_end in passes:
+            # A is at position p, B at p + l and C at p + l + 1. All three
+            # have to be on the same segment
+            p = np.arange(len(this_ix) - l - 1)
+            p = p[p + l + 1 <= this_end[p]]
+
+            a_ix, b_ix, c_ix = this_ix[p], this_ix[p + l], this_ix[p + l + 1]
+            seg = this_end[p]
+            A = A0 = co[a_ix]
+            B = co[b_ix]
+            C = C0 = co[c_ix]
+
+            # Segments are despiked one after the other: A and C can be
+            # branch points or roots that were already moved (as B) while
+            # despiking a previous segment. Moves only propagate to later
+            # segments, so we just have to repeat until nothing changes
+            while True:
+                # Calculate euclidian distances A->B and A->C
+                dist_AB = np.linalg.norm(A - B, axis=1)
+                dist_AC = np.linalg.norm(A - C, axis=1)
+
+                # Get the spikes
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    is_spike = (dist_AB / dist_AC) > sigma
+
                 # Interpolate new position(s) between A and C
-                new_positions = A[spikes_ix] + (C[spikes_ix] - A[spikes_ix]) / 2
+                new_co = co.copy()
+                new_co[b_ix[is_spike]] = (A[is_spike] + C[is_spike]) / 2
 
-                this_nodes.loc[spikes.index, ['x', 'y', 'z']] = new_positions
+                # Each node is B on at most one segment
+                moved_by = np.full(len(co), len(this_ix))
+                moved_by[b_ix[is_spike]] = seg[is_spike]
 
-    # Reassign node table
-    x.nodes = this_nodes.reset_index(drop=False, inplace=False)
+                new_A = np.where((moved_by[a_ix] < seg).reshape(-1, 1),
+                                 new_co[a_ix], A0)
+                new_C = np.where((moved_by[c_ix] < seg).reshape(-1, 1),
+                                 new_co[c_ix], C0)
+                if np.array_equal(new_A, A) and np.array_equal(new_C, C):
+                    break
+                A, C = new_A, new_C
 
-    # The weights in the graph have changed, we need to update that
-    x._clear_temp_attr(exclude=['segments', 'small_segments',
-                                'classify_nodes'])
+            co = new_co
 
-    if not inplace:
-        return x
-    else:
-        return None
+    return co
 
 
 def guess_radius(x: NeuronObject,
@@ -1211,7 +1300,10 @@ def guess_radius(x: NeuronObject,
 
 def smooth_neuron(x: NeuronObject,
                   window: int = 5,
-                  inplace: bool = False) -> Optional[NeuronObject]:
+                  inplace: bool = False,
+                  parallel: bool = False,
+                  n_cores: int = os.cpu_count() - 2
+                  ) -> Optional[NeuronObject]:
     """Smooth neuron using rolling windows.
 
     Parameters
@@ -1223,6 +1315,11 @@ def smooth_neuron(x: NeuronObject,
                     nodes.
     inplace :       bool, optional
                     If False, will use and return copy of original neuron(s).
+    parallel :      bool, optional
+                    If True and ``x`` is a NeuronList, will process neurons
+                    in parallel using multiple processes.
+    n_cores :       int, optional
+                    Number of cores to use if ``parallel=True``.
 
     Returns
     -------
@@ -1236,50 +1333,166 @@ def smooth_neuron(x: NeuronObject,
     >>> smoothed = navis.smooth_neuron(n, window=10)
 
     """
-    if isinstance(x, core.NeuronList):
-        if not inplace:
-            x = x.copy()
+    if not isinstance(x, (core.TreeNeuron, core.NeuronList)):
+        raise TypeError(f'Can only process TreeNeuron or NeuronList, not {type(x)}')
 
-        for n in config.tqdm(x, desc='Smoothing', disable=config.pbar_hide,
-                             leave=config.pbar_leave):
-            smooth_neuron(n, window=window, inplace=True)
+    return _update_coords(x, _smooth_coords, dict(window=window),
+                          inplace=inplace, parallel=parallel, n_cores=n_cores,
+                          desc='Smoothing')
 
-        if not inplace:
-            return x
-        else:
-            return None
 
-    elif not isinstance(x, core.TreeNeuron):
-        raise TypeError(f'Can only process TreeNeuron or NeuronList, not {type(x)}')
+def _smooth_coords(co: np.ndarray,
+                   ix: np.ndarray,
+                   seg_end: np.ndarray,
+                   window: int = 5) -> np.ndarray:
+    """Smooth on flat segments. See :func:`navis.smooth_neuron`.
 
-    if not inplace:
-        x = x.copy()
+    Segments are smoothed one after the other: each node is set to the mean
+    of itself and the up to ``window - 1`` preceding (i.e. more distal)
+    nodes on its segment. Most nodes are part of a single segment but
+    branch points and roots are shared between segments, and later segments
+    see their already smoothed positions. We therefore loop over the
+    segments only to track the positions of these shared nodes and then
+    calculate all other nodes in one go.
 
-    # Prepare nodes (add parent_dist for later, set index)
-    mmetrics.parent_dist(x, root_dist=0)
-    nodes = x.nodes.set_index('node_id', inplace=False).copy()
+    Parameters
+    ----------
+    co :        (N, 3) array
+                Node coordinates.
+    ix, seg_end
+                Flattened segments. See :func:`_flat_segments`.
 
-    # Go over each segment and smooth
-    for s in config.tqdm(x.segments, desc='Smoothing',
-                         disable=config.pbar_hide,
-                         leave=config.pbar_leave):
+    Returns
+    -------
+    (N, 3) array
+                New node coordinates.
 
-        # Get this segment's parent distances and get cumsum
-        this_co = nodes.loc[s, ['x', 'y', 'z']]
+    """
+    pos = np.arange(len(ix))
+    seg_start = _seg_start(seg_end)
+    win_start = np.maximum(seg_start, pos - window + 1)
+    win_len = (pos + 1 - win_start).reshape(-1, 1)
+
+    # Rolling sums of the original positions via cumulative sums: windows
+    # must not cross segment starts
+    flat_co = co[ix].astype(float)
+    cs = np.zeros((len(ix) + 1, 3))
+    cs[1:] = np.cumsum(flat_co, axis=0)
+    win_sum = cs[pos + 1] - cs[win_start]
+
+    new_co = co.astype(float, copy=True)
+
+    # For shared nodes, track by how much they had already been moved when
+    # their segment was smoothed
+    is_shared = np.bincount(ix, minlength=len(co))[ix] > 1
+    delta = np.zeros((len(ix), 3))
+    for sp in np.split(pos[is_shared], np.where(np.diff(seg_end[is_shared]))[0] + 1):
+        if not len(sp):
+            continue
+        delta[sp] = new_co[ix[sp]] - flat_co[sp]
+        in_win = (sp >= win_start[sp].reshape(-1, 1)) & (sp <= sp.reshape(-1, 1))
+        new_co[ix[sp]] = (win_sum[sp] + in_win @ delta[sp]) / win_len[sp]
+
+    # All other nodes appear exactly once
+    cd = np.zeros((len(ix) + 1, 3))
+    cd[1:] = np.cumsum(delta, axis=0)
+    win_sum += cd[pos + 1] - cd[win_start]
+    new_co[ix[~is_shared]] = win_sum[~is_shared] / win_len[~is_shared]
+
+    return new_co
+
+
+def _flat_segments(x: 'core.TreeNeuron') -> tuple:
+    """Flatten a neuron's segments into arrays.
 
-        interp = this_co.rolling(window, min_periods=1).mean()
+    Returns
+    -------
+    ix :        (M, ) array
+                Row indices into ``x.nodes`` for all segments (distal to
+                proximal) concatenated.
+    seg_end :   (M, ) array
+                For each position in ``ix``, the position of the last node
+                of its segment.
 
-        nodes.loc[s, ['x', 'y', 'z']] = interp.values
+    """
+    segs = x.segments
+    lens = np.array([len(s) for s in segs], dtype=int)
+    nodes = np.fromiter(itertools.chain.from_iterable(segs),
+                        dtype=x.nodes.node_id.dtype,
+                        count=lens.sum())
+    ix = pd.Index(x.nodes.node_id.values).get_indexer(nodes)
+    seg_end = np.repeat(np.cumsum(lens) - 1, lens)
+    return ix, seg_end
 
-    # Reassign nodes
-    x.nodes = nodes.reset_index(drop=False, inplace=False)
 
-    x._clear_temp_attr()
+def _seg_start(seg_end: np.ndarray) -> np.ndarray:
+    """For each position in flat segments get the segment's first position."""
+    pos = np.arange(len(seg_end))
+    is_first = np.ones(len(seg_end), dtype=bool)
+    is_first[1:] = seg_end[:-1] != seg_end[1:]
+    return np.maximum.accumulate(np.where(is_first, pos, 0))
+
 
+def _coords_worker(job):
+    """Worker for :func:`_update_coords`."""
+    func, co, ix, seg_end, kwargs = job
+    return func(co, ix, seg_end, **kwargs)
+
+
+def _update_coords(x: NeuronObject,
+                   func,
+                   kwargs: dict,
+                   inplace: bool = False,
+                   parallel: bool = False,
+                   n_cores: int = os.cpu_count() - 2,
+                   desc: str = 'Processing') -> Optional[NeuronObject]:
+    """Apply a function to the flattened segments of neuron(s).
+
+    Only node coordinates and flattened segments are passed to ``func`` -
+    this is much cheaper than pickling entire neurons when running in
+    parallel.
+
+    Parameters
+    ----------
+    x :         TreeNeuron | NeuronList
+    func :      callable
+                Must accept ``(coords, ix, seg_end, **kwargs)`` and return
+                new coordinates.
+
+    """
     if not inplace:
-        return x
+        x = x.copy()
+
+    neurons = x if isinstance(x, core.NeuronList) else [x]
+
+    jobs = [(func, n.nodes[['x', 'y', 'z']].values) + _flat_segments(n) + (kwargs, )
+            for n in neurons]
+
+    if parallel and len(jobs) > 1 and n_cores > 1:
+        with mp.Pool(min(n_cores, len(jobs))) as pool:
+            res = list(config.tqdm(pool.imap(_coords_worker,
+                                             jobs,
+                                             chunksize=max(1, len(jobs) // (n_cores * 4))),
+                                   total=len(jobs),
+                                   desc=desc,
+                                   disable=config.pbar_hide,
+                                   leave=config.pbar_leave))
     else:
-        return None
+        res = [_coords_worker(j) for j in config.tqdm(jobs,
+                                                       desc=desc,
+                                                       disable=config.pbar_hide or len(jobs) == 1,
+                                                       leave=config.pbar_leave)]
+
+    for n, co in zip(neurons, res):
+        # Keep float precision but upcast integer coordinates
+        dtype = np.result_type(n.nodes.x.dtype, np.float32)
+        n.nodes[['x', 'y', 'z']] = co.astype(dtype, copy=False)
+        # Topology has not changed - no need to re-classify nodes
+        n._clear_temp_attr(exclude=['classify_nodes'])
+
+    if not inplace:
+        return x
+    return None
 
 
 def break_fragments(x: 'core.TreeNeuron') -> 'core.NeuronList':
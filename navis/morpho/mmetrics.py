@@ -59,16 +59,19 @@ def parent_dist(x: Union['core.TreeNeuron', pd.DataFrame],
         raise TypeError(f'Need TreeNeuron or DataFrame, got "{type(x)}"')
 
     # Extract node coordinates
-    tn_coords = nodes[['x', 'y', 'z']].values
+    tn_coords = nodes[['x', 'y', 'z']].values.astype(float)
 
-    # Get parent coordinates
-    parent_coords = nodes.set_index('node_id').reindex(nodes.parent_id.values)[['x', 'y', 'z']].values
+    # Get positional indices of parents (-1 for roots)
+    parent_ix = pd.Index(nodes.node_id.values).get_indexer(nodes.parent_id.values)
+    has_parent = parent_ix >= 0
 
     # Calculate distances between nodes and their parents
-    w = np.sqrt(np.sum((tn_coords - parent_coords) ** 2, axis=1))
+    w = np.full(tn_coords.shape[0], np.nan)
+    w[has_parent] = np.sqrt(np.sum((tn_coords[has_parent] - tn_coords[parent_ix[has_parent]]) ** 2,
+                                   axis=1))
 
     # Replace root dist (nan by default)
-    w[np.isnan(w)] = root_dist
+    w[~has_parent] = root_dist
 
     return w
 
@@ -689,7 +692,10 @@ def tortuosity(x: 'core.NeuronObject',
     if isinstance(x, core.NeuronList):
         if not isinstance(seg_length, (list, np.ndarray, tuple)):
             seg_length = [seg_length]  # type: ignore
-        df = pd.DataFrame([tortuosity(n, seg_length) for n in config.tqdm(x, desc='Tortuosity', disable=config.pbar_hide, leave=config.pbar_leave)],
+        df = pd.DataFrame([_tortuosity(n, seg_length, skip_remainder=skip_remainder)
+                           for n in config.tqdm(x, desc='Tortuosity',
+                                                disable=config.pbar_hide,
+                                                leave=config.pbar_leave)],
                           index=x.id, columns=seg_length).T
         df.index.name = 'seg_length'
         return df
@@ -697,48 +703,103 @@ def tortuosity(x: 'core.NeuronObject',
     if not isinstance(x, core.TreeNeuron):
         raise TypeError(f'Need TreeNeuron, got {type(x)}')
 
-    if isinstance(seg_length, (list, np.ndarray)):
-        return [tortuosity(x, l) for l in seg_length]  # type: ignore  # would need to overload to fix this
+    if isinstance(seg_length, (list, np.ndarray, tuple)):
+        return list(_tortuosity(x, seg_length, skip_remainder=skip_remainder))
 
-    # From here on out seg length is single value
-    seg_length: float
+    return _tortuosity(x, [seg_length], skip_remainder=skip_remainder)[0]
 
-    if seg_length <= 0:
+
+def _tortuosity(x: 'core.TreeNeuron',
+                seg_lengths: Sequence[Union[int, float]],
+                skip_remainder: bool = False) -> np.ndarray:
+    """Calculate mean tortuosity for multiple segment lengths in one go.
+
+    Cut points are greedily placed along each segment: starting at the
+    segment's first node, the next cut is the first node whose path
+    distance from the previous cut exceeds `seg_length`. Instead of walking
+    each segment node by node, we concatenate all segments into a single
+    monotonically increasing array of path distances and find the next cut
+    for all (segment, seg_length) combinations at once using
+    ``np.searchsorted``.
+
+    Returns
+    -------
+    np.ndarray
+                Mean tortuosity for each seg_length.
+
+    """
+    seg_lengths = np.asarray(seg_lengths, dtype=float).ravel()
+
+    if np.any(seg_lengths <= 0):
         raise ValueError('Segment length must be >0.')
 
-    # We will collect coordinates and do distance calculations later
-    start_tn: List[int] = []
-    end_tn: List[int] = []
-    L: List[Union[int, float]] = []
-
-    # Go over all segments
-    for seg in x.small_segments:
-        # Collect distances between treenodes (in microns)
-        dist = np.array([x.graph.edges[(c, p)]['weight']
-                         for c, p in zip(seg[:-1], seg[1:])])
-        # Walk the segment, collect stretches of length `seg_length`
-        cut_ix = [0]
-        for i, tn in enumerate(seg):
-            if sum(dist[cut_ix[-1]:i]) > seg_length:
-                cut_ix.append(i)
-
-        # If the last node is not a cut node
-        if cut_ix[-1] < i and not skip_remainder:
-            cut_ix.append(i)
-
-        # Translate into treenode IDs
-        if len(cut_ix) > 1:
-            L += [sum(dist[s:e]) for s, e in zip(cut_ix[:-1], cut_ix[1:])]
-            start_tn += [seg[n] for n in cut_ix[:-1]]
-            end_tn += [seg[n] for n in cut_ix[1:]]
-
-    # Now calculate euclidean distances
-    tn_table = x.nodes.set_index('node_id', inplace=False)
-    start_co = tn_table.loc[start_tn, ['x', 'y', 'z']].values
-    end_co = tn_table.loc[end_tn, ['x', 'y', 'z']].values
-    R = np.linalg.norm(start_co - end_co, axis=1)
+    segs = x.small_segments
+    if not segs:
+        return np.full(len(seg_lengths), np.nan)
+
+    # Concatenate all segments
+    seg_len = np.array([len(s) for s in segs])
+    seg_end = np.cumsum(seg_len) - 1  # index of each segment's last node
+    seg_start = seg_end - seg_len + 1
+    nodes = np.fromiter(itertools.chain.from_iterable(segs),
+                        dtype=x.nodes.node_id.dtype,
+                        count=seg_len.sum())
+
+    # Get coordinates
+    ix = pd.Index(x.nodes.node_id.values).get_indexer(nodes)
+    co = x.nodes[['x', 'y', 'z']].values[ix]
+
+    # Distance to next node - zero across segment boundaries
+    dist = np.zeros(len(nodes))
+    dist[1:] = np.linalg.norm(co[1:] - co[:-1], axis=1)
+    dist[seg_start] = 0
+
+    # Because all distances are >= 0, path distances along the concatenated
+    # segments are monotonically increasing
+    cum = np.cumsum(dist)
+
+    # Each (segment, seg_length) combination is walked independently
+    n_segs = len(segs)
+    which_l = np.repeat(np.arange(len(seg_lengths)), n_segs)
+    this_L = seg_lengths[which_l]
+    this_end = np.tile(seg_end, len(seg_lengths))
+    current = np.tile(seg_start, len(seg_lengths))
+    active = np.arange(len(current))
+
+    starts, ends, l_ix = [], [], []
+    while active.size:
+        # First node that is more than L away from current cut
+        nxt = np.searchsorted(cum, cum[current[active]] + this_L[active],
+                              side='right')
+        # Stop if we overshoot the end of the segment
+        valid = nxt <= this_end[active]
+
+        starts.append(current[active[valid]])
+        ends.append(nxt[valid])
+        l_ix.append(which_l[active[valid]])
+
+        current[active[valid]] = nxt[valid]
+        active = active[valid]
+
+    # Add remainders for the segments that don't end on a cut
+    if not skip_remainder:
+        rem = current < this_end
+        starts.append(current[rem])
+        ends.append(this_end[rem])
+        l_ix.append(which_l[rem])
+
+    starts = np.concatenate(starts)
+    ends = np.concatenate(ends)
+    l_ix = np.concatenate(l_ix)
+
+    L = cum[ends] - cum[starts]
+    R = np.linalg.norm(co[ends] - co[starts], axis=1)
 
     # Get tortousity
-    T = np.array(L) / R
+    with np.errstate(divide='ignore', invalid='ignore'):
+        T = L / R
 
-    return T.mean()
+    # Average per seg_length
+    n = np.bincount(l_ix, minlength=len(seg_lengths))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.bincount(l_ix, weights=T, minlength=len(seg_lengths)) / n
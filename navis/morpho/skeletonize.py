@@ -0,0 +1,248 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+"""Turn meshes into skeletons."""
+
+import os
+
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+
+from scipy.sparse import coo_matrix, csgraph
+
+from typing import Union, Optional, Tuple
+
+from .. import config, core
+
+# Set up logging
+logger = config.logger
+
+__all__ = ['mesh2skeleton']
+
+
+def mesh2skeleton(x: Union['core.MeshNeuron', 'core.NeuronList'],
+                  step_size: int = 1,
+                  parallel: bool = False,
+                  n_cores: int = os.cpu_count() - 2
+                  ) -> Union['core.TreeNeuron', 'core.NeuronList']:
+    """Skeletonize mesh neuron(s) using a wavefront.
+
+    Briefly, a wave is propagated along the mesh's vertex graph starting
+    at the soma (if ``x.soma`` is a coordinate) or at a vertex at the tip of
+    the mesh. Vertices are grouped into rings by their (hop) distance from
+    the origin. Connected vertices within a ring become a single skeleton
+    node positioned at their centroid. Skeleton nodes are then connected
+    along the minimum spanning tree of the mesh edges between rings.
+
+    All steps use sparse graph algorithms, i.e. memory scales linearly with
+    the number of faces.
+
+    Parameters
+    ----------
+    x :             MeshNeuron | NeuronList
+                    Mesh neuron(s) to skeletonize. Disconnected pieces of a
+                    mesh become separate fragments of the skeleton.
+    step_size :     int, optional
+                    Width of each ring in number of edges. Larger values
+                    produce coarser skeletons.
+    parallel :      bool, optional
+                    If True and ``x`` is a NeuronList, will process neurons
+                    in parallel using multiple processes.
+    n_cores :       int, optional
+                    Number of cores to use if ``parallel=True``.
+
+    Returns
+    -------
+    TreeNeuron | NeuronList
+                    Skeleton(s). Each skeleton has a ``vertex_map``
+                    attribute which maps each of the mesh's vertices to a
+                    node ID. Node radii are the mean distance of the
+                    vertices to their node. If the mesh neuron has
+                    connectors, these are mapped to the nearest node.
+
+    Examples
+    --------
+    >>> import navis
+    >>> import trimesh
+    >>> m = navis.MeshNeuron(trimesh.creation.cylinder(radius=1, height=20,
+    ...                                                 sections=16))
+    >>> sk = navis.mesh2skeleton(m)
+    >>> sk.n_branches
+    0
+
+    """
+    if isinstance(x, core.NeuronList):
+        if not all(isinstance(n, core.MeshNeuron) for n in x):
+            raise TypeError('Can only skeletonize MeshNeurons')
+        jobs = [_parse_job(n, step_size) for n in x]
+        if parallel and len(jobs) > 1 and n_cores > 1:
+            with mp.Pool(min(n_cores, len(jobs))) as pool:
+                res = list(config.tqdm(pool.imap(_skeletonize_worker,
+                                                 jobs,
+                                                 chunksize=max(1, len(jobs) // (n_cores * 4))),
+                                       total=len(jobs),
+                                       desc='Skeletonizing',
+                                       disable=config.pbar_hide,
+                                       leave=config.pbar_leave))
+        else:
+            res = [_skeletonize_worker(j) for j in config.tqdm(jobs,
+                                                                desc='Skeletonizing',
+                                                                disable=config.pbar_hide,
+                                                                leave=config.pbar_leave)]
+        return core.NeuronList([_make_skeleton(n, *r) for n, r in zip(x, res)])
+
+    if not isinstance(x, core.MeshNeuron):
+        raise TypeError(f'Can only skeletonize MeshNeurons, got "{type(x)}"')
+
+    return _make_skeleton(x, *_skeletonize_worker(_parse_job(x, step_size)))
+
+
+def _parse_job(x: 'core.MeshNeuron', step_size: int) -> tuple:
+    """Extract the data required for skeletonization."""
+    verts = np.asarray(x.vertices, dtype=float)
+
+    # Find the vertex closest to the soma
+    soma = getattr(x, 'soma', None)
+    if soma is not None and np.asarray(soma).size == 3 and len(verts):
+        origin, _ = x.snap(np.asarray(soma).ravel())
+    else:
+        origin = None
+
+    return verts, np.asarray(x.faces), origin, step_size
+
+
+def _skeletonize_worker(job: tuple) -> tuple:
+    """Skeletonize vertices + faces. See :func:`navis.mesh2skeleton`."""
+    return _wavefront(*job)
+
+
+def _wavefront(verts: np.ndarray,
+               faces: np.ndarray,
+               origin: Optional[int] = None,
+               step_size: int = 1
+               ) -> Tuple[pd.DataFrame, np.ndarray, Optional[int]]:
+    """Skeletonize mesh using a wavefront.
+
+    Returns
+    -------
+    nodes :         pandas.DataFrame
+                    SWC-like node table.
+    vertex_map :    (N, ) array
+                    Node ID for each vertex.
+    soma :          int | None
+                    Node ID of the soma.
+
+    """
+    if step_size < 1:
+        raise ValueError('step_size must be >= 1')
+
+    n_verts = len(verts)
+
+    # Unique undirected edges of the mesh
+    edges = np.vstack([faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]])
+    edges = np.sort(edges, axis=1).astype(np.int64)
+    edges = np.unique(edges[:, 0] * n_verts + edges[:, 1])
+    a, b = edges // n_verts, edges % n_verts
+
+    G = coo_matrix((np.ones(len(a)), (a, b)), shape=(n_verts, n_verts)).tocsr()
+
+    # Pick one origin per connected component
+    n_comp, comp = csgraph.connected_components(G, directed=False)
+    first = np.unique(comp, return_index=True)[1]
+
+    # Start with an arbitrary vertex and walk to the farthest vertex from
+    # there - this will be at the tip of a neurite
+    dist = csgraph.dijkstra(G, directed=False, unweighted=True,
+                            indices=first, min_only=True)
+    srt = np.lexsort((-dist, comp))
+    origins = srt[np.unique(comp[srt], return_index=True)[1]]
+
+    # Use the soma as origin for its component
+    if origin is not None:
+        origins[comp[origin]] = origin
+
+    # Propagate wave from origins
+    dist = csgraph.dijkstra(G, directed=False, unweighted=True,
+                            indices=origins, min_only=True)
+    ring = (dist // step_size).astype(np.int64)
+
+    # Connected vertices within the same ring form a skeleton node
+    same = ring[a] == ring[b]
+    G_ring = coo_matrix((np.ones(same.sum()), (a[same], b[same])),
+                        shape=(n_verts, n_verts))
+    n_nodes, vertex_map = csgraph.connected_components(G_ring, directed=False)
+
+    # Node positions are the centroids of their vertices
+    counts = np.bincount(vertex_map, minlength=n_nodes)
+    co = np.vstack([np.bincount(vertex_map, weights=verts[:, i], minlength=n_nodes)
+                    for i in range(3)]).T / counts.reshape(-1, 1)
+
+    # Radius is the mean distance of vertices to their centroid
+    d = np.linalg.norm(verts - co[vertex_map], axis=1)
+    radii = np.bincount(vertex_map, weights=d, minlength=n_nodes) / counts
+
+    # Connect nodes along the mesh edges between rings
+    ca, cb = vertex_map[a[~same]], vertex_map[b[~same]]
+    pairs = np.unique(np.minimum(ca, cb).astype(np.int64) * n_nodes + np.maximum(ca, cb))
+    ca, cb = pairs // n_nodes, pairs % n_nodes
+    # Zero-weights are not edges for csgraph -> add a small offset
+    w = np.linalg.norm(co[ca] - co[cb], axis=1) + 1e-9
+    mst = csgraph.minimum_spanning_tree(coo_matrix((w, (ca, cb)),
+                                                   shape=(n_nodes, n_nodes)))
+
+    # Walk the tree starting from a virtual node connected to all roots to
+    # get parents for all fragments in a single pass
+    roots = np.unique(vertex_map[origins])
+    mst = mst.tocoo()
+    tree = coo_matrix((np.ones(len(mst.row) + len(roots)),
+                       (np.append(mst.row, np.full(len(roots), n_nodes)),
+                        np.append(mst.col, roots))),
+                      shape=(n_nodes + 1, n_nodes + 1))
+    order, pred = csgraph.breadth_first_order(tree, n_nodes, directed=False,
+                                              return_predecessors=True)
+    parents = pred[:n_nodes].astype(np.int64)
+    parents[parents == n_nodes] = -1
+
+    # Sort nodes such that parents come before children
+    order = order[1:]
+    nodes = pd.DataFrame({'node_id': order,
+                          'parent_id': parents[order],
+                          'x': co[order, 0],
+                          'y': co[order, 1],
+                          'z': co[order, 2],
+                          'radius': radii[order]})
+
+    soma = int(vertex_map[origin]) if origin is not None else None
+
+    return nodes, vertex_map, soma
+
+
+def _make_skeleton(x: 'core.MeshNeuron',
+                   nodes: pd.DataFrame,
+                   vertex_map: np.ndarray,
+                   soma: Optional[int]) -> 'core.TreeNeuron':
+    """Generate TreeNeuron from skeletonization results."""
+    sk = core.TreeNeuron(nodes, units=x.units, id=x.id,
+                         name=getattr(x, 'name', None))
+    sk.vertex_map = vertex_map
+    sk.soma = soma
+
+    # Map connectors to nodes via their nearest vertex
+    if x.has_connectors:
+        cn = x.connectors.copy()
+        ix, _ = x.snap(cn[['x', 'y', 'z']].values)
+        cn['node_id'] = vertex_map[ix]
+        sk.connectors = cn
+
+    return sk
@@ -0,0 +1,336 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+"""Native implementation of NBLAST (Costa et al., 2016)."""
+
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+from typing import Union, Optional, List, Tuple
+from typing_extensions import Literal
+
+from .. import core, config, graph, sampling
+from ..utils.parallel import map_with_payload, get_payload
+
+__all__ = ['nblast', 'nblast_allbyall']
+
+# Set up logging
+logger = config.logger
+
+SMAT_FCWB = os.path.join(os.path.dirname(__file__), '..', 'data',
+                         'score_mats', 'smat_fcwb.csv')
+
+
+@functools.lru_cache()
+def _load_score_matrix(fp: str = SMAT_FCWB
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Load score matrix from CSV.
+
+    Rows are distance bins, columns are absolute dot product bins. Labels are
+    intervals such as ``(0,0.75]``.
+
+    Returns
+    -------
+    dist_bins :     np.ndarray
+                    Upper bounds of all but the last distance bin.
+    dot_bins :      np.ndarray
+                    Upper bounds of all but the last dot product bin.
+    scores :        np.ndarray
+                    (N_dist, N_dot) score matrix.
+
+    """
+    smat = pd.read_csv(fp, index_col=0)
+
+    def upper_bounds(labels):
+        return np.array([float(l.split(',')[1].strip(']')) for l in labels])
+
+    dist_bins = upper_bounds(smat.index)[:-1]
+    dot_bins = upper_bounds(smat.columns)[:-1]
+
+    return dist_bins, dot_bins, smat.values.astype(np.float64)
+
+
+def _make_dotprops(x: 'core.TreeNeuron',
+                   k: int = 5,
+                   resample: Optional[float] = None) -> 'core.Dotprops':
+    """Resample (optional) and turn neuron into dotprops."""
+    if resample:
+        x = sampling.resample_neuron(x, resample, inplace=False)
+    return graph.neuron2dps(x, k=k)
+
+
+def _score_pair(query: 'core.Dotprops',
+                target: 'core.Dotprops',
+                use_alpha: bool = False) -> float:
+    """Raw (not normalized) NBLAST score of query against target."""
+    dist_bins, dot_bins, scores = _load_score_matrix()
+
+    if not len(query) or not len(target):
+        return 0
+
+    dist, ix = target.kdtree.query(query.points)
+    dot = np.abs((query.vect * target.vect[ix]).sum(axis=1))
+    if use_alpha:
+        dot = dot * np.sqrt(query.alpha * target.alpha[ix])
+
+    return scores[np.digitize(dist, dist_bins, right=True),
+                  np.digitize(dot, dot_bins, right=True)].sum()
+
+
+def _self_score(dp: 'core.Dotprops', use_alpha: bool = False) -> float:
+    """Score of a perfect match, i.e. of query against itself."""
+    dist_bins, dot_bins, scores = _load_score_matrix()
+    dot = dp.alpha if use_alpha else np.ones(len(dp))
+    return scores[0, np.digitize(dot, dot_bins, right=True)].sum()
+
+
+def _score_row(args) -> np.ndarray:
+    """Score a single query against a list of targets."""
+    q, targets, use_alpha, normalized = args
+    dotprops = get_payload()
+    query = dotprops[q]
+    row = np.array([_score_pair(query, dotprops[t], use_alpha=use_alpha)
+                    for t in targets],
+                   dtype=np.float64)
+    if normalized:
+        self_score = _self_score(query, use_alpha=use_alpha)
+        row = row / self_score if self_score else np.zeros(row.shape)
+    return row
+
+
+def _score_matrix(dotprops: List['core.Dotprops'],
+                  queries: List[int],
+                  targets: List[int],
+                  use_alpha: bool,
+                  normalized: bool,
+                  n_cores: int,
+                  desc: str = 'NBLASTing') -> np.ndarray:
+    """Compute (queries x targets) score matrix."""
+    jobs = [(q, targets, use_alpha, normalized) for q in queries]
+
+    # Dotprops are sent to each worker only once. KD-trees are not pickled but
+    # (re-)generated and cached by each worker on first use.
+    rows = map_with_payload(_score_row, jobs, dotprops,
+                            n_cores=n_cores, desc=desc)
+
+    return np.vstack(rows) if rows else np.zeros((0, len(targets)))
+
+
+def _parse_neurons(x: 'core.NeuronObject') -> 'core.NeuronList':
+    """Make sure we have a NeuronList of TreeNeurons."""
+    if isinstance(x, core.TreeNeuron):
+        x = core.NeuronList(x)
+    elif not isinstance(x, core.NeuronList):
+        raise TypeError(f'Expected TreeNeuron(s), got "{type(x)}"')
+
+    if not all(isinstance(n, core.TreeNeuron) for n in x):
+        raise TypeError('NBLAST requires TreeNeurons')
+
+    return x
+
+
+def _check_scores(scores: str) -> None:
+    if scores not in ('forward', 'mean'):
+        raise ValueError(f'Unknown scores "{scores}". '
+                         'Use "forward" or "mean".')
+
+
+def nblast(query: Union['core.TreeNeuron', 'core.NeuronList'],
+           target: Union['core.TreeNeuron', 'core.NeuronList'],
+           scores: Union[Literal['forward'], Literal['mean']] = 'forward',
+           normalized: bool = True,
+           use_alpha: bool = False,
+           k: int = 5,
+           resample: Optional[float] = None,
+           n_cores: int = os.cpu_count() - 2) -> pd.DataFrame:
+    """NBLAST query against target neurons.
+
+    This is a native implementation of NBLAST (Costa et al., 2016) and does
+    not require R. Neurons are turned into dotprops (points + tangent vectors)
+    and each query point is matched to its nearest target point. Distances
+    and absolute dot products between tangent vectors are then scored using
+    the ``FCWB`` score matrix from ``nat.nblast``.
+
+    Important
+    ---------
+    The score matrix was trained on data in microns. Make sure your neurons
+    are in microns too, e.g. ``nl / 1000`` for neurons in nanometers.
+
+    Parameters
+    ----------
+    query :         TreeNeuron | NeuronList
+                    Query neuron(s).
+    target :        TreeNeuron | NeuronList
+                    Target neuron(s).
+    scores :        'forward' | 'mean'
+                    Determines the final scores:
+
+                      - 'forward' (default) returns query->target scores
+                      - 'mean' returns the mean of query->target and
+                        target->query scores
+
+    normalized :    bool, optional
+                    If True (default), scores are normalized to the score of
+                    a perfect match (i.e. the query against itself).
+    use_alpha :     bool, optional
+                    If True, will weight scores by the linearity of the local
+                    neighbourhood. This emphasises a neuron's backbone over
+                    parts with lots of branches.
+    k :             int, optional
+                    Number of nearest neighbours used to calculate tangent
+                    vectors.
+    resample :      float, optional
+                    If provided, will resample neurons to this resolution
+                    before generating dotprops.
+    n_cores :       int, optional
+                    Number of cores to use. Default is ``os.cpu_count() - 2``.
+
+    Returns
+    -------
+    pandas.DataFrame
+                    Matrix with queries as rows and targets as columns.
+
+    See Also
+    --------
+    :func:`navis.nblast_allbyall`
+                    All-by-all NBLAST for a set of neurons.
+
+    Examples
+    --------
+    >>> import navis
+    >>> nl = navis.example_neurons(n=5)
+    >>> # Convert to microns
+    >>> nl = nl / 1000
+    >>> scores = navis.nblast(nl[:3], nl[3:], n_cores=1)
+
+    """
+    _check_scores(scores)
+    query = _parse_neurons(query)
+    target = _parse_neurons(target)
+
+    dotprops = [_make_dotprops(n, k=k, resample=resample)
+                for n in config.tqdm(query + target,
+                                     desc='Making dotprops',
+                                     disable=config.pbar_hide,
+                                     leave=config.pbar_leave)]
+
+    q_ix = list(range(len(query)))
+    t_ix = list(range(len(query), len(query) + len(target)))
+
+    mat = _score_matrix(dotprops, q_ix, t_ix, use_alpha=use_alpha,
+                        normalized=normalized, n_cores=n_cores)
+
+    if scores == 'mean':
+        rev = _score_matrix(dotprops, t_ix, q_ix, use_alpha=use_alpha,
+                            normalized=normalized, n_cores=n_cores,
+                            desc='NBLASTing (rev)')
+        mat = (mat + rev.T) / 2
+
+    return pd.DataFrame(mat, index=query.id, columns=target.id)
+
+
+def nblast_allbyall(x: 'core.NeuronList',
+                    scores: Union[Literal['forward'], Literal['mean']] = 'forward',
+                    normalized: bool = True,
+                    use_alpha: bool = False,
+                    k: int = 5,
+                    resample: Optional[float] = None,
+                    n_cores: int = os.cpu_count() - 2
+                    ) -> 'clustering.ClustResults':  # type: ignore
+    """All-by-all NBLAST of given neurons.
+
+    Native implementation that does not require R. See :func:`navis.nblast`
+    for details.
+
+    Important
+    ---------
+    The score matrix was trained on data in microns. Make sure your neurons
+    are in microns too, e.g. ``nl / 1000`` for neurons in nanometers.
+
+    Parameters
+    ----------
+    x :             NeuronList
+                    Neurons to blast against each other.
+    scores :        'forward' | 'mean'
+                    Determines the final scores:
+
+                      - 'forward' (default) returns query->target scores
+                      - 'mean' returns the mean of query->target and
+                        target->query scores (i.e. a symmetric matrix)
+
+    normalized :    bool, optional
+                    If True (default), scores are normalized to the score of
+                    a perfect match (i.e. the query against itself).
+    use_alpha :     bool, optional
+                    If True, will weight scores by the linearity of the local
+                    neighbourhood. This emphasises a neuron's backbone over
+                    parts with lots of branches.
+    k :             int, optional
+                    Number of nearest neighbours used to calculate tangent
+                    vectors.
+    resample :      float, optional
+                    If provided, will resample neurons to this resolution
+                    before generating dotprops.
+    n_cores :       int, optional
+                    Number of cores to use. Default is ``os.cpu_count() - 2``.
+
+    Returns
+    -------
+    nblast_results
+                    Instance of :class:`navis.ClustResults` that holds the
+                    similarity matrix and contains wrappers to cluster and
+                    plot data.
+
+    Examples
+    --------
+    >>> import navis
+    >>> import matplotlib.pyplot as plt
+    >>> nl = navis.example_neurons() / 1000
+    >>> res = navis.nblast_allbyall(nl, n_cores=1)
+    >>> # Cluster and create simple dendrogram
+    >>> res.cluster(method='ward')
+    >>> res.plot_matrix()
+    >>> plt.show()
+
+    """
+    from .. import clustering
+
+    _check_scores(scores)
+    x = _parse_neurons(x)
+
+    if len(x) < 2:
+        raise ValueError('You have to provide more than a single neuron.')
+
+    dotprops = [_make_dotprops(n, k=k, resample=resample)
+                for n in config.tqdm(x,
+                                     desc='Making dotprops',
+                                     disable=config.pbar_hide,
+                                     leave=config.pbar_leave)]
+
+    ix = list(range(len(x)))
+    mat = _score_matrix(dotprops, ix, ix, use_alpha=use_alpha,
+                        normalized=normalized, n_cores=n_cores)
+
+    # In all-by-all the reverse scores are just the transposed matrix
+    if scores == 'mean':
+        mat = (mat + mat.T) / 2
+
+    mat = pd.DataFrame(mat, index=x.id, columns=x.id)
+
+    res = clustering.ClustResults(mat, mat_type='similarity', labels=x.name)
+    res.neurons = x
+
+    return res
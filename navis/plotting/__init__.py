@@ -11,9 +11,41 @@
 #    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
 #    GNU General Public License for more details.
 
-from .d import *
-from .dd import *
-from .ddd import *
-from .vispy import *
+import importlib
 
-from .colors import vary_colors
+# Plotting depends on a number of heavy libraries (matplotlib, plotly, vispy,
+# seaborn). To keep ``import navis`` fast, submodules are only imported when
+# one of their functions is first accessed.
+_LAZY_FUNCTIONS = {'plot1d': 'd',
+                   'plot2d': 'dd',
+                   'plot3d': 'ddd',
+                   'Viewer': 'vispy',
+                   'get_viewer': 'vispy',
+                   'clear3d': 'vispy',
+                   'close3d': 'vispy',
+                   'screenshot': 'vispy',
+                   'make_tube': 'vispy',
+                   'render_thumbnails': 'thumbnails',
+                   'vary_colors': 'colors'}
+
+_SUBMODULES = ['colors', 'd', 'dd', 'ddd', 'plot_utils', 'plotly',
+               'thumbnails', 'vispy']
+
+__all__ = sorted(_LAZY_FUNCTIONS)
+
+
+def __getattr__(name):
+    if name in _LAZY_FUNCTIONS:
+        mod = importlib.import_module(f'.{_LAZY_FUNCTIONS[name]}', __name__)
+        obj = getattr(mod, name)
+    elif name in _SUBMODULES:
+        obj = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    # Cache so that we only go through here once
+    globals()[name] = obj
+    return obj
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
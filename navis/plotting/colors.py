@@ -226,8 +226,7 @@ def prepare_colormap(colors, neurons=None, dotprops=None, volumes=None,
         neurons = core.NeuronList((neurons))
 
     if isinstance(dotprops, type(None)):
-        dotprops = core.Dotprops()
-        dotprops['gene_name'] = []
+        dotprops = pd.DataFrame(columns=['gene_name', 'id', 'points'])
 
     if isinstance(volumes, type(None)):
         volumes = np.array([])
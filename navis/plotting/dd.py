@@ -30,9 +30,10 @@ import warnings
 from typing import Union, List, Tuple
 from typing_extensions import Literal
 
-from .. import utils, config, core
+from .. import utils, config, core, sampling
 from .colors import prepare_colormap
-from .plot_utils import segments_to_coords, tn_pairs_to_coords
+from .plot_utils import (segments_to_coords, segments_to_flat_coords,
+                         tn_pairs_to_coords)
 
 __all__ = ['plot2d']
 
@@ -40,7 +41,7 @@ logger = config.logger
 
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
-    pint.Quantity([])
+    config.ureg.Quantity([])
 
 
 def plot2d(x: Union[core.NeuronObject,
@@ -217,6 +218,10 @@ def plot2d(x: Union[core.NeuronObject,
     ``volume_outlines`` (bool, default=True)
       If True will plot volume outline with no fill.
 
+    ``lod`` (int, default=0)
+      Level of detail for meshes (MeshNeurons and Volumes) in 3d plots. ``0``
+      is full resolution. See :func:`navis.decimate_mesh`.
+
 
     See Also
     --------
@@ -233,7 +238,8 @@ def plot2d(x: Union[core.NeuronObject,
                         'cn_mesh_colors', 'linewidth', 'cn_size',
                         'group_neurons', 'scatter_kws', 'figsize', 'linestyle',
                         'alpha', 'depth_coloring', 'autoscale', 'depth_scale',
-                        'use_neuron_color', 'ls', 'lw', 'volume_outlines']
+                        'use_neuron_color', 'ls', 'lw', 'volume_outlines',
+                        'lod']
     wrong_kwargs = [a for a in kwargs if a not in _ACCEPTED_KWARGS]
     if wrong_kwargs:
         raise KeyError(f'Unknown kwarg(s): {",".join(wrong_kwargs)}. '
@@ -554,7 +560,8 @@ def _plot_dotprops(dp, color, method, ax, **kwargs):
     linestyle = kwargs.get('linestyle', kwargs.get('ls', '-'))
     alpha = kwargs.get('alpha', .9)
     group_neurons = kwargs.get('group_neurons', False)
-    plot_soma = kwargs.get('soma', True)
+    # Soma is only available if provided as X/Y/Z
+    plot_soma = kwargs.get('soma', True) and all([hasattr(dp, v) for v in ['X', 'Y', 'Z']])
 
     # Prepare lines - this is based on nat:::plot3d.dotprops
     halfvect = dp.points[['x_vec', 'y_vec', 'z_vec']] / 2
@@ -622,18 +629,19 @@ def _plot_dotprops(dp, color, method, ax, **kwargs):
                 ax.add_collection3d(lc)
 
         # This is the soma
-        resolution = 20
-        u = np.linspace(0, 2 * np.pi, resolution)
-        v = np.linspace(0, np.pi, resolution)
-        x = 2 * np.outer(np.cos(u), np.sin(v)) + dp.X
-        y = 2 * np.outer(np.sin(u), np.sin(v)) + dp.Y
-        z = 2 * np.outer(np.ones(np.size(u)), np.cos(v)) + dp.Z
-        surf = ax.plot_surface(x, y, z,
-                               color=color,
-                               shade=False,
-                               alpha=alpha)
-        if group_neurons:
-            surf.set_gid(dp.gene_name)
+        if plot_soma:
+            resolution = 20
+            u = np.linspace(0, 2 * np.pi, resolution)
+            v = np.linspace(0, np.pi, resolution)
+            x = 2 * np.outer(np.cos(u), np.sin(v)) + dp.X
+            y = 2 * np.outer(np.sin(u), np.sin(v)) + dp.Y
+            z = 2 * np.outer(np.ones(np.size(u)), np.cos(v)) + dp.Z
+            surf = ax.plot_surface(x, y, z,
+                                   color=color,
+                                   shade=False,
+                                   alpha=alpha)
+            if group_neurons:
+                surf.set_gid(dp.gene_name)
 
 
 def _plot_connectors(neuron, color, method, ax, **kwargs):
@@ -680,10 +688,11 @@ def _plot_mesh(neuron, color, method, ax, **kwargs):
     if alpha:
         color = (color[0], color[1], color[2], alpha)
 
-    ts = ax.plot_trisurf(neuron.vertices[:, 0],
-                         neuron.vertices[:, 1],
-                         neuron.faces,
-                         neuron.vertices[:, 2],
+    verts, faces = sampling.decimation.get_lod(neuron, kwargs.get('lod'))
+    ts = ax.plot_trisurf(verts[:, 0],
+                         verts[:, 1],
+                         faces,
+                         verts[:, 2],
                          label=name,
                          color=color)
 
@@ -701,17 +710,11 @@ def _plot_skeleton(neuron, color, method, ax, **kwargs):
     plot_soma = kwargs.get('soma', True)
     group_neurons = kwargs.get('group_neurons', False)
 
-    # Generate by-segment coordinates
-    coords = segments_to_coords(neuron,
-                                neuron.segments,
-                                modifier=(1, 1, 1))
-
     if method == '2d':
         if not depth_coloring:
-            # We have to add (None, None, None) to the end of each
-            # slab to make that line discontinuous there
-            coords = np.vstack(
-                [np.append(t, [[None] * 3], axis=0) for t in coords])
+            # Segments are separated by a row of NaNs to make the line
+            # discontinuous there
+            coords = segments_to_flat_coords(neuron, modifier=(1, 1, 1))
 
             this_line = mlines.Line2D(coords[:, 0], coords[:, 1],
                                       lw=linewidth, ls=linestyle,
@@ -750,6 +753,11 @@ def _plot_skeleton(neuron, color, method, ax, **kwargs):
         return None, None
 
     elif method in ['3d', '3d_complex']:
+        # Generate by-segment coordinates
+        coords = segments_to_coords(neuron,
+                                    neuron.segments,
+                                    modifier=(1, 1, 1))
+
         # For simple scenes, add whole neurons at a time -> will speed
         # up rendering
         if method == '3d':
@@ -838,7 +846,8 @@ def _plot_volume(volume, color, method, ax, **kwargs):
                                   fc=fc, ec=ec, alpha=this_alpha, zorder=0)
         ax.add_patch(vpatch)
     elif method in ['3d', '3d_complex']:
-        verts = np.vstack(volume.vertices)
+        verts, faces = sampling.decimation.get_lod(volume, kwargs.get('lod'))
+        verts = np.vstack(verts)
 
         # Add alpha
         if len(color) == 3:
@@ -846,7 +855,7 @@ def _plot_volume(volume, color, method, ax, **kwargs):
 
         ts = ax.plot_trisurf(verts[:, 0],
                              verts[:, 1],
-                             volume.faces,
+                             faces,
                              verts[:, 2],
                              label=name,
                              color=color)
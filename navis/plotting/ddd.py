@@ -99,6 +99,11 @@ def plot3d(x: Union[core.NeuronObject,
                       Use to modify scatter plots. Accepted parameters are
                         - ``size`` to adjust size of dots
                         - ``color`` to adjust color
+    lod :             int, default=0
+                      Level of detail for meshes (MeshNeurons and Volumes).
+                      ``0`` is full resolution, higher levels are
+                      progressively coarser. Decimated meshes are cached.
+                      See :func:`navis.decimate_mesh`.
 
     Plotly only
 
@@ -213,7 +218,7 @@ def plot3d_vispy(x, **kwargs):
                'cn_mesh_colors', 'linewidth', 'scatter_kws', 'synapse_layout',
                'dps_scale_vec', 'title', 'width', 'height',
                'auto_limits', 'autolimits', 'viewer', 'radius',
-               'clear', 'clear3d', 'connectors', 'connectors_only'}
+               'clear', 'clear3d', 'connectors', 'connectors_only', 'lod'}
 
     # Check if any of these parameters are dynamic (i.e. attached data tables)
     notallowed = set(kwargs.keys()) - ALLOWED
@@ -264,7 +269,7 @@ def plot3d_plotly(x, **kwargs):
                'cn_mesh_colors', 'linewidth', 'scatter_kws', 'synapse_layout',
                'dps_scale_vec', 'title', 'width', 'height', 'fig_autosize',
                'plotly_inline',
-               'connectors', 'connectors_only'}
+               'connectors', 'connectors_only', 'lod'}
 
     # Check if any of these parameters are dynamic (i.e. attached data tables)
     notallowed = set(kwargs.keys()) - ALLOWED
@@ -21,12 +21,14 @@ import random
 import math
 
 import numpy as np
+import pandas as pd
 
-from typing import Tuple, Optional, List, Dict
+from typing import Tuple, Optional, List
 
 from .. import config, core
 
-__all__ = ['tn_pairs_to_coords', 'segments_to_coords', 'fibonacci_sphere']
+__all__ = ['tn_pairs_to_coords', 'segments_to_coords',
+           'segments_to_flat_coords', 'fibonacci_sphere']
 
 logger = config.logger
 
@@ -40,7 +42,7 @@ def tn_pairs_to_coords(x: core.TreeNeuron,
 
     Parameters
     ----------
-    x :         pandas DataFrame | TreeNeuron
+    x :         TreeNeuron
                 Must contain the nodes.
     modifier :  ints, optional
                 Use to modify/invert x/y/z axes.
@@ -54,19 +56,13 @@ def tn_pairs_to_coords(x: core.TreeNeuron,
     if not isinstance(modifier, np.ndarray):
         modifier = np.array(modifier)
 
-    nodes = x.nodes[x.nodes.parent_id >= 0]
+    # Use the neuron's cached edge coordinates (read-only)
+    coords = x.path_coords['edges']
 
-    tn_co = nodes.loc[:, ['x', 'y', 'z']].values
-    parent_co = x.nodes.set_index('node_id',
-                                  inplace=False).loc[nodes.parent_id.values,
-                                                     ['x', 'y', 'z']].values
+    if np.any(modifier != 1):
+        coords = coords * modifier
 
-    tn_co *= modifier
-    parent_co *= modifier
-
-    coords = np.append(tn_co, parent_co, axis=1)
-
-    return coords.reshape((coords.shape[0], 2, 3))
+    return coords
 
 
 def segments_to_coords(x: core.TreeNeuron,
@@ -79,9 +75,11 @@ def segments_to_coords(x: core.TreeNeuron,
 
     Parameters
     ----------
-    x :         pandas DataFrame | TreeNeuron
+    x :         TreeNeuron
                 Must contain the nodes
     segments :  list of treenode IDs
+                If these are the neuron's ``.segments``, will use the
+                neuron's cached coordinates.
     modifier :  ints, optional
                 Use to modify/invert x/y/z axes.
 
@@ -94,12 +92,60 @@ def segments_to_coords(x: core.TreeNeuron,
     if not isinstance(modifier, np.ndarray):
         modifier = np.array(modifier)
 
-    locs: Dict[int, Tuple[float, float, float]]
-    locs = {r.node_id: (r.x, r.y, r.z) for r in x.nodes.itertuples()}  # type: ignore
+    pc = x.path_coords
+    if segments is x.segments:
+        coords = pc['coords']
+        offsets = pc['offsets']
+    else:
+        locs = x.nodes[['x', 'y', 'z']].values.astype(float)
+        lengths = [len(s) for s in segments]
+        offsets = np.cumsum([0] + lengths)
+        if len(segments):
+            ix = pd.Index(x.nodes.node_id.values).get_indexer(np.concatenate(segments))
+        else:
+            ix = np.zeros(0, dtype=int)
+        coords = locs[ix]
 
-    coords = ([np.array([locs[tn] for tn in s]) * modifier for s in segments])
+    if np.any(modifier != 1):
+        coords = coords * modifier
 
-    return coords
+    return np.split(coords, offsets[1:-1])
+
+
+def segments_to_flat_coords(x: core.TreeNeuron,
+                            modifier: Optional[Tuple[float,
+                                                     float,
+                                                     float]] = (1, 1, 1)
+                            ) -> np.ndarray:
+    """Return coordinates of all segments with NaN rows as line breaks.
+
+    This is the format used for drawing a whole neuron as a single line
+    (e.g. with matplotlib or plotly).
+
+    Parameters
+    ----------
+    x :         TreeNeuron
+    modifier :  ints, optional
+                Use to modify/invert x/y/z axes.
+
+    Returns
+    -------
+    coords :    np.array
+                ``(N + n_segments, 3)`` array: each segment is followed by
+                a row of NaNs.
+
+    """
+    if not isinstance(modifier, np.ndarray):
+        modifier = np.array(modifier)
+
+    pc = x.path_coords
+    coords = pc['coords']
+    offsets = pc['offsets']
+
+    if np.any(modifier != 1):
+        coords = coords * modifier
+
+    return np.insert(coords, offsets[1:], np.nan, axis=0)
 
 
 def fibonacci_sphere(samples: int = 1,
@@ -18,7 +18,7 @@ import plotly.graph_objs as go
 
 from ..colors import *
 from ..plot_utils import *
-from ... import core, utils, config, morpho
+from ... import core, utils, config, morpho, sampling
 
 logger = config.logger
 
@@ -137,12 +137,13 @@ def mesh2plotly(neuron, color, **kwargs):
     except BaseException:
         c = 'rgb(10,10,10)'
 
-    trace_data = [go.Mesh3d(x=neuron.vertices[:, 0],
-                            y=neuron.vertices[:, 1],
-                            z=neuron.vertices[:, 2],
-                            i=neuron.faces[:, 0],
-                            j=neuron.faces[:, 1],
-                            k=neuron.faces[:, 2],
+    verts, faces = sampling.decimation.get_lod(neuron, kwargs.get('lod'))
+    trace_data = [go.Mesh3d(x=verts[:, 0],
+                            y=verts[:, 1],
+                            z=verts[:, 2],
+                            i=faces[:, 0],
+                            j=faces[:, 1],
+                            k=faces[:, 2],
                             color=c,
                             name=name,
                             legendgroup=name,
@@ -154,14 +155,12 @@ def mesh2plotly(neuron, color, **kwargs):
 
 def skeleton2plotly(neuron, color, **kwargs):
     """Convert skeleton (i.e. TreeNeuron) to plotly line plot."""
-    coords = segments_to_coords(neuron, neuron.segments)
+    # Segments are separated by a row of NaNs to make the line
+    # discontinuous there
+    coords = segments_to_flat_coords(neuron)
     name = str(getattr(neuron, 'name', neuron.id))
     linewidth = kwargs.get('linewidth', 1)
 
-    # We have to add (None, None, None) to the end of each slab to
-    # make that line discontinuous there
-    coords = np.vstack([np.append(t, [[None] * 3], axis=0) for t in coords])
-
     if kwargs.get('by_strahler', False):
         s_index = morpho.strahler_index(neuron, return_dict=True)
         max_strahler = max(s_index.values())
@@ -357,12 +356,13 @@ def volume2plotly(x, **kwargs):
         if len(c) == 3:
             c = (c[0], c[1], c[2], .5)
 
-        trace_data.append(go.Mesh3d(x=v.vertices[:, 0],
-                                    y=v.vertices[:, 1],
-                                    z=v.vertices[:, 2],
-                                    i=v.faces[:, 0],
-                                    j=v.faces[:, 1],
-                                    k=v.faces[:, 2],
+        verts, faces = sampling.decimation.get_lod(v, kwargs.get('lod'))
+        trace_data.append(go.Mesh3d(x=verts[:, 0],
+                                    y=verts[:, 1],
+                                    z=verts[:, 2],
+                                    i=faces[:, 0],
+                                    j=faces[:, 1],
+                                    k=faces[:, 2],
                                     color=f'rgba{str(c)}',
                                     name=name,
                                     hoverinfo='none'))
@@ -0,0 +1,321 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+""" Module contains functions to render neuron thumbnails off-screen.
+"""
+
+import multiprocessing as mp
+import os
+
+import numpy as np
+import png
+
+from typing import Union, List, Tuple, Optional, Sequence, Dict, Any
+from typing_extensions import Literal
+
+from .. import core, config
+
+__all__ = ['render_thumbnails']
+
+logger = config.logger
+
+_AXES = {'x': 0, 'y': 1, 'z': 2}
+
+
+def render_thumbnails(x: 'core.NeuronObject',
+                      views: Sequence[Union[str, Tuple[str, str], np.ndarray]] = (('x', 'y'), ),
+                      output_dir: str = '.',
+                      fmt: Union[Literal['png'], Literal['svg']] = 'png',
+                      size: Tuple[int, int] = (256, 256),
+                      color: Optional[Union[tuple, Dict[Any, tuple]]] = None,
+                      linewidth: float = 1,
+                      backend: Union[Literal['auto'],
+                                     Literal['matplotlib'],
+                                     Literal['numpy']] = 'auto',
+                      parallel: bool = True,
+                      n_cores: int = os.cpu_count() - 1
+                      ) -> List[str]:
+    """Render PNG/SVG thumbnails for many neurons without a GUI.
+
+    Geometry is extracted only once per neuron and then projected for each
+    view. Rendering does not require an OpenGL context: either matplotlib's
+    Agg backend or a pure NumPy rasterizer (PNG) and writer (SVG) is used.
+
+    Parameters
+    ----------
+    x :             TreeNeuron | MeshNeuron | NeuronList
+                    Neurons to render.
+    views :         list of views
+                    Each view is either a tuple of two axes (e.g. ``('x', 'y')``
+                    or ``('x', '-z')`` to invert an axis), the same as string
+                    (e.g. ``'xy'``) or a (3, 2) projection matrix.
+    output_dir :    str
+                    Directory to write files to. Files will be named
+                    ``{neuron.id}_{view}.{fmt}``.
+    fmt :           "png" | "svg"
+                    Output format.
+    size :          tuple of int
+                    Size of the thumbnails in pixels.
+    color :         tuple | dict, optional
+                    Single RGB(A) color (0-1) or a dictionary mapping
+                    neuron IDs to colors. Defaults to ``config.default_color``.
+    linewidth :     float
+                    Line width (in pixels) for skeletons.
+    backend :       "auto" | "matplotlib" | "numpy"
+                    Rasterization backend. "auto" uses matplotlib if
+                    available and falls back to NumPy.
+    parallel :      bool
+                    If True and more than one neuron, will render using a
+                    pool of worker processes.
+    n_cores :       int
+                    Number of worker processes.
+
+    Returns
+    -------
+    list
+                    Filenames of the generated thumbnails.
+
+    Examples
+    --------
+    >>> import navis
+    >>> nl = navis.example_neurons()
+    >>> files = navis.render_thumbnails(nl, views=['xy', 'xz'],
+    ...                                 output_dir='thumbnails')
+
+    """
+    if isinstance(x, core.BaseNeuron):
+        x = core.NeuronList(x)
+    elif not isinstance(x, core.NeuronList):
+        raise TypeError(f'Expected neuron or NeuronList, got "{type(x)}"')
+
+    if fmt not in ('png', 'svg'):
+        raise ValueError(f'Unknown format "{fmt}". Use "png" or "svg".')
+
+    if backend == 'auto':
+        try:
+            import matplotlib
+            backend = 'matplotlib'
+        except ImportError:
+            backend = 'numpy'
+    elif backend not in ('matplotlib', 'numpy'):
+        raise ValueError(f'Unknown backend "{backend}"')
+
+    if isinstance(views, (str, np.ndarray)):
+        views = [views]
+    projections = [_parse_view(v) for v in views]
+    view_names = [_view_name(v, i) for i, v in enumerate(views)]
+
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    if color is None:
+        color = config.default_color
+
+    # Extract geometry once per neuron in the main process. Only these arrays
+    # are sent to the workers which is much cheaper than pickling neurons.
+    jobs = []
+    for n in x:
+        c = color.get(n.id, config.default_color) if isinstance(color, dict) else color
+        files = [os.path.join(output_dir, f'{n.id}_{vn}.{fmt}') for vn in view_names]
+        jobs.append((_neuron_geometry(n), projections, files, size,
+                     tuple(c), linewidth, backend, fmt))
+
+    if parallel and len(jobs) > 1 and n_cores > 1:
+        with mp.Pool(min(n_cores, len(jobs))) as pool:
+            res = list(config.tqdm(pool.imap(_render_worker,
+                                             jobs,
+                                             chunksize=max(1, len(jobs) // (n_cores * 4))),
+                                   total=len(jobs),
+                                   desc='Rendering',
+                                   disable=config.pbar_hide,
+                                   leave=config.pbar_leave))
+    else:
+        res = [_render_worker(j) for j in config.tqdm(jobs,
+                                                       desc='Rendering',
+                                                       disable=config.pbar_hide or len(jobs) == 1,
+                                                       leave=config.pbar_leave)]
+
+    return [f for r in res for f in r]
+
+
+def _parse_view(view: Union[str, Tuple[str, str], np.ndarray]) -> np.ndarray:
+    """Turn view into a (3, 2) projection matrix."""
+    if isinstance(view, np.ndarray):
+        if view.shape != (3, 2):
+            raise ValueError(f'Projection matrix must be of shape (3, 2), got {view.shape}')
+        return view.astype(float)
+
+    if isinstance(view, str):
+        view = tuple(view.replace('-', ' -').split()) if '-' in view else tuple(view)
+
+    if len(view) != 2:
+        raise ValueError(f'View must consist of two axes, got "{view}"')
+
+    P = np.zeros((3, 2))
+    for i, ax in enumerate(view):
+        sign = -1 if ax.startswith('-') else 1
+        ax = ax.lstrip('-')
+        if ax not in _AXES:
+            raise ValueError(f'Unknown axis "{ax}"')
+        P[_AXES[ax], i] = sign
+    return P
+
+
+def _view_name(view: Union[str, Tuple[str, str], np.ndarray], i: int) -> str:
+    """Generate a filename-friendly name for a view."""
+    if isinstance(view, np.ndarray):
+        return f'view{i}'
+    return ''.join(view).replace('-', 'neg')
+
+
+def _neuron_geometry(x: 'core.BaseNeuron') -> Dict[str, np.ndarray]:
+    """Extract the geometry required for rendering."""
+    if isinstance(x, core.TreeNeuron):
+        return {'lines': x.path_coords['edges']}
+    elif isinstance(x, core.MeshNeuron):
+        return {'triangles': np.asarray(x.vertices, dtype=float)[x.faces]}
+    else:
+        raise TypeError(f'Unable to render "{type(x)}"')
+
+
+def _render_worker(job: tuple) -> List[str]:
+    """Render all views for a single neuron."""
+    geom, projections, files, size, color, linewidth, backend, fmt = job
+
+    # Put all vertices into a single array so that we project only once
+    # per view
+    if 'lines' in geom:
+        verts = geom['lines'].reshape(-1, 3)
+        n_per = 2
+    else:
+        verts = geom['triangles'].reshape(-1, 3)
+        n_per = 3
+
+    for P, f in zip(projections, files):
+        xy = verts.dot(P).reshape(-1, n_per, 2)
+        if backend == 'matplotlib':
+            _render_matplotlib(xy, f, size, color, linewidth, fmt)
+        elif fmt == 'svg':
+            _render_numpy_svg(xy, f, size, color, linewidth)
+        else:
+            _render_numpy_png(xy, f, size, color, linewidth)
+
+    return files
+
+
+def _fit_to_canvas(xy: np.ndarray,
+                   size: Tuple[int, int],
+                   pad: float = .05) -> np.ndarray:
+    """Scale and translate 2d coordinates to pixel space (y pointing down)."""
+    w, h = size
+    if not xy.size:
+        return xy
+    mn = xy.reshape(-1, 2).min(axis=0)
+    mx = xy.reshape(-1, 2).max(axis=0)
+    ext = np.where((mx - mn) > 0, mx - mn, 1)
+    scale = min(w * (1 - 2 * pad) / ext[0], h * (1 - 2 * pad) / ext[1])
+    offset = (np.array([w, h]) - ext * scale) / 2
+    px = (xy - mn) * scale + offset
+    # Flip y so that positive y points up in the image
+    px[..., 1] = h - px[..., 1]
+    return px
+
+
+def _render_matplotlib(xy, filename, size, color, linewidth, fmt):
+    """Render using matplotlib's Agg backend (no GUI required)."""
+    # We are avoiding pyplot here -> figures are not tracked globally
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection, PolyCollection
+
+    dpi = 100
+    fig = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+
+    px = _fit_to_canvas(xy, size)
+    if xy.shape[1] == 2:
+        ax.add_collection(LineCollection(px, colors=[color],
+                                         linewidths=linewidth))
+    else:
+        ax.add_collection(PolyCollection(px, facecolors=[color],
+                                         edgecolors='none'))
+
+    ax.set_xlim(0, size[0])
+    ax.set_ylim(size[1], 0)
+    fig.savefig(filename, format=fmt, dpi=dpi, transparent=True)
+
+
+def _render_numpy_png(xy, filename, size, color, linewidth):
+    """Rasterize lines/triangles with NumPy and write PNG."""
+    w, h = size
+    img = np.zeros((h, w, 4), dtype=np.uint8)
+    px = _fit_to_canvas(xy, size)
+
+    if px.shape[1] == 2:
+        p0, p1 = px[:, 0], px[:, 1]
+    else:
+        # Triangles are rendered as their outlines
+        p0 = px.reshape(-1, 2)
+        p1 = px[:, [1, 2, 0]].reshape(-1, 2)
+
+    pts = _sample_lines(p0, p1)
+
+    # Thicken lines by stamping a small disc
+    r = max(0, int(round((linewidth - 1) / 2)))
+    if r:
+        ox, oy = np.mgrid[-r:r + 1, -r:r + 1]
+        disc = np.c_[ox.ravel(), oy.ravel()][(ox ** 2 + oy ** 2).ravel() <= r ** 2]
+        pts = (pts[:, None, :] + disc[None, :, :]).reshape(-1, 2)
+
+    pts = pts[(pts[:, 0] >= 0) & (pts[:, 0] < w) & (pts[:, 1] >= 0) & (pts[:, 1] < h)]
+
+    rgba = np.array(list(color) + [1] * (4 - len(color))) * 255
+    img[pts[:, 1], pts[:, 0]] = rgba.astype(np.uint8)
+
+    png.from_array(img.reshape(h, w * 4), mode='RGBA').save(filename)
+
+
+def _sample_lines(p0: np.ndarray, p1: np.ndarray) -> np.ndarray:
+    """Sample integer pixel positions along lines (vectorized DDA)."""
+    d = p1 - p0
+    n = np.ceil(np.abs(d).max(axis=1)).astype(int) + 1 if len(d) else np.zeros(0, dtype=int)
+    line_ix = np.repeat(np.arange(len(n)), n)
+    starts = np.repeat(np.cumsum(n) - n, n)
+    t = (np.arange(n.sum()) - starts) / np.maximum(np.repeat(n, n) - 1, 1)
+    pts = p0[line_ix] + d[line_ix] * t[:, None]
+    return np.floor(pts).astype(int)
+
+
+def _render_numpy_svg(xy, filename, size, color, linewidth):
+    """Write SVG directly without going through a plotting library."""
+    w, h = size
+    px = _fit_to_canvas(xy, size)
+    hexc = '#{:02x}{:02x}{:02x}'.format(*[int(c * 255) for c in color[:3]])
+    alpha = color[3] if len(color) > 3 else 1
+
+    if px.shape[1] == 2:
+        cmds = ['M{:.1f} {:.1f}L{:.1f} {:.1f}'.format(*e.ravel()) for e in px]
+        shape = (f'<path d="{"".join(cmds)}" fill="none" stroke="{hexc}" '
+                 f'stroke-opacity="{alpha}" stroke-width="{linewidth}" '
+                 'stroke-linecap="round"/>')
+    else:
+        cmds = ['M{:.1f} {:.1f}L{:.1f} {:.1f}L{:.1f} {:.1f}Z'.format(*t.ravel()) for t in px]
+        shape = (f'<path d="{"".join(cmds)}" fill="{hexc}" '
+                 f'fill-opacity="{alpha}" stroke="none"/>')
+
+    with open(filename, 'w') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" '
+                f'width="{w}" height="{h}" viewBox="0 0 {w} {h}">'
+                f'{shape}</svg>')
@@ -29,9 +29,9 @@ with warnings.catch_warnings():
     from vispy import scene
     from vispy.geometry import create_sphere
 
-from ... import core, config, utils, morpho
+from ... import core, config, utils, morpho, sampling
 from ..colors import *
-from ..plot_utils import segments_to_coords
+from ..plot_utils import segments_to_coords, tn_pairs_to_coords
 from .vputils import make_tube
 
 __all__ = ['volume2vispy', 'neuron2vispy', 'dotprop2vispy',
@@ -73,8 +73,9 @@ def volume2vispy(x, **kwargs):
         if max(color) > 1:
             color[:3] = color[:3] / 255
 
-        s = scene.visuals.Mesh(vertices=v.vertices,
-                               faces=v.faces, color=color,
+        verts, faces = sampling.decimation.get_lod(v, kwargs.get('lod'))
+        s = scene.visuals.Mesh(vertices=verts,
+                               faces=faces, color=color,
                                shading=kwargs.get('shading', 'smooth'))
 
         # Set some aesthetic parameters
@@ -257,8 +258,9 @@ def connectors2vispy(neuron, neuron_color, object_id, **kwargs):
 
 def mesh2vispy(neuron, neuron_color, object_id, **kwargs):
     """Convert mesh (i.e. MeshNeuron) to vispy visuals."""
-    m = scene.visuals.Mesh(vertices=neuron.vertices,
-                           faces=neuron.faces,
+    verts, faces = sampling.decimation.get_lod(neuron, kwargs.get('lod'))
+    m = scene.visuals.Mesh(vertices=verts,
+                           faces=faces,
                            color=neuron_color,
                            shading=kwargs.get('shading', 'smooth'))
 
@@ -286,12 +288,8 @@ def skeleton2vispy(neuron, neuron_color, object_id, **kwargs):
         # cut weirdly)
         root_ix = neuron.nodes[neuron.nodes.parent_id < 0].index.tolist()
 
-        # Get nodes
-        nodes = neuron.nodes[neuron.nodes.parent_id >= 0]
-
-        # Extract treenode_coordinates and their parent's coordinates
-        tn_coords = nodes[['x', 'y', 'z']].apply(pd.to_numeric).values
-        parent_coords = neuron.nodes.set_index('node_id').loc[nodes.parent_id.values][['x', 'y', 'z']].apply(pd.to_numeric).values
+        # Get (cached) treenode -> parent coordinates
+        edges = tn_pairs_to_coords(neuron)
 
         # Add alpha to color based on strahler
         if kwargs.get('by_strahler', False) \
@@ -320,14 +318,14 @@ def skeleton2vispy(neuron, neuron_color, object_id, **kwargs):
             # Turn color into array
             # (need 2 colors per segment for beginning and end)
             neuron_color = np.array(
-                [neuron_color] * (tn_coords.shape[0] * 2), dtype=float)
+                [neuron_color] * (edges.shape[0] * 2), dtype=float)
             neuron_color = np.insert(neuron_color, 3, alpha, axis=1)
 
         if not kwargs.get('radius', False):
-            # Turn coordinates into segments
-            segments = [item for sublist in zip(tn_coords, parent_coords) for item in sublist]
+            # Turn coordinates into segments: (child, parent, child, ...)
+            segments = edges.reshape(-1, 3)
             # Create line plot from segments.
-            t = scene.visuals.Line(pos=np.array(segments),
+            t = scene.visuals.Line(pos=segments,
                                    color=list(neuron_color),
                                    # Can only be used with method 'agg'
                                    width=kwargs.get('linewidth', 1),
@@ -354,8 +352,8 @@ def skeleton2vispy(neuron, neuron_color, object_id, **kwargs):
                                         neuron.segments,
                                         modifier=(1, 1, 1))
             # For each point of each segment get the radius
-            nodes = neuron.nodes.set_index('node_id')
-            radii = [nodes.loc[s, 'radius'].values.astype(float) for s in neuron.segments]
+            radii = neuron.nodes.radius.values.astype(float)[neuron.path_coords['node_ix']]
+            radii = np.split(radii, neuron.path_coords['offsets'][1:-1])
 
             # Generate faces and vertices for the tube
             verts, faces = make_tube(segments=coords,
@@ -13,3 +13,4 @@
 
 from .downsampling import downsample_neuron
 from .resampling import resample_neuron
+from .decimation import decimate_mesh
@@ -0,0 +1,219 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+"""Decimation of meshes (MeshNeurons and Volumes)."""
+
+import numpy as np
+import trimesh
+
+from typing import Optional, Union, Tuple
+
+from .. import config, core
+
+# Set up logging
+logger = config.logger
+
+__all__ = ['decimate_mesh']
+
+
+def decimate_mesh(x: Union['core.MeshNeuron', 'core.Volume', 'core.NeuronList'],
+                  lod: int = 1,
+                  voxel_size: Optional[float] = None,
+                  inplace: bool = False
+                  ) -> Optional[Union['core.MeshNeuron', 'core.Volume', 'core.NeuronList']]:
+    """Reduce the number of faces of mesh(es).
+
+    Uses vertex clustering: space is divided into a grid of voxels and all
+    vertices within a voxel are collapsed onto their centroid. Faces that
+    collapse into lines or points are dropped. This is fast (fully
+    vectorized) but does not preserve topology: thin structures below the
+    voxel size may merge or disappear.
+
+    Decimations by level of detail (``lod``) are cached on the object and
+    re-used by functions that accept a ``lod`` parameter (e.g.
+    :func:`navis.plot3d`, :func:`navis.in_volume`). The cache is reset
+    whenever the object's vertices or faces change.
+
+    Parameters
+    ----------
+    x :             MeshNeuron | Volume | NeuronList
+                    Mesh(es) to decimate.
+    lod :           int
+                    Level of detail. ``0`` is full resolution. For each
+                    level, the voxel size doubles (starting with twice the
+                    mean edge length at ``lod=1``) which for most meshes
+                    reduces the face count by roughly a factor of 4 per
+                    level.
+    voxel_size :    float, optional
+                    Use to set the size of voxels directly instead of via
+                    ``lod``. Results are not cached.
+    inplace :       bool
+                    If False, will return a decimated copy.
+
+    Returns
+    -------
+    MeshNeuron | Volume | NeuronList
+                    Decimated mesh(es) if ``inplace=False``.
+
+    Examples
+    --------
+    >>> import navis
+    >>> import trimesh
+    >>> m = navis.MeshNeuron(trimesh.creation.icosphere(6))
+    >>> lowres = navis.decimate_mesh(m, lod=2)
+    >>> lowres.n_faces < m.n_faces
+    True
+
+    """
+    if isinstance(x, core.NeuronList):
+        if not inplace:
+            x = x.copy()
+        for n in config.tqdm(x,
+                             desc='Decimating',
+                             disable=config.pbar_hide,
+                             leave=config.pbar_leave):
+            decimate_mesh(n, lod=lod, voxel_size=voxel_size, inplace=True)
+        if not inplace:
+            return x
+        return None
+
+    if not isinstance(x, (core.MeshNeuron, core.Volume)):
+        raise TypeError(f'Expected MeshNeuron or Volume, got "{type(x)}"')
+
+    if voxel_size is not None:
+        verts, faces = cluster_vertices(x.vertices, x.faces, voxel_size)
+    else:
+        verts, faces = get_lod(x, lod)
+
+    if not inplace:
+        x = x.copy()
+
+    x.vertices, x.faces = verts, faces
+
+    if not inplace:
+        return x
+    return None
+
+
+def get_lod(x: Union['core.MeshNeuron', 'core.Volume'],
+            lod: Optional[int] = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Get (cached) vertices and faces for given level of detail.
+
+    Parameters
+    ----------
+    x :         MeshNeuron | Volume
+                Anything with ``.vertices`` and ``.faces``.
+    lod :       int | None
+                Level of detail. ``0`` or ``None`` returns the full
+                resolution mesh. See :func:`navis.decimate_mesh`.
+
+    Returns
+    -------
+    vertices :  (N, 3) array
+    faces :     (M, 3) array
+
+    """
+    if not lod:
+        return x.vertices, x.faces
+
+    if not isinstance(lod, (int, np.integer)) or lod < 0:
+        raise ValueError(f'`lod` must be a non-negative integer, got "{lod}"')
+
+    # MeshNeurons clear the cache when their vertices/faces are replaced.
+    # Volumes are Trimeshes whose data can also be changed in place - hence we
+    # keep track of their CRC, which is cheap because trimesh caches it
+    token = x.crc() if isinstance(x, trimesh.Trimesh) else None
+
+    # Note: using __dict__ because MeshNeuron.__getattr__ would fall back
+    # to (and generate) a trimesh
+    cache = x.__dict__.get('_lod_cache')
+    if cache is None or cache.get('token') != token:
+        cache = x._lod_cache = {'token': token}
+
+    if lod not in cache:
+        verts, faces = np.asarray(x.vertices), np.asarray(x.faces)
+        if not len(faces):
+            return verts, faces
+        # Voxel size is based on the mean edge length
+        edge = np.linalg.norm(verts[faces[:, 0]] - verts[faces[:, 1]], axis=1).mean()
+        cache[lod] = cluster_vertices(verts, faces, edge * 2 ** lod)
+
+    return cache[lod]
+
+
+def cluster_vertices(verts: np.ndarray,
+                     faces: np.ndarray,
+                     voxel_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Decimate mesh by clustering vertices on a voxel grid.
+
+    Parameters
+    ----------
+    verts :         (N, 3) array
+    faces :         (M, 3) array
+    voxel_size :    float
+                    Size of the voxels.
+
+    Returns
+    -------
+    verts :         (N', 3) array
+    faces :         (M', 3) array
+
+    """
+    verts = np.asarray(verts, dtype=float)
+    faces = np.asarray(faces)
+
+    if voxel_size <= 0:
+        raise ValueError('voxel_size must be > 0')
+
+    if not len(verts):
+        return verts, faces
+
+    # Assign each vertex to a voxel
+    ijk = ((verts - verts.min(axis=0)) // voxel_size).astype(np.int64)
+    dims = ijk.max(axis=0) + 1
+    if np.prod(dims.astype(float)) < np.iinfo(np.int64).max:
+        _, cluster = np.unique(np.ravel_multi_index(ijk.T, dims),
+                               return_inverse=True)
+    else:
+        _, cluster = np.unique(ijk, axis=0, return_inverse=True)
+
+    # Collapse faces and drop those that became degenerate
+    new_faces = cluster[faces]
+    new_faces = new_faces[(new_faces[:, 0] != new_faces[:, 1])
+                          & (new_faces[:, 1] != new_faces[:, 2])
+                          & (new_faces[:, 0] != new_faces[:, 2])]
+
+    # Drop duplicate faces (regardless of winding)
+    srt = np.sort(new_faces, axis=1)
+    order = np.lexsort(srt.T[::-1])
+    srt = srt[order]
+    is_first = np.ones(len(srt), dtype=bool)
+    is_first[1:] = (srt[1:] != srt[:-1]).any(axis=1)
+    new_faces = new_faces[np.sort(order[is_first])]
+
+    # Drop clusters that are not part of any face and reindex
+    used = np.zeros(cluster.max() + 1, dtype=bool)
+    used[new_faces.ravel()] = True
+    remap = np.where(used, np.cumsum(used) - 1, -1)
+    cluster = remap[cluster]
+
+    # New vertices are the centroids of the clusters
+    valid = cluster >= 0
+    n = used.sum()
+    counts = np.bincount(cluster[valid], minlength=n)
+    new_verts = np.vstack([np.bincount(cluster[valid],
+                                       weights=verts[valid, i],
+                                       minlength=n)
+                           for i in range(3)]).T / counts.reshape(-1, 1)
+
+    return new_verts, remap[new_faces]
@@ -15,10 +15,14 @@ From shell:
 
 """
 
+import os
+import pickle
+import tempfile
 import unittest
 import warnings
 
 import navis
+import numpy as np
 
 try:
     import igraph
@@ -26,6 +30,11 @@ except BaseException:
     igraph = None
     warnings.warn('iGraph library not found. Will test only with NetworkX.')
 
+try:
+    import neuprint
+except ImportError:
+    neuprint = None
+
 
 class TestNeurons(unittest.TestCase):
     """Test navis.core.neurons. """
@@ -53,3 +62,538 @@ class TestNeurons(unittest.TestCase):
     def test_from_gml(self):
         n = navis.example_neurons(n=1, source='gml')
         self.assertIsInstance(n, navis.TreeNeuron)
+
+    def test_path_coords(self):
+        n = navis.example_neurons(n=1)
+        pc = n.path_coords
+        self.assertEqual(pc['offsets'][-1], pc['coords'].shape[0])
+        self.assertEqual(pc['edges'].shape, (n.n_nodes - len(n.root), 2, 3))
+        # Cache must be dropped together with the other temporary attributes
+        n._clear_temp_attr()
+        self.assertNotIn('_path_coords', n.__dict__)
+        # Cached arrays must not be writable
+        with self.assertRaises(ValueError):
+            pc['edges'][0, 0, 0] = 0
+        # Replacing the node table must invalidate the cache
+        x = n.path_coords['coords'][:, 0].copy()
+        nodes = n.nodes.copy()
+        nodes['x'] += 1
+        n.nodes = nodes
+        self.assertTrue(np.allclose(n.path_coords['coords'][:, 0], x + 1))
+
+    @try_conditions
+    def test_summary(self):
+        nl = navis.example_neurons(n=2)
+        s = nl.summary()
+        self.assertEqual(s.shape[0], 2)
+        self.assertEqual(list(s.cable_length.values), list(nl.cable_length))
+        # Cached metrics must be dropped when the neuron changes
+        n = nl[0].prune_by_strahler(1)
+        self.assertLess(n.summary().n_nodes, nl[0].n_nodes)
+        return list(s.cable_length.values)
+
+    @try_conditions
+    def test_reroot(self):
+        nl = navis.example_neurons(n=2)
+        # Make sure cached graphs are updated rather than regenerated
+        nl[0].graph
+        for parallel in (False, True):
+            rr = navis.reroot_neuron(nl, nl.soma, parallel=parallel, n_cores=2)
+            for n, soma in zip(rr, nl.soma):
+                self.assertEqual(list(n.root), list(np.atleast_1d(soma)))
+                self.assertEqual(n.nodes.type.values.tolist().count('root'), 1)
+            self.assertEqual(rr[0].cable_length, nl[0].cable_length)
+            self.assertEqual(rr[0].graph.out_degree(rr[0].root[0]), 0)
+        return rr[0].nodes.parent_id.values.tolist()
+
+    def test_subset(self):
+        n = navis.example_neurons(n=1)
+        if igraph:
+            n.igraph
+        mask = n.nodes.x.values > n.nodes.x.median()
+        ss1 = navis.subset_neuron(n, mask)
+        ss2 = navis.subset_neuron(n, n.nodes.node_id.values[mask])
+        self.assertEqual(ss1.nodes.parent_id.tolist(), ss2.nodes.parent_id.tolist())
+        self.assertEqual(ss1.nodes.type.tolist(), ss2.nodes.type.tolist())
+        if igraph:
+            self.assertEqual(ss1.igraph.vs['node_id'], ss1.nodes.node_id.tolist())
+
+        # Preventing fragments adds only the nodes required to connect
+        ss3 = navis.subset_neuron(n, mask, prevent_fragments=True)
+        self.assertEqual(ss3.n_trees, 1)
+        self.assertTrue(set(ss1.nodes.node_id) <= set(ss3.nodes.node_id))
+        leafs = ss3.nodes[ss3.nodes.type == 'end'].node_id
+        self.assertTrue(set(leafs) <= set(ss1.nodes.node_id))
+
+        # Pruning distal and proximal to a node splits the neuron in two
+        bp = n.nodes[n.nodes.type == 'branch'].node_id.values[5]
+        dist = n.prune_proximal_to(bp)
+        prox = n.prune_distal_to(bp)
+        self.assertEqual(list(dist.root), [bp])
+        self.assertEqual(dist.n_nodes + prox.n_nodes, n.n_nodes + 1)
+
+    def test_longest_neurite(self):
+        import pandas as pd
+        n = navis.example_neurons(n=1)
+        self.assertEqual(navis.find_main_branchpoint(n, reroot_to_soma=True), 2066)
+        ln = navis.longest_neurite(n, n=1)
+        self.assertEqual(ln.n_branches, 0)
+        # Longest neurite goes from the most distal leaf to the root
+        dist = navis.geodesic_matrix(n, tn_ids=n.root)
+        self.assertAlmostEqual(ln.cable_length, dist.values.max(), places=3)
+        # Segments are sorted by number of nodes
+        lengths = [len(s) for s in n.segments]
+        self.assertEqual(lengths, sorted(lengths, reverse=True))
+        # Ties go to the leaf that comes first in the node table
+        y = navis.TreeNeuron(pd.DataFrame({'node_id': [1, 2, 3, 4, 5],
+                                           'parent_id': [-1, 1, 2, 2, 4],
+                                           'x': [0, 1, 2, 2, 3],
+                                           'y': [0, 0, 1, -1, -1],
+                                           'z': 0}))
+        self.assertEqual(y.segments, [[5, 4, 2, 1], [3, 2]])
+        y = navis.TreeNeuron(pd.DataFrame({'node_id': [1, 2, 3, 4],
+                                           'parent_id': [-1, 1, 2, 2],
+                                           'x': [0, 1, 2, 2], 'y': [0, 0, 1, -1],
+                                           'z': 0}))
+        self.assertEqual(y.segments, [[3, 2, 1], [4, 2]])
+
+
+class TestNeuronList(unittest.TestCase):
+    """Test navis.core.neuronlist. """
+
+    def test_id_indexer(self):
+        nl = navis.example_neurons(n=3)
+        ids = [nl[2].id, nl[0].id]
+        self.assertEqual([n.id for n in nl.idx[ids]], ids)
+        # Index must follow changes to the neurons
+        nl[1].id = 'new_id'
+        self.assertIs(nl.idx['new_id'], nl[1])
+        with self.assertRaises(ValueError):
+            nl.idx['not_an_id']
+        # ... including renames and replacements
+        n = nl[0].copy()
+        n.name = 'new_name'
+        self.assertNotIn(n, nl)
+        nl[0].name = 'new_name'
+        self.assertIn(n, nl)
+        n.id = 'copy_id'
+        nl[2] = n
+        self.assertIs(nl.idx['copy_id'], n)
+        del nl[2]
+        with self.assertRaises(ValueError):
+            nl.idx['copy_id']
+
+    def test_subsetting(self):
+        nl = navis.example_neurons(n=3)
+        self.assertEqual(len(nl[[0, 0, 2]]), 2)
+        self.assertEqual(len(nl[[True, False, True]]), 2)
+        self.assertIn(nl[0], nl)
+        self.assertEqual(len(nl & nl[:2]), 2)
+        self.assertEqual(len(nl - nl[:2]), 1)
+
+    def test_flat_tables(self):
+        nl = navis.example_neurons(n=2)
+        nodes = nl.nodes
+        self.assertEqual(nodes.shape[0], sum(nl.n_nodes))
+        self.assertEqual(list(nodes.neuron.unique()), [0, 1])
+        # Columns are sorted alphabetically (except for "neuron")
+        self.assertEqual(list(nodes.columns[:-1]), sorted(nl[0].nodes.columns))
+        self.assertEqual(nodes.columns[-1], 'neuron')
+        # Tables must reflect changes to the neurons
+        nl[1].nodes = nl[1].nodes.iloc[:10].copy()
+        self.assertEqual(nl.nodes.shape[0], nl[0].n_nodes + 10)
+        x_sum = nl.nodes.x.sum()
+        nl[0].nodes['x'] += 1000
+        self.assertAlmostEqual(nl.nodes.x.sum(), x_sum + 1000 * nl[0].n_nodes)
+        nl[0].nodes['new_col'] = 1
+        self.assertIn('new_col', nl.nodes.columns)
+        nl[0].nodes.loc[0, 'type'] = 'test'
+        self.assertEqual(nl.nodes.type.values[0], 'test')
+
+
+class TestNBLAST(unittest.TestCase):
+    """Test navis.nbl. """
+
+    def test_nblast(self):
+        nl = navis.example_neurons(n=3) / 1000
+        res = navis.nblast_allbyall(nl, n_cores=1)
+        self.assertEqual(res.sim_mat.shape, (3, 3))
+        # Normalized self-hits are perfect matches
+        self.assertTrue(all(abs(res.sim_mat.values.diagonal() - 1) < 1e-6))
+        # Mean scores are symmetric
+        mean = navis.nblast(nl, nl, scores='mean', n_cores=2)
+        self.assertTrue((abs(mean.values - mean.values.T) < 1e-6).all())
+
+    def test_dotprops(self):
+        n = navis.example_neurons(n=1)
+        dp = navis.neuron2dps(n, k=5)
+        self.assertEqual(dp.points.shape, (n.n_nodes, 3))
+        self.assertTrue(abs(navis.neuron2dps(n).vec_length.sum() - n.cable_length) < 1)
+        # KD-tree must not be pickled
+        dp.kdtree
+        self.assertIsNone(pickle.loads(pickle.dumps(dp))._kdtree)
+        with tempfile.TemporaryDirectory() as tmp:
+            dp.to_npz(os.path.join(tmp, 'dp.npz'))
+            dp2 = navis.Dotprops.from_npz(os.path.join(tmp, 'dp.npz'))
+        self.assertTrue((dp2.vect == dp.vect).all())
+        self.assertEqual(dp2.k, 5)
+
+
+class TestConnectivity(unittest.TestCase):
+    """Test navis.connectivity. """
+
+    def test_cable_overlap(self):
+        nl = navis.example_neurons(n=3).resample(1000, inplace=False)
+        ol = navis.cable_overlap(nl, nl[:2], dist=2000, n_cores=1)
+        self.assertEqual(ol.shape, (3, 2))
+        self.assertTrue((ol.values > 0).all())
+        sp = navis.cable_overlap(nl, nl[:2], dist=2000, sparse=True, n_cores=2)
+        self.assertTrue((sp.sparse.to_dense().values == ol.values).all())
+
+
+class TestTransforms(unittest.TestCase):
+    """Test navis.transforms. """
+
+    def test_xform(self):
+        from navis import transforms
+        nl = navis.example_neurons(n=2)
+        tr = transforms.AffineTransform(np.diag([1e-3, 1e-3, 1e-3, 1]))
+        xf = navis.xform(nl, [tr, -tr, tr])
+        self.assertTrue(np.allclose(xf.nodes[['x', 'y', 'z']].values,
+                                    nl.nodes[['x', 'y', 'z']].values / 1000))
+        self.assertTrue(np.allclose(xf.cable_length, nl.cable_length / 1000))
+
+        # Bridging via registry
+        reg = transforms.TemplateRegistry()
+        reg.register_transform(tr, 'nm', 'um')
+        pts = np.ones((2, 3))
+        self.assertTrue(np.allclose(reg.find_bridging_path('um', 'nm').xform(pts), pts * 1000))
+
+        # Thin plate splines reproduce landmarks
+        src = np.random.rand(20, 3)
+        tps = transforms.TPSTransform(src, src * 2 + 1)
+        self.assertTrue(np.allclose(tps.xform(src), src * 2 + 1))
+
+        # Mirroring twice is a no-op
+        bbox = [0, 1e6, 0, 1e6, 0, 1e6]
+        mi = navis.mirror_brain(navis.mirror_brain(nl, bbox), bbox)
+        self.assertTrue(np.allclose(mi.nodes.x.values, nl.nodes.x.values))
+
+
+class TestVolumes(unittest.TestCase):
+    """Test navis.core.volumes. """
+
+    def test_combine(self):
+        import trimesh
+        m = trimesh.creation.icosphere(2)
+        vols = [navis.Volume(m.vertices + i * 10, m.faces) for i in range(3)]
+        comb = navis.Volume.combine(vols)
+        self.assertEqual(comb.vertices.shape[0], sum(len(v.vertices) for v in vols))
+        self.assertEqual(comb.faces.shape[0], sum(len(v.faces) for v in vols))
+        self.assertTrue(np.isclose(comb.volume, sum(v.volume for v in vols)))
+
+    def test_mesh_in_volume(self):
+        import pandas as pd
+        import trimesh
+        sphere = trimesh.creation.icosphere(3, radius=10)
+        m = navis.MeshNeuron(sphere)
+        self.assertTrue(np.allclose(m.bbox, [[-10, 10]] * 3))
+        self.assertTrue(np.isclose(m.area, sphere.area))
+        self.assertTrue(np.isclose(m.volume, sphere.volume))
+
+        m.connectors = pd.DataFrame([[0, 0, 0, 10, 0], [1, 0, 0, -10, 1]],
+                                    columns=['connector_id', 'x', 'y', 'z', 'type'])
+        box = navis.Volume(trimesh.creation.box([30, 30, 10]).apply_translation([0, 0, 10]))
+        sub = navis.in_volume(m, box, backend='scipy')
+        self.assertTrue((sub.vertices[:, 2] >= 5).all())
+        self.assertEqual(sub.faces.max(), sub.vertices.shape[0] - 1)
+        self.assertEqual(sub.connectors.connector_id.tolist(), [0])
+        self.assertTrue(np.allclose(sub.vertices[sub.connectors.vertex_id],
+                                    [[0, 0, 10]]))
+        # Original neuron is unchanged
+        self.assertEqual(m.n_faces, sphere.faces.shape[0])
+
+    def test_to_2d(self):
+        import trimesh
+        box = navis.Volume(trimesh.creation.box([10, 20, 30]))
+        xy = np.array(box.to_2d(view='xy'))
+        self.assertTrue(np.allclose(xy[0], xy[-1]))
+        # Shoelace formula
+        area = np.abs(np.sum(xy[:-1, 0] * xy[1:, 1] - xy[1:, 0] * xy[:-1, 1])) / 2
+        self.assertTrue(np.isclose(area, 200))
+        # Cache is invalidated when vertices change
+        box.vertices = box.vertices * 2
+        self.assertTrue(np.isclose(np.abs(np.array(box.to_2d(view='yz'))).max(), 30))
+
+    def test_parse_obj(self):
+        from navis.interfaces.insectbrain_db import _parse_obj
+        obj = '\n'.join(['# A unit square and a triangle',
+                          'v 0 0 0', 'v 1 0 0', 'v 1 1 0', 'v 0 1 0',
+                          'vn 0 0 1',
+                          'v 0 0 1',
+                          'f 1//1 2//1 3//1 4//1',
+                          'f 1/1 2/1 -1/1'])
+        verts, faces = _parse_obj(obj)
+        self.assertEqual(verts.shape, (5, 3))
+        self.assertTrue(np.allclose(verts[-1], [0, 0, 1]))
+        # The quad is triangulated as a fan
+        self.assertEqual(faces.tolist(), [[0, 1, 2], [0, 2, 3], [0, 1, 4]])
+
+        # Negative indices are relative to the vertices defined up to that face
+        obj = '\n'.join(['o first', 'v 0 0 0', 'v 1 0 0', 'v 0 1 0',
+                          'f -3 -2 -1',
+                          'o second', 'v 0 0 1', 'v 1 0 1', 'v 0 1 1', 'v 1 1 1',
+                          'f -4 -3 -2 -1',
+                          'f 1 2 3'])
+        verts, faces = _parse_obj(obj)
+        self.assertEqual(verts.shape, (7, 3))
+        self.assertEqual(faces.tolist(),
+                         [[0, 1, 2], [3, 4, 5], [3, 5, 6], [0, 1, 2]])
+
+        with self.assertRaises(ValueError):
+            _parse_obj('v 0 0 0\nv 1 0 0\nv 0 1 0\nf 0 1 2')
+
+    def test_write_atomic(self):
+        import os
+        import tempfile
+        from navis.interfaces._http import write_atomic
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as d:
+            os.chdir(d)
+            try:
+                # Bare filename without directory
+                write_atomic('test.txt', 'foo')
+                write_atomic(os.path.join('sub', 'test.txt'), 'bar')
+                self.assertEqual(open('test.txt').read(), 'foo')
+                self.assertEqual(open(os.path.join('sub', 'test.txt')).read(), 'bar')
+                self.assertEqual(sorted(os.listdir(d)), ['sub', 'test.txt'])
+            finally:
+                os.chdir(cwd)
+
+
+class TestMorpho(unittest.TestCase):
+    """Test navis.morpho. """
+
+    def test_smooth_despike(self):
+        nl = navis.example_neurons(n=2)
+        # Window of 1 is a no-op
+        sm = navis.smooth_neuron(nl, window=1)
+        self.assertTrue(np.allclose(sm.nodes.x.values, nl.nodes.x.values))
+
+        # Compare to smoothing one segment after the other
+        n_int = nl[1].copy()
+        n_int.nodes[['x', 'y', 'z']] = n_int.nodes[['x', 'y', 'z']].astype(int)
+        for n in (nl[0], n_int):
+            nodes = n.nodes.set_index('node_id')[['x', 'y', 'z']].astype(float)
+            for seg in n.segments:
+                nodes.loc[seg] = nodes.loc[seg].rolling(5, min_periods=1).mean().values
+            sm = navis.smooth_neuron(n, window=5)
+            self.assertTrue(np.allclose(sm.nodes[['x', 'y', 'z']].values,
+                                        nodes.loc[n.nodes.node_id].values))
+
+        # Introduce a spike
+        n = nl[0].copy()
+        seg = n.segments[0]
+        nodes = n.nodes.set_index('node_id')
+        nodes.loc[seg[5], 'x'] += 1e6
+        n.nodes = nodes.reset_index()
+
+        for parallel in (False, True):
+            ds = navis.despike_neuron(navis.NeuronList([n, nl[1]]),
+                                      parallel=parallel, n_cores=2)
+            x = ds[0].nodes.set_index('node_id').loc[seg[5], 'x']
+            self.assertLess(abs(x - nodes.loc[seg[5], 'x'] + 1e6), 1e3)
+
+    def test_tortuosity(self):
+        n = navis.example_neurons(n=1)
+        # Reference values from the original node-by-node implementation
+        t = navis.tortuosity(n, seg_length=[1000, 10000])
+        self.assertTrue(np.allclose(t, [1.16271991, 1.25085493]))
+        t = navis.tortuosity(n, seg_length=1000, skip_remainder=True)
+        self.assertAlmostEqual(t, 1.16732248)
+
+    def test_average_neurons(self):
+        nl = navis.example_neurons(n=3)
+        n_int = nl[1].copy()
+        n_int.nodes[['x', 'y', 'z']] = n_int.nodes[['x', 'y', 'z']].astype(int)
+        nl = navis.NeuronList([nl[0], n_int, nl[2]])
+        for base in (0, 1):
+            avg = navis.average_neurons(nl, limit=10e3, base_neuron=base)
+            base_co = nl[base].nodes[['x', 'y', 'z']].values.astype(float)
+            # Average node by node over neurons with a neighbour within limit
+            for i in range(0, len(base_co), 50):
+                nn = []
+                for n in nl:
+                    co = n.nodes[['x', 'y', 'z']].values
+                    d = np.linalg.norm(co - base_co[i], axis=1)
+                    if d.min() <= 10e3:
+                        nn.append(co[np.argmin(d)])
+                exp = np.mean(nn, axis=0) if nn else base_co[i]
+                self.assertTrue(np.allclose(avg.nodes[['x', 'y', 'z']].values[i], exp))
+        # Coordinates must not be truncated
+        self.assertEqual(avg.nodes.x.dtype, np.float64)
+        # Inputs must not be changed
+        self.assertFalse(hasattr(nl[0], 'tree'))
+
+    def test_prune_twigs(self):
+        nl = navis.example_neurons(n=2)
+        pr1 = navis.prune_twigs(nl, 5000)
+        pr2 = navis.prune_twigs(nl, 5000, recursive=True, parallel=True, n_cores=2)
+        self.assertTrue(all(pr1.n_nodes < nl.n_nodes))
+        self.assertTrue(all(pr2.n_nodes <= pr1.n_nodes))
+        # Recursive pruning leaves no short twigs behind
+        self.assertEqual(list(pr2.prune_twigs(5000).n_nodes), list(pr2.n_nodes))
+
+    def test_mesh2skeleton(self):
+        import trimesh
+        m = navis.MeshNeuron(trimesh.creation.cylinder(radius=1, height=20,
+                                                        sections=16))
+        sk = navis.mesh2skeleton(m)
+        self.assertIsInstance(sk, navis.TreeNeuron)
+        self.assertEqual(len(sk.root), 1)
+        self.assertEqual(sk.n_branches, 0)
+        self.assertEqual(len(sk.vertex_map), m.n_vertices)
+        self.assertAlmostEqual(sk.cable_length, 20)
+
+    def test_decimate_mesh(self):
+        import trimesh
+        m = navis.MeshNeuron(trimesh.creation.icosphere(5))
+        dec = navis.decimate_mesh(m, lod=1)
+        self.assertLess(dec.n_faces, m.n_faces / 2)
+        self.assertEqual(m.n_faces, 20480)
+
+        # Decimations are cached until the vertices change
+        get_lod = navis.sampling.decimation.get_lod
+        self.assertIs(get_lod(m, 1), get_lod(m, 1))
+        m2 = m * 2
+        self.assertEqual(set(m2.__dict__.get('_lod_cache', {})), set())
+        self.assertTrue(np.allclose(get_lod(m2, 1)[0], get_lod(m, 1)[0] * 2))
+
+    def test_in_volume_lod(self):
+        lh = navis.example_volume('LH')
+        points = navis.example_neurons(1).nodes[['x', 'y', 'z']].values
+        full = navis.in_volume(points, lh, backend='scipy')
+        # At lod=1 the LH mesh is not watertight -> use full resolution
+        self.assertFalse(navis.decimate_mesh(lh, lod=1).is_watertight)
+        with self.assertLogs(navis.config.logger, level='WARNING'):
+            dec = navis.in_volume(points, lh, backend='scipy', lod=1)
+        self.assertTrue(np.array_equal(full, dec))
+
+
+class TestPlotting(unittest.TestCase):
+    """Test navis.plotting. """
+
+    def test_render_thumbnails(self):
+        import matplotlib.image
+        nl = navis.example_neurons(n=2)
+        for backend, parallel in (('matplotlib', False), ('numpy', True)):
+            with tempfile.TemporaryDirectory() as tmp:
+                files = navis.render_thumbnails(nl, views=['xy', ('x', '-z')],
+                                                output_dir=tmp, size=(64, 48),
+                                                backend=backend,
+                                                parallel=parallel, n_cores=2)
+                self.assertEqual(len(files), 4)
+                for f in files:
+                    self.assertTrue(os.path.isfile(f))
+                    img = matplotlib.image.imread(f)
+                    self.assertEqual(img.shape[:2], (48, 64))
+                    # Something has been drawn
+                    self.assertTrue((img[..., 3] > 0).any())
+
+
+class _NeuprintStandIn:
+    """Stand-in for a neuprint client that serves a fixed skeleton."""
+
+    server = 'https://neuprint.example.org'
+    dataset = 'test'
+
+    def __init__(self, meta):
+        import requests
+        self.meta = meta
+        self.session = requests.Session()
+        self.n_requests = 0
+
+    def fetch_skeleton(self, body_id, format='swc', heal=False):
+        self.n_requests += 1
+        return ('# Stand-in skeleton\n'
+                '1 0 0 0 0 1 -1\n'
+                '2 0 10 0 0 1 1\n'
+                '3 0 20 0 0 1 2\n')
+
+
+@unittest.skipIf(neuprint is None, 'neuprint-python not installed')
+class TestNeuprint(unittest.TestCase):
+    """Test navis.interfaces.neuprint. """
+
+    def test_cache(self):
+        import collections
+        import pandas as pd
+        from navis.interfaces import neuprint as npi
+        fetch_skeleton = getattr(npi, '__fetch_skeleton')
+        Row = collections.namedtuple('Row', ['bodyId', 'instance', 'size',
+                                             'status', 'somaLocation',
+                                             'somaRadius'])
+        r = Row(1, 'test', 100, 'Traced', None, None)
+
+        client = _NeuprintStandIn({'lastDatabaseEdit': '2020-01-01'})
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = npi._get_cache(tmp, client)
+            self.assertIsNone(cache.get(1, 'swc'))
+            # First fetch is a miss, second one a hit
+            n1 = fetch_skeleton(r, client, cache=cache)
+            n2 = fetch_skeleton(r, client, cache=cache)
+            self.assertEqual(client.n_requests, 1)
+            self.assertEqual(n1.n_nodes, n2.n_nodes)
+
+            syn = pd.DataFrame([[1, 2, 3, 'pre', 'ROI', .9]],
+                               columns=['x', 'y', 'z', 'type', 'roi', 'confidence'])
+            cache.set(1, 'synapses', syn)
+            self.assertEqual(cache.get(1, 'synapses').values.tolist(),
+                             syn.values.tolist())
+
+            # A new version of the dataset must not see old entries
+            client.meta['lastDatabaseEdit'] = '2020-01-02'
+            cache = npi._get_cache(tmp, client)
+            self.assertIsNone(cache.get(1, 'swc'))
+            fetch_skeleton(r, client, cache=cache)
+            self.assertEqual(client.n_requests, 2)
+
+            # No caching if the version is unknown
+            with self.assertLogs(navis.config.logger, 'WARNING'):
+                self.assertIsNone(npi._get_cache(tmp, _NeuprintStandIn({})))
+
+    def test_connection_pool(self):
+        from navis.interfaces import neuprint as npi
+        client = _NeuprintStandIn({})
+        retries = client.session.get_adapter('https://').max_retries
+        npi._resize_connection_pool(client, 32)
+        for prefix in ('https://', 'http://'):
+            adapter = client.session.get_adapter(prefix)
+            self.assertEqual(adapter._pool_maxsize, 32)
+            self.assertEqual(adapter.max_retries.total, retries.total)
+        # Pools are never shrunk
+        npi._resize_connection_pool(client, 5)
+        self.assertEqual(client.session.get_adapter('https://')._pool_maxsize, 32)
+
+
+class TestImport(unittest.TestCase):
+    """Test that heavy dependencies are imported lazily. """
+
+    def test_lazy_imports(self):
+        import subprocess
+        import sys
+        code = ('import sys, navis; '
+                'print(",".join(m for m in ["matplotlib.pyplot", "plotly", '
+                '"vispy", "seaborn", "igraph", "requests"] if m in sys.modules))')
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                             text=True, check=True)
+        self.assertEqual(out.stdout.strip(), '')
+        self.assertTrue(callable(navis.plot3d))
+
+    def test_star_import(self):
+        ns = {}
+        exec('from navis import *', ns)
+        for f in ['plot3d', 'plot2d', 'plot1d', 'Viewer', 'vary_colors',
+                  'clear3d', 'close3d', 'get_viewer', 'screenshot',
+                  'make_tube', 'TreeNeuron', 'NeuronList']:
+            self.assertIn(f, ns)
@@ -0,0 +1,21 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+from .base import BaseTransform, TransformSequence
+from .affine import AffineTransform
+from .thinplate import TPSTransform
+from .displacement import DisplacementTransform
+from .templates import TemplateRegistry, registry, xform_brain, mirror_brain
+from .xfm import xform
+
+__all__ = ['xform', 'xform_brain', 'mirror_brain']
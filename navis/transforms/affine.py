@@ -0,0 +1,75 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+import numpy as np
+
+from .base import BaseTransform
+
+__all__ = ['AffineTransform']
+
+
+class AffineTransform(BaseTransform):
+    """Affine transformation of 3D coordinates.
+
+    Parameters
+    ----------
+    matrix :    (4, 4) numpy array
+                Affine matrix in homogeneous coordinates.
+
+    Examples
+    --------
+    >>> from navis import transforms
+    >>> import numpy as np
+    >>> # Scale by 2 and translate by 10 along x
+    >>> m = np.diag([2., 2., 2., 1.])
+    >>> m[0, 3] = 10
+    >>> tr = transforms.AffineTransform(m)
+    >>> tr.xform(np.ones((1, 3)))
+    array([[12.,  2.,  2.]])
+    >>> (-tr).xform(tr.xform(np.ones((1, 3))))
+    array([[1., 1., 1.]])
+
+    """
+
+    def __init__(self, matrix: np.ndarray):
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.shape != (4, 4):
+            raise ValueError(f'Expected (4, 4) matrix, got {matrix.shape}')
+        self.matrix = matrix
+
+    def __neg__(self) -> 'AffineTransform':
+        """Return inverse transform."""
+        return AffineTransform(np.linalg.inv(self.matrix))
+
+    def __add__(self, other: 'AffineTransform') -> 'AffineTransform':
+        """Combine with another affine transform (self first, other second)."""
+        if not isinstance(other, AffineTransform):
+            return NotImplemented
+        return AffineTransform(other.matrix @ self.matrix)
+
+    def xform(self, points: np.ndarray) -> np.ndarray:
+        """Apply transform to points.
+
+        Parameters
+        ----------
+        points :    (N, 3) numpy array
+                    Points to transform.
+
+        Returns
+        -------
+        pointsxf :  (N, 3) numpy array
+                    Transformed points.
+
+        """
+        points = self._parse_points(points)
+        return points @ self.matrix[:3, :3].T + self.matrix[:3, 3]
@@ -0,0 +1,152 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+import copy
+
+import numpy as np
+
+from typing import List
+
+from .. import config
+
+__all__ = ['BaseTransform', 'TransformSequence']
+
+# Set up logging
+logger = config.logger
+
+
+class BaseTransform:
+    """Abstract base class for transforms.
+
+    Subclasses need to implement ``.xform()`` which takes and returns a
+    ``(N, 3)`` array of points. Invertible transforms should also implement
+    ``__neg__`` which returns the inverse transform.
+
+    """
+
+    def __neg__(self) -> 'BaseTransform':
+        """Return inverse transform."""
+        raise NotImplementedError(f'{type(self).__name__} can not be inverted')
+
+    def __repr__(self) -> str:
+        return f'<{type(self).__name__}>'
+
+    def copy(self) -> 'BaseTransform':
+        """Return copy of transform."""
+        return copy.deepcopy(self)
+
+    def xform(self, points: np.ndarray) -> np.ndarray:
+        """Transform points.
+
+        Parameters
+        ----------
+        points :    (N, 3) numpy array
+                    Points to transform.
+
+        Returns
+        -------
+        pointsxf :  (N, 3) numpy array
+                    Transformed points.
+
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not '
+                                  'implement .xform()')
+
+    @staticmethod
+    def _parse_points(points: np.ndarray) -> np.ndarray:
+        """Make sure points are a (N, 3) float array."""
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(f'Expected (N, 3) array of points, got {points.shape}')
+        return points
+
+
+class TransformSequence(BaseTransform):
+    """A sequence of transforms that are applied one after the other.
+
+    Consecutive affine transforms are collapsed into a single matrix which
+    means that e.g. chaining several affine bridging registrations costs the
+    same as a single one.
+
+    Parameters
+    ----------
+    *transforms :   Transform(s)
+                    Transforms in the order they are to be applied.
+
+    Examples
+    --------
+    >>> from navis import transforms
+    >>> import numpy as np
+    >>> tr1 = transforms.AffineTransform(np.diag([2, 2, 2, 1]))
+    >>> tr2 = transforms.AffineTransform(np.diag([.5, .5, .5, 1]))
+    >>> seq = transforms.TransformSequence(tr1, tr2)
+    >>> seq.xform(np.ones((1, 3)))
+    array([[1., 1., 1.]])
+
+    """
+
+    def __init__(self, *transforms: BaseTransform):
+        self.transforms: List[BaseTransform] = []
+        for t in transforms:
+            self.append(t)
+
+    def __len__(self) -> int:
+        return len(self.transforms)
+
+    def __repr__(self) -> str:
+        return (f'<{type(self).__name__} with {len(self)} transform(s): '
+                f'{", ".join(type(t).__name__ for t in self.transforms)}>')
+
+    def __neg__(self) -> 'TransformSequence':
+        """Return inverse sequence."""
+        return TransformSequence(*[-t for t in self.transforms[::-1]])
+
+    def append(self, transform: BaseTransform) -> None:
+        """Add transform to the end of the sequence."""
+        # Avoid circular import
+        from .affine import AffineTransform
+
+        if isinstance(transform, TransformSequence):
+            for t in transform.transforms:
+                self.append(t)
+            return
+
+        if not isinstance(transform, BaseTransform):
+            raise TypeError(f'Expected transform, got "{type(transform)}"')
+
+        # Collapse consecutive affine transforms
+        if (self.transforms
+                and isinstance(transform, AffineTransform)
+                and isinstance(self.transforms[-1], AffineTransform)):
+            self.transforms[-1] = self.transforms[-1] + transform
+        else:
+            self.transforms.append(transform)
+
+    def xform(self, points: np.ndarray) -> np.ndarray:
+        """Transform points by applying all transforms in sequence.
+
+        Parameters
+        ----------
+        points :    (N, 3) numpy array
+                    Points to transform.
+
+        Returns
+        -------
+        pointsxf :  (N, 3) numpy array
+                    Transformed points.
+
+        """
+        points = self._parse_points(points)
+        for t in self.transforms:
+            points = t.xform(points)
+        return points
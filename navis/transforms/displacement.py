@@ -0,0 +1,110 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+import numpy as np
+import scipy.ndimage
+
+from typing import Union, Sequence
+
+from .base import BaseTransform
+
+__all__ = ['DisplacementTransform']
+
+
+class DisplacementTransform(BaseTransform):
+    """Transform based on a dense displacement field.
+
+    The field is defined on a regular grid and gives for each grid point the
+    offset that is added to points at that location. Offsets for points
+    in between grid points are interpolated.
+
+    Parameters
+    ----------
+    field :         (X, Y, Z, 3) numpy array
+                    Displacement vectors (in the same units as the points)
+                    for each grid point.
+    spacing :       float | (3, ) array, optional
+                    Distance between grid points along each axis.
+    offset :        float | (3, ) array, optional
+                    Position of the first grid point.
+    order :         int, optional
+                    Order of the spline interpolation: 1 (default) is
+                    trilinear interpolation.
+    batch_size :    int, optional
+                    Points are transformed in batches of this size.
+
+    Examples
+    --------
+    >>> from navis import transforms
+    >>> import numpy as np
+    >>> # Field that shifts everything by 1 along x
+    >>> field = np.zeros((10, 10, 10, 3))
+    >>> field[..., 0] = 1
+    >>> tr = transforms.DisplacementTransform(field, spacing=10)
+    >>> tr.xform(np.array([[5., 5., 5.]]))
+    array([[6., 5., 5.]])
+
+    """
+
+    def __init__(self,
+                 field: np.ndarray,
+                 spacing: Union[float, Sequence[float]] = 1,
+                 offset: Union[float, Sequence[float]] = 0,
+                 order: int = 1,
+                 batch_size: int = 1000000):
+        field = np.asarray(field, dtype=np.float64)
+        if field.ndim != 4 or field.shape[3] != 3:
+            raise ValueError(f'Expected (X, Y, Z, 3) field, got {field.shape}')
+
+        self.field = field
+        self.spacing = np.broadcast_to(np.asarray(spacing, dtype=np.float64), (3, ))
+        self.offset = np.broadcast_to(np.asarray(offset, dtype=np.float64), (3, ))
+        self.order = order
+        self.batch_size = batch_size
+
+    def __repr__(self) -> str:
+        return (f'<{type(self).__name__} grid={self.field.shape[:3]} '
+                f'spacing={tuple(self.spacing)}>')
+
+    def xform(self, points: np.ndarray) -> np.ndarray:
+        """Apply transform to points.
+
+        Points outside of the field are returned as ``NaN``.
+
+        Parameters
+        ----------
+        points :    (N, 3) numpy array
+                    Points to transform.
+
+        Returns
+        -------
+        pointsxf :  (N, 3) numpy array
+                    Transformed points.
+
+        """
+        points = self._parse_points(points)
+
+        xf = np.empty_like(points)
+        for i in range(0, points.shape[0], self.batch_size):
+            batch = points[i: i + self.batch_size]
+            # Convert to (fractional) voxel coordinates
+            vxl = ((batch - self.offset) / self.spacing).T
+            for d in range(3):
+                xf[i: i + self.batch_size, d] = scipy.ndimage.map_coordinates(self.field[..., d],
+                                                                              vxl,
+                                                                              order=self.order,
+                                                                              mode='constant',
+                                                                              cval=np.nan)
+            xf[i: i + self.batch_size] += batch
+
+        return xf
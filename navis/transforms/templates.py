@@ -0,0 +1,279 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+import numpy as np
+import networkx as nx
+import pandas as pd
+
+from typing import Union
+from typing_extensions import Literal
+
+from .. import config
+from .base import BaseTransform, TransformSequence
+from .xfm import xform, _apply, XformObject
+
+__all__ = ['TemplateRegistry', 'registry', 'xform_brain', 'mirror_brain']
+
+# Set up logging
+logger = config.logger
+
+
+class TemplateRegistry:
+    """Registry of template brains and transforms between them.
+
+    Bridging transforms map data from one template space into another and
+    are used to find a path between any two registered templates.
+    Mirror transforms map flipped data in a template space back onto the
+    template (i.e. correct for the template not being perfectly symmetric).
+
+    Examples
+    --------
+    >>> from navis import transforms
+    >>> import numpy as np
+    >>> tr = transforms.AffineTransform(np.diag([2, 2, 2, 1]))
+    >>> transforms.registry.register_transform(tr, source='brainA',
+    ...                                        target='brainB')
+
+    """
+
+    def __init__(self):
+        # Bridging transforms: edges source -> target with a "transform"
+        # attribute. Invertible transforms are also added in reverse.
+        self.bridges = nx.DiGraph()
+        # Mirror transforms {template: transform}
+        self.mirrors = {}
+        # Template bounding boxes {template: (3, 2) array}
+        self.templates = {}
+
+    def __repr__(self) -> str:
+        return (f'<{type(self).__name__}: {len(self.templates)} templates, '
+                f'{len(self.transforms)} bridging and {len(self.mirrors)} '
+                'mirror transforms>')
+
+    @property
+    def transforms(self) -> pd.DataFrame:
+        """Table of registered bridging transforms."""
+        return pd.DataFrame([[s, t, d['transform'], d['inverse']]
+                             for s, t, d in self.bridges.edges(data=True)],
+                            columns=['source', 'target', 'transform', 'inverse'])
+
+    def register_template(self,
+                          name: str,
+                          boundingbox: Union[list, np.ndarray]) -> None:
+        """Register template brain.
+
+        Parameters
+        ----------
+        name :          str
+                        Name of the template.
+        boundingbox :   list | numpy array
+                        Bounding box of the template (used for mirroring).
+                        Either ``[xmin, xmax, ymin, ymax, zmin, zmax]`` or
+                        ``[[xmin, xmax], [ymin, ymax], [zmin, zmax]]``.
+
+        """
+        self.templates[name] = np.asarray(boundingbox,
+                                          dtype=np.float64).reshape(3, 2)
+
+    def register_transform(self,
+                           transform: BaseTransform,
+                           source: str,
+                           target: str,
+                           transform_type: Union[Literal['bridging'],
+                                                 Literal['mirror']] = 'bridging'
+                           ) -> None:
+        """Register a transform.
+
+        Parameters
+        ----------
+        transform :         Transform
+                            The transform.
+        source :            str
+                            Source template space.
+        target :            str
+                            Target template space. For mirror transforms,
+                            this must be the same as ``source``.
+        transform_type :    "bridging" | "mirror"
+                            Type of the transform.
+
+        """
+        if not isinstance(transform, BaseTransform):
+            raise TypeError(f'Expected transform, got "{type(transform)}"')
+
+        if transform_type == 'mirror':
+            if source != target:
+                raise ValueError('Source and target of a mirror transform '
+                                 'must be the same')
+            self.mirrors[source] = transform
+        elif transform_type == 'bridging':
+            self.bridges.add_edge(source, target,
+                                  transform=transform, inverse=False)
+            # Add inverse unless there is a "proper" transform already
+            if not self.bridges.has_edge(target, source) \
+               or self.bridges.edges[target, source]['inverse']:
+                try:
+                    self.bridges.add_edge(target, source,
+                                          transform=-transform, inverse=True)
+                except NotImplementedError:
+                    pass
+        else:
+            raise ValueError(f'Unknown transform type "{transform_type}"')
+
+    def find_bridging_path(self, source: str, target: str) -> TransformSequence:
+        """Find sequence of bridging transforms from source to target.
+
+        Uses the path with the fewest transforms. Inverted transforms are only
+        used if there is no path using forward transforms only.
+
+        Returns
+        -------
+        TransformSequence
+
+        """
+        for t in [source, target]:
+            if t not in self.bridges:
+                raise ValueError(f'No bridging transforms registered for "{t}"')
+
+        # Penalize inverse transforms
+        def weight(s, t, d):
+            return 1 if not d['inverse'] else len(self.bridges) + 1
+
+        try:
+            path = nx.shortest_path(self.bridges, source, target, weight=weight)
+        except nx.NetworkXNoPath:
+            raise ValueError(f'No bridging path from "{source}" to "{target}"')
+
+        return TransformSequence(*[self.bridges.edges[s, t]['transform']
+                                   for s, t in zip(path[:-1], path[1:])])
+
+
+#: Default registry used by :func:`navis.xform_brain` and
+#: :func:`navis.mirror_brain`.
+registry = TemplateRegistry()
+
+
+def xform_brain(x: XformObject,
+                source: str,
+                target: str) -> XformObject:
+    """Transform 3D data between template brains.
+
+    This is a native alternative to :func:`navis.interfaces.r.xform_brain`
+    and uses transforms registered with ``navis.transforms.registry``.
+
+    Parameters
+    ----------
+    x :         Neuron/List | Volume | numpy.ndarray | pandas.DataFrame
+                Data to transform. Dataframe must contain ``['x', 'y', 'z']``
+                columns. Numpy array must be shape ``(N, 3)``.
+    source :    str
+                Source template brain that the data currently is in.
+    target :    str
+                Target template brain that the data should be transformed into.
+
+    Returns
+    -------
+    same type as ``x``
+                Copy of input with transformed coordinates.
+
+    See Also
+    --------
+    :func:`navis.xform`
+                Apply a given transform.
+    :class:`navis.transforms.TemplateRegistry`
+                Register template brains and transforms.
+
+    Examples
+    --------
+    >>> import navis
+    >>> import numpy as np
+    >>> from navis import transforms
+    >>> tr = transforms.AffineTransform(np.diag([1e-3, 1e-3, 1e-3, 1]))
+    >>> transforms.registry.register_transform(tr, 'nm', 'um')
+    >>> nl = navis.example_neurons(2)
+    >>> xf = navis.xform_brain(nl, source='nm', target='um')
+
+    """
+    if source == target:
+        logger.warning('Source and target are the same - nothing to do.')
+        return xform(x, TransformSequence())
+
+    return xform(x, registry.find_bridging_path(source, target))
+
+
+def mirror_brain(x: XformObject,
+                 template: Union[str, list, np.ndarray],
+                 mirror_axis: Union[Literal['x'],
+                                    Literal['y'],
+                                    Literal['z']] = 'x',
+                 warp: bool = True) -> XformObject:
+    """Mirror 3D object along given axis.
+
+    This is a native alternative to :func:`navis.interfaces.r.mirror_brain`.
+    Data is first flipped along the given axis of the template's bounding
+    box. If ``warp=True`` and a mirror transform is registered for the
+    template, it is then applied to account for the template not being
+    perfectly symmetrical.
+
+    Parameters
+    ----------
+    x :             Neuron/List | Volume | numpy.ndarray | pandas.DataFrame
+                    Data to mirror. Dataframe must contain ``['x', 'y', 'z']``
+                    columns. Numpy array must be shape ``(N, 3)``.
+    template :      str | bounding box
+                    Either the name of a registered template brain or its
+                    bounding box (``[xmin, xmax, ymin, ymax, zmin, zmax]``).
+    mirror_axis :   'x' | 'y' | 'z', optional
+                    Axis to mirror.
+    warp :          bool, optional
+                    Whether to apply the template's mirror transform (if
+                    one is registered) after flipping.
+
+    Returns
+    -------
+    same type as ``x``
+                    Copy of input with mirrored coordinates.
+
+    Examples
+    --------
+    >>> import navis
+    >>> nl = navis.example_neurons(2)
+    >>> mirrored = navis.mirror_brain(nl, template=[0, 1e6, 0, 1e6, 0, 1e6])
+
+    """
+    mirror_axis = str(mirror_axis).lower()
+    if mirror_axis not in ['x', 'y', 'z']:
+        raise ValueError(f'Unknown mirror axis "{mirror_axis}"')
+    ax = ['x', 'y', 'z'].index(mirror_axis)
+
+    if isinstance(template, str):
+        if template not in registry.templates:
+            raise ValueError(f'Template "{template}" not registered')
+        bbox = registry.templates[template]
+        mirror = registry.mirrors.get(template) if warp else None
+    else:
+        bbox = np.asarray(template, dtype=np.float64).reshape(3, 2)
+        mirror = None
+
+    # Flip along axis: x' = (min + max) - x
+    def flip(points: np.ndarray) -> np.ndarray:
+        points = points.copy()
+        points[:, ax] = bbox[ax].sum() - points[:, ax]
+        return points
+
+    if mirror is not None:
+        def func(points: np.ndarray) -> np.ndarray:
+            return mirror.xform(flip(points))
+    else:
+        func = flip
+
+    return _apply(x, func)
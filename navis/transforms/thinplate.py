@@ -0,0 +1,123 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+import numpy as np
+import scipy.spatial
+
+from .base import BaseTransform
+
+__all__ = ['TPSTransform']
+
+
+class TPSTransform(BaseTransform):
+    """Thin plate spline transform based on matched landmarks.
+
+    Parameters
+    ----------
+    landmarks_source :  (M, 3) numpy array
+                        Source landmarks.
+    landmarks_target :  (M, 3) numpy array
+                        Target landmarks.
+    batch_size :        int, optional
+                        Points are transformed in batches of this size to
+                        keep the (N, M) kernel matrix in memory check.
+
+    Examples
+    --------
+    >>> from navis import transforms
+    >>> import numpy as np
+    >>> src = np.random.rand(10, 3)
+    >>> tr = transforms.TPSTransform(src, src * 2)
+    >>> np.allclose(tr.xform(src), src * 2)
+    True
+
+    """
+
+    def __init__(self,
+                 landmarks_source: np.ndarray,
+                 landmarks_target: np.ndarray,
+                 batch_size: int = 100000):
+        self.source = self._parse_points(landmarks_source)
+        self.target = self._parse_points(landmarks_target)
+
+        if self.source.shape != self.target.shape:
+            raise ValueError('Number of source and target landmarks must match')
+
+        self.batch_size = batch_size
+        self._weights = None
+
+    def __neg__(self) -> 'TPSTransform':
+        """Return inverse transform.
+
+        Note that thin plate splines are not exactly invertible: this simply
+        swaps source and target landmarks.
+
+        """
+        return TPSTransform(self.target, self.source,
+                            batch_size=self.batch_size)
+
+    def __getstate__(self) -> dict:
+        """Get state (used e.g. for pickling)."""
+        state = self.__dict__.copy()
+        # Weights are cheap to re-compute but can be large
+        state['_weights'] = None
+        return state
+
+    @property
+    def weights(self) -> np.ndarray:
+        """(M + 4, 3) matrix of spline weights + affine part."""
+        if self._weights is None:
+            n = self.source.shape[0]
+
+            # Kernel for 3D thin plate splines is U(r) = r
+            K = scipy.spatial.distance.cdist(self.source, self.source)
+            P = np.hstack((np.ones((n, 1)), self.source))
+
+            L = np.zeros((n + 4, n + 4))
+            L[:n, :n] = K
+            L[:n, n:] = P
+            L[n:, :n] = P.T
+
+            Y = np.zeros((n + 4, 3))
+            Y[:n] = self.target
+
+            self._weights = np.linalg.solve(L, Y)
+        return self._weights
+
+    def xform(self, points: np.ndarray) -> np.ndarray:
+        """Apply transform to points.
+
+        Parameters
+        ----------
+        points :    (N, 3) numpy array
+                    Points to transform.
+
+        Returns
+        -------
+        pointsxf :  (N, 3) numpy array
+                    Transformed points.
+
+        """
+        points = self._parse_points(points)
+
+        W = self.weights
+        n = self.source.shape[0]
+
+        xf = np.empty_like(points)
+        for i in range(0, points.shape[0], self.batch_size):
+            batch = points[i: i + self.batch_size]
+            U = scipy.spatial.distance.cdist(batch, self.source)
+            xf[i: i + self.batch_size] = (U @ W[:n]
+                                          + W[n] + batch @ W[n + 1:])
+
+        return xf
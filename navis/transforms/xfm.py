@@ -0,0 +1,153 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+import numpy as np
+import pandas as pd
+
+from typing import Union, List, Tuple, Callable
+
+from .. import core, config
+from .base import BaseTransform, TransformSequence
+
+__all__ = ['xform']
+
+# Set up logging
+logger = config.logger
+
+XformObject = Union['core.NeuronObject', 'core.Volume', pd.DataFrame, np.ndarray]
+
+
+def xform(x: XformObject,
+          transform: Union[BaseTransform, List[BaseTransform]]
+          ) -> XformObject:
+    """Apply transform(s) to data.
+
+    Coordinates of all neurons in a NeuronList are collected into a single
+    array and transformed in one go. That is much faster than transforming
+    neurons one-by-one.
+
+    Parameters
+    ----------
+    x :             Neuron/List | Volume | numpy.ndarray | pandas.DataFrame
+                    Data to transform. Dataframe must contain ``['x', 'y', 'z']``
+                    columns. Numpy array must be shape ``(N, 3)``.
+    transform :     Transform | list of transforms
+                    Transform(s) to apply. A list is turned into a
+                    :class:`~navis.transforms.TransformSequence`.
+
+    Returns
+    -------
+    same type as ``x``
+                    Copy of input with transformed coordinates.
+
+    See Also
+    --------
+    :func:`navis.xform_brain`
+                    Transform data between template brains.
+
+    Examples
+    --------
+    >>> import navis
+    >>> import numpy as np
+    >>> from navis import transforms
+    >>> nl = navis.example_neurons(2)
+    >>> # Convert from nm to microns
+    >>> tr = transforms.AffineTransform(np.diag([1e-3, 1e-3, 1e-3, 1]))
+    >>> xf = navis.xform(nl, tr)
+
+    """
+    if isinstance(transform, (list, tuple)):
+        transform = TransformSequence(*transform)
+
+    if not isinstance(transform, BaseTransform):
+        raise TypeError(f'Expected transform, got "{type(transform)}"')
+
+    return _apply(x, transform.xform)
+
+
+def _apply(x: XformObject,
+           func: Callable[[np.ndarray], np.ndarray]) -> XformObject:
+    """Apply function that maps (N, 3) -> (N, 3) points to data."""
+    if isinstance(x, core.BaseNeuron):
+        return _apply(core.NeuronList(x), func)[0]
+    elif isinstance(x, core.NeuronList):
+        x = x.copy()
+
+        # Collect coordinates of all neurons into a single array
+        locs, setters = [], []
+        for n in x:
+            for loc, setter in _coords(n):
+                locs.append(loc)
+                setters.append(setter)
+
+        if not locs:
+            return x
+
+        lengths = [len(loc) for loc in locs]
+        xf = func(np.vstack(locs).astype(np.float64))
+
+        for setter, loc in zip(setters, np.split(xf, np.cumsum(lengths)[:-1])):
+            setter(loc)
+
+        # Only coordinates changed -> no need to re-classify nodes
+        for n in x:
+            if isinstance(n, core.TreeNeuron):
+                n._clear_temp_attr(exclude=['classify_nodes'])
+            else:
+                n._clear_temp_attr()
+
+        return x
+    elif isinstance(x, core.Volume):
+        x = x.copy()
+        x.vertices = func(np.asarray(x.vertices, dtype=np.float64))
+        return x
+    elif isinstance(x, pd.DataFrame):
+        if any([c not in x.columns for c in ['x', 'y', 'z']]):
+            raise ValueError('DataFrame must have x, y and z columns.')
+        x = x.copy()
+        xf = func(x[['x', 'y', 'z']].values.astype(np.float64))
+        for i, c in enumerate(['x', 'y', 'z']):
+            x[c] = xf[:, i]
+        return x
+    elif isinstance(x, np.ndarray):
+        if x.ndim != 2 or x.shape[1] != 3:
+            raise ValueError('Array must be of shape (N, 3).')
+        return func(x.astype(np.float64))
+
+    raise TypeError(f'Unable to transform data of type "{type(x)}"')
+
+
+def _coords(n: 'core.BaseNeuron') -> List[Tuple[np.ndarray, Callable]]:
+    """Get a neuron's coordinates + functions to write them back."""
+    def df_setter(df):
+        def setter(xyz):
+            for i, c in enumerate(['x', 'y', 'z']):
+                df[c] = xyz[:, i]
+        return setter
+
+    def mesh_setter(xyz):
+        n._vertices = xyz
+
+    coords = []
+    if isinstance(n, core.TreeNeuron):
+        coords.append((n.nodes[['x', 'y', 'z']].values, df_setter(n.nodes)))
+    elif isinstance(n, core.MeshNeuron):
+        coords.append((n.vertices, mesh_setter))
+    else:
+        raise TypeError(f"Don't know how to transform neuron of type '{type(n)}'")
+
+    if n.has_connectors:
+        coords.append((n.connectors[['x', 'y', 'z']].values,
+                       df_setter(n.connectors)))
+
+    return coords
@@ -13,8 +13,7 @@
 
 import pandas as pd
 import numpy as np
-import requests
-import urllib
+import urllib.parse
 
 from typing import Optional, Union, List, Iterable, Dict, Tuple
 
@@ -168,7 +167,7 @@ def unpack_neurons(x: Union[Iterable, 'core.NeuronList', 'core.TreeNeuron'],
     if isinstance(x, (list, np.ndarray, tuple)):
         for l in x:
             neurons += unpack_neurons(l)
-    elif isinstance(x, core.TreeNeuron):
+    elif isinstance(x, core.BaseNeuron):
         neurons.append(x)
     elif isinstance(x, core.NeuronList):
         neurons += x.neurons
@@ -210,6 +209,8 @@ def parse_objects(x) -> Tuple['core.NeuronList',
     -------
     Neurons :       navis.NeuronList
     Dotprops :      pd.DataFrame
+                    One row per :class:`navis.Dotprops` with ``gene_name``,
+                    ``id`` and ``points`` (DataFrame) columns.
     Volume :        list of navis.Volume
     Points :        list of arrays
     Visuals :       list of vispy visuals
@@ -228,7 +229,7 @@ def parse_objects(x) -> Tuple['core.NeuronList',
     >>> type(n), len(n)
     (navis.core.neuronlist.NeuronList, 3)
     >>> type(dps), len(dps)
-    (navis.core.dotprops.Dotprops, 0)
+    (pandas.core.frame.DataFrame, 0)
     >>> type(vols), len(vols)
     (list, 1)
     >>> type(meshes[0])
@@ -262,24 +263,23 @@ def parse_objects(x) -> Tuple['core.NeuronList',
     # Collect visuals
     visuals = [ob for ob in x if 'vispy' in str(type(ob))]
 
-    # Collect dotprops
+    # Collect dotprops and turn into a table for plotting: one row per
+    # dotprops with the points as DataFrame (+ soma position if available)
     dps = [ob for ob in x if isinstance(ob, core.Dotprops)]
-
-    if len(dps) == 1:
-        dotprops = dps[0]
-    elif len(dps) == 0:
-        dotprops = core.Dotprops()
-        dotprops['gene_name'] = []
-    else:
-        dotprops = pd.concat(dps)
+    dotprops = pd.DataFrame([[getattr(dp, 'gene_name', dp.name), dp.id,
+                              dp.to_dataframe()] for dp in dps],
+                            columns=['gene_name', 'id', 'points'])
+    if dps and all(hasattr(dp, c) for dp in dps for c in ['X', 'Y', 'Z']):
+        for c in ['X', 'Y', 'Z']:
+            dotprops[c] = [getattr(dp, c) for dp in dps]
 
     # Collect and parse volumes
     volumes = [ob for ob in x if isinstance(ob, core.Volume)]
 
     # Collect dataframes with X/Y/Z coordinates
-    # Note: dotprops and volumes are instances of pd.DataFrames
+    # Note: volumes are instances of pd.DataFrames
     dataframes = [ob for ob in x if isinstance(ob, pd.DataFrame)
-                  and not isinstance(ob, (core.Dotprops, core.Volume))]
+                  and not isinstance(ob, core.Volume)]
     if [d for d in dataframes if False in [c in d.columns for c in ['x', 'y', 'z']]]:
         logger.warning('DataFrames must have x, y and z columns.')
     # Filter to and extract x/y/z coordinates
@@ -338,7 +338,7 @@ def make_url(baseurl, *args: str, **GET) -> str:
         arg_str = str(arg)
         joiner = '' if url.endswith('/') else '/'
         relative = arg_str[1:] if arg_str.startswith('/') else arg_str
-        url = requests.compat.urljoin(url + joiner, relative)
+        url = urllib.parse.urljoin(url + joiner, relative)
     if GET:
         url += f'?{urllib.parse.urlencode(GET)}'
     return url
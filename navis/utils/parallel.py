@@ -0,0 +1,88 @@
+#    This script is part of navis (http://www.github.com/schlegelp/navis).
+#    Copyright (C) 2018 Philipp Schlegel
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+
+import multiprocessing as mp
+
+from typing import Any, Callable, Sequence, List
+
+from .. import config
+
+# The payload is shared with workers via a global so that each worker gets it
+# pickled exactly once instead of once per task
+_PAYLOAD: Any = None
+
+
+def _init_worker(payload: Any) -> None:
+    """Set payload for this (worker) process."""
+    global _PAYLOAD
+    _PAYLOAD = payload
+
+
+def get_payload() -> Any:
+    """Get payload shared with this (worker) process."""
+    return _PAYLOAD
+
+
+def map_with_payload(func: Callable,
+                     jobs: Sequence,
+                     payload: Any,
+                     n_cores: int,
+                     desc: str = 'Processing') -> List[Any]:
+    """Map function over jobs with a payload shared across processes.
+
+    Workers access the payload via :func:`get_payload`. Runs in a process
+    pool if ``n_cores > 1`` and there is more than one job, and sequentially
+    in this process otherwise.
+
+    Parameters
+    ----------
+    func :      callable
+                Must be picklable (i.e. a module-level function). Is called
+                with a single job.
+    jobs :      list
+                Jobs to map ``func`` over.
+    payload :   any
+                Data shared across all jobs, e.g. a list of neurons jobs
+                refer to by index.
+    n_cores :   int
+                Number of processes to use.
+    desc :      str
+                Description for the progress bar.
+
+    Returns
+    -------
+    list
+                Results in the same order as ``jobs``.
+
+    """
+    if n_cores > 1 and len(jobs) > 1:
+        n_cores = min(n_cores, len(jobs))
+        with mp.Pool(n_cores,
+                     initializer=_init_worker,
+                     initargs=(payload, )) as pool:
+            return list(config.tqdm(pool.imap(func,
+                                              jobs,
+                                              chunksize=max(1, len(jobs) // (n_cores * 4))),
+                                    total=len(jobs),
+                                    desc=desc,
+                                    disable=config.pbar_hide,
+                                    leave=config.pbar_leave))
+
+    _init_worker(payload)
+    try:
+        return [func(j) for j in config.tqdm(jobs,
+                                             desc=desc,
+                                             disable=config.pbar_hide or len(jobs) == 1,
+                                             leave=config.pbar_leave)]
+    finally:
+        _init_worker(None)
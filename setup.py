@@ -50,12 +50,11 @@ setup(
         'License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)',
 
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
     ],
     install_requires=requirements,
     extras_require={'extras': ['pyoctree~=0.2.10']},
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     zip_safe=False,
 
     include_package_data=True